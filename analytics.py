@@ -0,0 +1,240 @@
+# MIT License
+
+"""
+Release-cadence analytics
+Per-project rollups (intervals between releases, releases per month, update
+type counts, last release) live in release_cadence and release_months.
+refresh_release_analytics() recomputes only projects with versions or
+updates newer than the previous refresh, a batch of projects per query, so
+the /api/analytics routes read the rollups and never scan release history.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from cache import response_cache
+from models import db, Project, Version, Update, ReleaseCadence, ReleaseMonth
+
+logger = logging.getLogger(__name__)
+
+# Cache tag of the analytics routes
+ANALYTICS_TAGS = ('analytics',)
+
+DAYS_PER_MONTH = 30.44
+UPDATE_TYPES = ('major', 'minor', 'patch')
+
+
+def _quantile(ordered: List[float], fraction: float) -> Optional[float]:
+    """Linearly interpolated quantile of a sorted list"""
+    if not ordered:
+        return None
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    value = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+    return round(value, 2)
+
+
+def _chunks(values: List[int], size: int) -> Iterable[List[int]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _dirty_project_ids(since: Optional[datetime]) -> List[int]:
+    """Projects with new versions or updates since the last refresh, or without a rollup yet"""
+    if since is None:
+        return [project_id for (project_id,) in db.session.query(Project.id).order_by(Project.id)]
+    ids = set()
+    ids.update(project_id for (project_id,) in db.session.query(Version.project_id).filter(
+        Version.created_at > since).distinct())
+    ids.update(project_id for (project_id,) in db.session.query(Update.project_id).filter(
+        Update.detected_at > since).distinct())
+    ids.update(project_id for (project_id,) in db.session.query(Project.id).outerjoin(
+        ReleaseCadence, ReleaseCadence.project_id == Project.id).filter(ReleaseCadence.project_id.is_(None)))
+    return sorted(ids)
+
+
+def _release_rows(project_ids: List[int]) -> Dict[int, List[datetime]]:
+    """Release times of non-prerelease versions, oldest first, per project"""
+    released = db.func.coalesce(Version.release_date, Version.created_at)
+    rows = db.session.query(Version.project_id, released).filter(
+        Version.project_id.in_(project_ids),
+        db.or_(Version.is_prerelease.is_(False), Version.is_prerelease.is_(None))
+    ).order_by(Version.project_id, released)
+    releases = {}
+    for project_id, moment in rows:
+        if moment is not None:
+            releases.setdefault(project_id, []).append(moment)
+    return releases
+
+
+def _update_counts(project_ids: List[int]) -> Dict[int, Dict]:
+    rows = db.session.query(
+        Update.project_id, Update.update_type, db.func.count(Update.id), db.func.max(Update.detected_at)
+    ).filter(Update.project_id.in_(project_ids)).group_by(Update.project_id, Update.update_type)
+    counts = {}
+    for project_id, update_type, count, last in rows:
+        entry = counts.setdefault(project_id, {'major': 0, 'minor': 0, 'patch': 0, 'last': None})
+        if update_type in UPDATE_TYPES:
+            entry[update_type] = count
+        if last is not None and (entry['last'] is None or last > entry['last']):
+            entry['last'] = last
+    return counts
+
+
+def _cadence_row(project_id: int, moments: List[datetime], updates: Dict, refreshed_at: datetime) -> Dict:
+    intervals = sorted(
+        (later - earlier).total_seconds() / 86400 for earlier, later in zip(moments, moments[1:])
+    )
+    span_days = (moments[-1] - moments[0]).total_seconds() / 86400 if moments else 0
+    return {
+        'project_id': project_id,
+        'releases': len(moments),
+        'first_release': moments[0] if moments else None,
+        'last_release': moments[-1] if moments else None,
+        'median_interval_days': _quantile(intervals, 0.5),
+        'p90_interval_days': _quantile(intervals, 0.9),
+        'releases_per_month': round(len(intervals) / (span_days / DAYS_PER_MONTH), 3) if span_days > 0 else None,
+        'major_updates': updates.get('major', 0),
+        'minor_updates': updates.get('minor', 0),
+        'patch_updates': updates.get('patch', 0),
+        'last_update_at': updates.get('last'),
+        'refreshed_at': refreshed_at
+    }
+
+
+def _month_rows(project_id: int, moments: List[datetime]) -> List[Dict]:
+    months = {}
+    for moment in moments:
+        month = moment.strftime('%Y-%m')
+        months[month] = months.get(month, 0) + 1
+    return [{'project_id': project_id, 'month': month, 'releases': count} for month, count in months.items()]
+
+
+def refresh_release_analytics(full: bool = False, batch_size: int = 500) -> int:
+    """
+    Recompute the rollups of changed projects; returns the number refreshed
+
+    With full=True every project is recomputed. Requires an application context.
+    """
+    started = time.perf_counter()
+    refreshed_at = datetime.utcnow()
+    refreshed = 0
+    try:
+        since = None if full else db.session.query(db.func.max(ReleaseCadence.refreshed_at)).scalar()
+        if full:
+            db.session.query(ReleaseMonth).delete(synchronize_session=False)
+            db.session.query(ReleaseCadence).delete(synchronize_session=False)
+        for batch in _chunks(_dirty_project_ids(since), batch_size):
+            releases = _release_rows(batch)
+            updates = _update_counts(batch)
+            cadence_rows = []
+            month_rows = []
+            for project_id in batch:
+                moments = releases.get(project_id, [])
+                cadence_rows.append(_cadence_row(project_id, moments, updates.get(project_id, {}), refreshed_at))
+                month_rows.extend(_month_rows(project_id, moments))
+
+            db.session.query(ReleaseMonth).filter(ReleaseMonth.project_id.in_(batch)).delete(synchronize_session=False)
+            db.session.query(ReleaseCadence).filter(ReleaseCadence.project_id.in_(batch)).delete(synchronize_session=False)
+            db.session.execute(db.insert(ReleaseCadence), cadence_rows)
+            if month_rows:
+                db.session.execute(db.insert(ReleaseMonth), month_rows)
+            db.session.commit()
+            refreshed += len(batch)
+
+        if refreshed:
+            response_cache.invalidate(*ANALYTICS_TAGS)
+            logger.info(f'Refreshed release analytics of {refreshed} projects in {time.perf_counter() - started:.2f} s')
+        return refreshed
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Error in refresh_release_analytics: {e}')
+        return refreshed
+
+
+def _month_start(months_back: int, now: datetime) -> str:
+    """'YYYY-MM' of the month months_back months before now's month"""
+    index = now.year * 12 + now.month - 1 - months_back
+    return f'{index // 12:04d}-{index % 12 + 1:02d}'
+
+
+def releases_per_month(months: int = 12, project_id: Optional[int] = None) -> List[Dict]:
+    """Release counts of the last N calendar months (including the current one), oldest first"""
+    now = datetime.utcnow()
+    labels = [_month_start(back, now) for back in range(months - 1, -1, -1)]
+    query = db.session.query(ReleaseMonth.month, db.func.sum(ReleaseMonth.releases)).filter(
+        ReleaseMonth.month >= labels[0]
+    )
+    if project_id is not None:
+        query = query.filter(ReleaseMonth.project_id == project_id)
+    counts = dict(query.group_by(ReleaseMonth.month).all())
+    return [{'month': label, 'releases': int(counts.get(label) or 0)} for label in labels]
+
+
+def _type_shares(major: int, minor: int, patch: int) -> Dict:
+    total = major + minor + patch
+    counts = {'major': major, 'minor': minor, 'patch': patch}
+    return {
+        'total': total,
+        'counts': counts,
+        'shares': {name: round(count / total, 4) if total else 0.0 for name, count in counts.items()}
+    }
+
+
+def fleet_summary(stale_months: int = 6, months: int = 12) -> Dict:
+    """
+    Fleet-wide cadence from the rollups
+
+    Interval figures are the median and p90 of per-project median intervals,
+    i.e. how often a typical tracked project releases.
+    """
+    medians = sorted(value for (value,) in db.session.query(ReleaseCadence.median_interval_days).filter(
+        ReleaseCadence.median_interval_days.isnot(None)))
+    projects, releases, major, minor, patch, refreshed_at = db.session.query(
+        db.func.count(ReleaseCadence.project_id),
+        db.func.sum(ReleaseCadence.releases),
+        db.func.sum(ReleaseCadence.major_updates),
+        db.func.sum(ReleaseCadence.minor_updates),
+        db.func.sum(ReleaseCadence.patch_updates),
+        db.func.max(ReleaseCadence.refreshed_at)
+    ).one()
+    series = releases_per_month(months)
+    return {
+        'projects': projects,
+        'releases': releases or 0,
+        'median_interval_days': _quantile(medians, 0.5),
+        'p90_interval_days': _quantile(medians, 0.9),
+        'releases_per_month': round(sum(entry['releases'] for entry in series) / months, 2),
+        'monthly': series,
+        'update_types': _type_shares(major or 0, minor or 0, patch or 0),
+        'stale_projects': _stale_query(stale_months).count(),
+        'stale_months': stale_months,
+        'refreshed_at': refreshed_at.isoformat() if refreshed_at else None
+    }
+
+
+def _stale_query(stale_months: int):
+    cutoff = datetime.utcnow() - timedelta(days=stale_months * DAYS_PER_MONTH)
+    return db.session.query(ReleaseCadence, Project.name).join(
+        Project, Project.id == ReleaseCadence.project_id
+    ).filter(Project.active.is_(True), ReleaseCadence.last_release < cutoff)
+
+
+def stale_projects(stale_months: int = 6, limit: int = 50) -> List[Dict]:
+    """Active projects without a release in the last N months, longest silent first"""
+    rows = _stale_query(stale_months).order_by(ReleaseCadence.last_release).limit(limit).all()
+    return [dict(cadence.to_dict(), name=name) for cadence, name in rows]
+
+
+def project_cadence(project_id: int, months: int = 12) -> Optional[Dict]:
+    """Rollup of one project with its monthly release counts"""
+    cadence = db.session.get(ReleaseCadence, project_id)
+    if cadence is None:
+        return None
+    payload = cadence.to_dict()
+    payload['update_types'] = _type_shares(cadence.major_updates, cadence.minor_updates, cadence.patch_updates)
+    payload['monthly'] = releases_per_month(months, project_id)
+    return payload
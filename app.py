@@ -6,6 +6,18 @@ from flask import Flask, render_template, jsonify
 from flask_cors import CORS
 from config import config
 from models import db
+from cache import response_cache
+from cli import register_commands, upgrade_schema
+from compression import init_compression
+from dashboard import dashboard
+from metrics import init_metrics
+from profiling import init_profiling
+from outdated import latest_version_index
+from dependency_graph import dependency_graph
+from search import ensure_search_index
+from check_priority import record_interest
+import upstream_sources  # noqa: F401  (registers the source resolution hook)
+from serialization import init_json
 from datetime import datetime
 
 # Configure logging
@@ -26,21 +38,44 @@ def create_app(config_name=None):
     app.config.from_object(config.get(config_name, config['development']))
     
     # Initialize extensions
+    init_json(app)
     db.init_app(app)
     CORS(app)
+    response_cache.init_app(app)
+    dashboard.init_app(app)
+    latest_version_index.invalidate()
+    dependency_graph.invalidate()
+    init_compression(app)
+    init_metrics(app)
+    init_profiling(app)
+    
+    register_commands(app)
     
     # Register blueprint
     from routes import api_bp
     app.register_blueprint(api_bp, url_prefix='/api')
     
-    # Initialize background tasks scheduler
-    if config_name != 'testing':
-        from background_tasks import start_scheduler
-        start_scheduler(app)
+    # Upstream clients are built on first use, after any fork
+    from background_tasks import init_services
+    init_services(app)
+    
+    # Create or upgrade the schema like `flask --app app migrate`, which
+    # production runs as a deploy step instead
+    if app.config.get('AUTO_CREATE_SCHEMA', True):
+        with app.app_context():
+            added = upgrade_schema(rebuild_index=False)
+            for name in added['columns'] + added['dropped']:
+                logger.info(f'Upgraded schema: {name}')
     
-    # Create database tables
+    # Databases created before full-text search get their index here
     with app.app_context():
-        db.create_all()
+        ensure_search_index()
+    
+    # Initialize background tasks scheduler; under gunicorn it is started
+    # after fork by gunicorn.conf.py instead
+    if app.config.get('SCHEDULER_AUTOSTART', True):
+        from background_tasks import start_scheduler
+        start_scheduler(app)
     
     # Register error handlers
     @app.errorhandler(404)
@@ -71,6 +106,8 @@ def create_app(config_name=None):
     
     @app.route('/project/<int:project_id>')
     def project_detail(project_id):
+        # Page views raise the project's check priority
+        record_interest(project_id, app.config.get('CHECK_INTEREST_HALF_LIFE_HOURS', 24))
         return render_template('project.html', project_id=project_id)
     
     logger.info(f'Application created with config: {config_name}')
@@ -6,146 +6,635 @@ Automatic version checking and notification system
 """
 
 import logging
-from apscheduler.schedulers.background import BackgroundScheduler
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from models import db, Project
 from services.github_service import GitHubService
 from services.pypi_service import PyPIService
+from services.pypi_mirror import PyPIMirror, ingest as ingest_pypi_mirror
 from services.version_checker import VersionChecker
 from services.notifier import NotificationService
-from datetime import datetime
+from services.notification_delivery import OutboxDispatcher
+from services.check_runs import CheckRunRecorder, purge_check_runs
+from services.sweep_checkpoints import SweepProgress, purge_sweep_checkpoints, unfinished_sweep
+from services import check_trace
+from cache import response_cache
+from dependency_graph import dependency_graph, sync_project_dependencies
+from analytics import refresh_release_analytics
+from check_priority import CheckQueue, PriorityScorer
+from github_webhooks import covered_by_webhook
+from upstream_sources import project_source_keys, purge_orphan_sources, resolve_missing_sources, split_github_key
+from metrics import metrics, SCHEDULER_JOBS, SCHEDULER_LAG, SWEEP_DURATION, SWEEP_PROJECTS, SWEEP_QUEUE_DEPTH, SWEEP_RESULTS
+from datetime import datetime, timezone
+from sqlalchemy.orm import joinedload
 
 logger = logging.getLogger(__name__)
 
-github_service = GitHubService()
-pypi_service = PyPIService()
 version_checker = VersionChecker()
 notification_service = NotificationService()
 
-scheduler = BackgroundScheduler()
+# Upstream clients and the scheduler are created on first use, so importing
+# this module (e.g. in a preloading gunicorn master) starts no threads and
+# opens no connections; init_services() only records their settings
+github_service = None
+pypi_service = None
+scheduler = None
+_scheduler_app = None
+
+_service_settings = {}
+_services_lock = threading.Lock()
+_scheduler_lock_file = None
+
+
+def init_services(app):
+    """Record upstream client settings from app config; clients are built lazily"""
+    global github_service, pypi_service
+    
+    with _services_lock:
+        _service_settings.update(
+            github_token=app.config.get('GITHUB_TOKEN') or None,
+            github_base_url=app.config.get('GITHUB_API_BASE_URL', 'https://api.github.com'),
+            pypi_base_url=app.config.get('PYPI_API_BASE_URL', 'https://pypi.org/pypi'),
+            pypi_mirror_index=app.config.get('PYPI_MIRROR_INDEX'),
+            pypi_mirror_fallback=app.config.get('PYPI_MIRROR_FALLBACK', False)
+        )
+        github_service = None
+        pypi_service = None
+
+
+def get_upstream_services():
+    """Return (github_service, pypi_service), building them on first use"""
+    global github_service, pypi_service
+    
+    if github_service is None or pypi_service is None:
+        with _services_lock:
+            if github_service is None:
+                github_service = GitHubService(
+                    token=_service_settings.get('github_token'),
+                    base_url=_service_settings.get('github_base_url', 'https://api.github.com')
+                )
+            if pypi_service is None:
+                mirror_index = _service_settings.get('pypi_mirror_index')
+                pypi_service = PyPIService(
+                    base_url=_service_settings.get('pypi_base_url', 'https://pypi.org/pypi'),
+                    mirror=PyPIMirror(mirror_index) if mirror_index else None,
+                    mirror_fallback=_service_settings.get('pypi_mirror_fallback', False)
+                )
+    return github_service, pypi_service
+
+
+def _build_jobstore(app):
+    """Persistent job store for the scheduler, or None to keep jobs in memory"""
+    if app is None:
+        return None
+    url = app.config.get('SCHEDULER_JOBSTORE_URL')
+    if url == 'memory':
+        return None
+    
+    from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+    if url:
+        return SQLAlchemyJobStore(url=url, tablename='apscheduler_jobs')
+    if app.config.get('SQLALCHEMY_DATABASE_URI') in (None, 'sqlite://', 'sqlite:///:memory:'):
+        return None
+    # Share the application's engine (and its resolved SQLite path)
+    with app.app_context():
+        return SQLAlchemyJobStore(engine=db.engine, tablename='apscheduler_jobs')
+
+
+def get_scheduler(app=None):
+    """Return the process-wide scheduler, creating it on first use"""
+    global scheduler
+    
+    if scheduler is None:
+        from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED
+        from apscheduler.schedulers.background import BackgroundScheduler
+        jobstore = _build_jobstore(app)
+        scheduler = BackgroundScheduler(jobstores={'default': jobstore} if jobstore else {}, timezone='UTC')
+        scheduler.add_listener(
+            _record_job_event, EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED
+        )
+    return scheduler
+
+
+def _record_job_event(event):
+    """Scheduler listener feeding job lag and outcome metrics"""
+    from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED
+    
+    if event.code == EVENT_JOB_SUBMITTED:
+        scheduled = max(event.scheduled_run_times)
+        lag = (datetime.now(scheduled.tzinfo) - scheduled).total_seconds()
+        SCHEDULER_LAG.observe(max(lag, 0.0), job=event.job_id)
+        return
+    
+    if event.code == EVENT_JOB_MISSED:
+        outcome = 'missed'
+    elif event.code == EVENT_JOB_ERROR:
+        outcome = 'error'
+    else:
+        outcome = 'executed'
+    SCHEDULER_JOBS.inc(job=event.job_id, outcome=outcome)
+    metrics.flush(force=True)
 
 
 def check_all_updates():
-    """Check updates for all active projects"""
+    """
+    Check updates for all active projects, most important first
+    
+    Source groups are popped from a priority queue (see check_priority.py);
+    once SWEEP_UPSTREAM_BUDGET fetches are spent the rest are left for the
+    next sweep.
+    
+    Projects whose repository sends release webhooks are skipped until
+    WEBHOOK_FALLBACK_INTERVAL has passed since their last check.
+    
+    Progress is checkpointed every SWEEP_CHECKPOINT_INTERVAL projects; a
+    sweep interrupted by a restart is continued by the next run.
+    """
+    from flask import current_app
+    
+    recorder = None
+    progress = None
     try:
-        projects = Project.query.filter_by(active=True).all()
-        logger.info(f'Starting update check for {len(projects)} projects')
+        started = time.perf_counter()
+        progress = SweepProgress.resume_or_start(
+            interval=current_app.config.get('SWEEP_CHECKPOINT_INTERVAL', 50),
+            max_age_hours=current_app.config.get('SWEEP_CHECKPOINT_MAX_AGE_HOURS', 24)
+        )
+        recorder = CheckRunRecorder.from_config(current_app.config, sweep_id=progress.sweep_id, trigger='scheduled')
+        resolve_missing_sources()
+        projects = Project.query.options(
+            joinedload(Project.github_source), joinedload(Project.pypi_source), joinedload(Project.release_cadence)
+        ).filter_by(active=True).order_by(
+            db.case((Project.last_checked.is_(None), 0), else_=1), Project.last_checked, Project.id
+        ).all()
+        now = datetime.utcnow()
+        active_days = current_app.config.get('GITHUB_WEBHOOK_ACTIVE_DAYS', 7)
+        fallback_interval = current_app.config.get('WEBHOOK_FALLBACK_INTERVAL', 24 * 3600)
+        projects = [
+            project for project in projects
+            if project.id not in progress.completed
+            and not covered_by_webhook(project, now, active_days, fallback_interval)
+        ]
+        progress.set_remaining(len(projects))
+        queue = CheckQueue(group_by_source(projects), PriorityScorer.from_config(current_app.config))
+        budget = current_app.config.get('SWEEP_UPSTREAM_BUDGET') or len(queue)
+        action = 'Resuming' if progress.resumed else 'Starting'
+        logger.info(f'{action} update check {recorder.sweep_id} for {len(projects)} projects '
+                    f'({len(queue)} unique sources, budget {budget})')
+        SWEEP_QUEUE_DEPTH.set(len(projects), trigger='scheduled')
+        
+        fetches = 0
+        while queue and fetches < budget:
+            (github_key, pypi_key), members, score = queue.pop()
+            fetches += 1
+            update_info, trace = check_trace.traced(fetch_update_info, github_key, pypi_key)
+            for index, project in enumerate(members):
+                try:
+                    logger.debug(f'Checking updates for: {project.name} (priority {score})')
+                    previous_version = project.current_version
+                    fetched = (update_info, trace if index == 0 else trace.shared())
+                    version = check_project_updates(project, recorder=recorder, fetched=fetched)
+                    updated = version is not None and version.version_number != previous_version
+                    SWEEP_RESULTS.inc(trigger='scheduled', status='updated' if updated else 'up_to_date')
+                except Exception as e:
+                    db.session.rollback()
+                    SWEEP_RESULTS.inc(trigger='scheduled', status='error')
+                    logger.error(f'Error checking updates for {project.name}: {e}')
+                finally:
+                    SWEEP_QUEUE_DEPTH.dec(trigger='scheduled')
+            if progress.mark_done(project.id for project in members):
+                recorder.flush()
         
-        for project in projects:
-            try:
-                logger.info(f'Checking updates for: {project.name}')
-                check_project_updates(project)
-            except Exception as e:
-                logger.error(f'Error checking updates for {project.name}: {e}')
+        deferred = queue.remaining_projects()
+        if deferred:
+            logger.warning(f'Upstream budget of {budget} fetches spent; {deferred} projects deferred to the next sweep')
+            SWEEP_QUEUE_DEPTH.set(0, trigger='scheduled')
+        progress.finish()
+        recorder.flush()
+        SWEEP_DURATION.observe(time.perf_counter() - started, trigger='scheduled')
+        SWEEP_PROJECTS.observe(len(projects) - deferred, trigger='scheduled')
+        logger.info(f'✓ Completed update check {recorder.sweep_id} for {len(projects) - deferred} projects')
         
-        logger.info(f'✓ Completed update check for {len(projects)} projects')
+        # Precompute the dashboard so the first page view after a sweep is served from memory
+        from dashboard import dashboard
+        dashboard.refresh()
+        refresh_release_analytics()
     except Exception as e:
         logger.error(f'Error in check_all_updates: {e}')
+        if progress is not None:
+            progress.save()
+        if recorder is not None:
+            recorder.flush()
 
 
-def check_project_updates(project):
-    """Check updates for a single project"""
-    from models import Version, Update
-    
+def fetch_update_info(github_repo, pypi_package):
+    """Resolve the newest upstream release of a project without touching the database"""
     update_info = None
+    github, pypi = get_upstream_services()
     
     # Check GitHub
-    if project.github_repo:
-        owner, repo = github_service.parse_repo_url(project.github_repo)
+    if github_repo:
+        owner, repo = split_github_key(github_repo)
         if owner and repo:
-            release = github_service.get_latest_release(owner, repo)
+            check_trace.set_source('github')
+            release = github.get_latest_release(owner, repo)
             if release:
-                update_info = github_service.extract_version_info(release)
+                update_info = github.extract_version_info(release)
     
     # Check PyPI
-    if project.pypi_package and not update_info:
-        latest_version = pypi_service.get_latest_version(project.pypi_package)
-        if latest_version:
-            update_info = pypi_service.extract_version_info(project.pypi_package)
+    if pypi_package and not update_info:
+        check_trace.set_source('pypi')
+        update_info = pypi.extract_version_info(pypi_package)
     
-        if update_info:
-            new_version = update_info['version_number']
-            
-            # Check if version already exists
-            existing = Version.query.filter_by(
+    if update_info and not update_info.get('version_number'):
+        return None
+    return update_info
+
+
+def apply_update_info(project, update_info):
+    """Record a fetched release for a project; returns the new Version or None"""
+    from models import Version, Update
+    
+    version = None
+    update = None
+    requirements = None
+    
+    if update_info and update_info.get('requires_dist') is not None:
+        requirements = sync_project_dependencies(project.id, update_info['requires_dist'])
+    
+    if update_info:
+        new_version = update_info['version_number']
+        
+        # Check if version already exists
+        existing = Version.query.filter_by(
+            project_id=project.id,
+            version_number=new_version
+        ).first()
+        
+        if not existing:
+            logger.info(f'Found new version for {project.name}: {new_version}')
+            version = Version(
                 project_id=project.id,
-                version_number=new_version
-            ).first()
+                version_number=new_version,
+                release_date=update_info.get('release_date'),
+                download_url=update_info.get('download_url'),
+                is_prerelease=update_info.get('is_prerelease', False),
+                is_latest=True
+            )
+            
+            # Mark old versions as not latest
+            Version.query.filter_by(project_id=project.id, is_latest=True).update({'is_latest': False})
             
-            if not existing:
-                logger.info(f'Found new version for {project.name}: {new_version}')
-                version = Version(
-                    project_id=project.id,
-                    version_number=new_version,
-                    release_date=update_info.get('release_date'),
-                    download_url=update_info.get('download_url'),
-                    is_prerelease=update_info.get('is_prerelease', False),
-                    is_latest=True
+            db.session.add(version)
+            
+            # Check if it's an update
+            if project.current_version:
+                update_type = version_checker.compare_versions(
+                    project.current_version,
+                    new_version
                 )
                 
-                # Mark old versions as not latest
-                Version.query.filter_by(project_id=project.id, is_latest=True).update({'is_latest': False})
-                
-                db.session.add(version)
-                
-                # Check if it's an update
-                if project.current_version:
-                    update_type = version_checker.compare_versions(
-                        project.current_version,
-                        new_version
+                if update_type:
+                    logger.info(f'Creating {update_type} update record for {project.name}')
+                    update = Update(
+                        project_id=project.id,
+                        old_version=project.current_version,
+                        new_version=new_version,
+                        update_type=update_type,
+                        description=update_info.get('description')
                     )
+                    db.session.add(update)
                     
-                    if update_type:
-                        logger.info(f'Creating {update_type} update record for {project.name}')
-                        update = Update(
-                            project_id=project.id,
-                            old_version=project.current_version,
-                            new_version=new_version,
-                            update_type=update_type,
-                            description=update_info.get('description')
-                        )
-                        db.session.add(update)
-                        
-                        # Send notification
-                        notification_service.notify_update(
-                            project.name,
-                            project.current_version,
-                            new_version
-                        )
-                        
-                        logger.info(f'New {update_type} update for {project.name}: {new_version}')
-                else:
-                    logger.info(f'No current version set for {project.name}, not creating update record')
-                
-                project.current_version = new_version
-                project.latest_version = new_version
-                project.latest_release_date = update_info.get('release_date')
-                project.last_checked = datetime.utcnow()
-                
-                db.session.commit()
+                    # Queue notification deliveries in the same transaction
+                    notification_service.notify_update(project, update)
+                    
+                    logger.info(f'New {update_type} update for {project.name}: {new_version}')
+            else:
+                logger.info(f'No current version set for {project.name}, not creating update record')
+            
+            project.current_version = new_version
+            project.latest_version = new_version
+            project.latest_release_date = update_info.get('release_date')
+    
+    project.last_checked = datetime.utcnow()
+    db.session.commit()
+    
+    if requirements is not None:
+        dependency_graph.update_project(project.id, requirements)
+    
+    if version is not None:
+        response_cache.invalidate('projects', f'project:{project.id}', 'updates')
+    else:
+        response_cache.invalidate('projects', f'project:{project.id}')
+    
+    if update is not None:
+        notification_service.publish_update(update, project.name)
+    
+    return version
+
+
+def _check_status(version, previous_version, update_info):
+    """Outcome of one project check for metrics and check runs"""
+    if version is not None and version.version_number != previous_version:
+        return 'updated'
+    if update_info:
+        return 'up_to_date'
+    return 'no_release'
+
+
+def _record_check(recorder, project_id, status, trace, db_ms=None, error=None, changed=False, started_at=None):
+    """Add a check run row for a project; total time is upstream fetch plus DB apply"""
+    if recorder is None:
+        return
+    recorder.add(
+        project_id,
+        status,
+        changed=changed,
+        trace=trace,
+        db_ms=db_ms,
+        total_ms=trace.fetch_ms + (db_ms or 0.0),
+        error=error,
+        started_at=started_at
+    )
+
+
+def group_by_source(projects):
+    """Projects keyed by their (github key, pypi key) pair, in first-seen order"""
+    groups = {}
+    for project in projects:
+        groups.setdefault(project_source_keys(project), []).append(project)
+    return groups
+
+
+def check_project_updates(project, recorder=None, fetched=None):
+    """
+    Check updates for a single project, adding a check run to recorder if given
+    
+    fetched is an (update_info, trace) pair already fetched for the project's
+    sources, e.g. by a sweep sharing one fetch between several projects.
+    """
+    started_at = datetime.utcnow()
+    project_id = project.id
+    previous_version = project.current_version
+    if fetched is None:
+        fetched = check_trace.traced(fetch_update_info, *project_source_keys(project))
+    update_info, trace = fetched
+    if trace.exception is not None:
+        _record_check(recorder, project_id, 'error', trace, error=str(trace.exception), started_at=started_at)
+        raise trace.exception
+    
+    apply_started = time.perf_counter()
+    try:
+        version = apply_update_info(project, update_info)
+    except Exception as e:
+        db.session.rollback()
+        db_ms = (time.perf_counter() - apply_started) * 1000
+        _record_check(recorder, project_id, 'error', trace, db_ms=db_ms, error=str(e), started_at=started_at)
+        raise
+    db_ms = (time.perf_counter() - apply_started) * 1000
+    
+    status = _check_status(version, previous_version, update_info)
+    _record_check(recorder, project_id, status, trace, db_ms=db_ms, changed=status == 'updated', started_at=started_at)
+    return version
+
+
+def check_projects_concurrently(projects, max_workers=8, deadline=30.0, recorder=None):
+    """
+    Check several projects with upstream requests running in parallel
+    
+    Upstream lookups run in a bounded thread pool; results are applied to the
+    database on the calling thread as they complete. Yields one result dict per
+    project; projects still waiting on upstream when the deadline passes are
+    reported with status 'timeout'. Projects sharing upstream sources share
+    one request. Each check is added to recorder if given.
+    """
+    started = time.perf_counter()
+    started_at = datetime.utcnow()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    futures = {
+        executor.submit(check_trace.traced, fetch_update_info, github_key, pypi_key): members
+        for (github_key, pypi_key), members in group_by_source(projects).items()
+    }
+    total = sum(len(members) for members in futures.values())
+    reported = set()
+    dequeued = 0
+    SWEEP_QUEUE_DEPTH.inc(total, trigger='bulk')
+    
+    def dequeue():
+        nonlocal dequeued
+        dequeued += 1
+        SWEEP_QUEUE_DEPTH.dec(trigger='bulk')
+    
+    def results_for(future):
+        reported.add(future)
+        update_info, trace = future.result()
+        for index, project in enumerate(futures[future]):
+            dequeue()
+            yield result_for(project, update_info, trace if index == 0 else trace.shared())
+    
+    def result_for(project, update_info, trace):
+        result = {'project_id': project.id, 'name': project.name}
+        previous_version = project.current_version
+        apply_started = time.perf_counter()
+        try:
+            if trace.exception is not None:
+                raise trace.exception
+            version = apply_update_info(project, update_info)
+        except Exception as e:
+            db.session.rollback()
+            db_ms = (time.perf_counter() - apply_started) * 1000 if trace.exception is None else None
+            SWEEP_RESULTS.inc(trigger='bulk', status='error')
+            _record_check(recorder, result['project_id'], 'error', trace, db_ms=db_ms, error=str(e), started_at=started_at)
+            logger.error(f'Error checking updates for {project.name}: {e}')
+            return dict(result, status='error', error=str(e))
+        
+        db_ms = (time.perf_counter() - apply_started) * 1000
+        status = _check_status(version, previous_version, update_info)
+        SWEEP_RESULTS.inc(trigger='bulk', status=status)
+        _record_check(recorder, result['project_id'], status, trace, db_ms=db_ms, changed=status == 'updated', started_at=started_at)
+        return dict(result, status=status, latest_version=project.latest_version)
+    
+    try:
+        for future in as_completed(futures, timeout=deadline):
+            yield from results_for(future)
+    except FuturesTimeoutError:
+        for future, members in futures.items():
+            if future in reported:
+                continue
+            if future.done():
+                yield from results_for(future)
+                continue
+            future.cancel()
+            reported.add(future)
+            for project in members:
+                dequeue()
+                SWEEP_RESULTS.inc(trigger='bulk', status='timeout')
+                if recorder is not None:
+                    recorder.add(project.id, 'timeout', total_ms=deadline * 1000, error='Upstream deadline exceeded', started_at=started_at)
+                yield {'project_id': project.id, 'name': project.name, 'status': 'timeout'}
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if recorder is not None:
+            recorder.flush()
+        refresh_release_analytics()
+        # Projects never reported (the client went away) leave the queue too
+        SWEEP_QUEUE_DEPTH.dec(total - dequeued, trigger='bulk')
+        SWEEP_DURATION.observe(time.perf_counter() - started, trigger='bulk')
+        SWEEP_PROJECTS.observe(total, trigger='bulk')
+
+
+def refresh_pypi_mirror(app):
+    """Incrementally re-ingest the PyPI mirror before a sweep, if one is configured"""
+    source = app.config.get('PYPI_MIRROR_SOURCE')
+    index_path = app.config.get('PYPI_MIRROR_INDEX')
+    if not source or not index_path:
+        return None
+    try:
+        return ingest_pypi_mirror(source, index_path)
+    except Exception as e:
+        logger.error(f'Error refreshing PyPI mirror from {source}: {e}')
+        return None
+
+
+def run_scheduled_check(app):
+    """Run the update sweep inside an application context"""
+    with app.app_context():
+        refresh_pypi_mirror(app)
+        check_all_updates()
+        purge_orphan_sources()
+        purge_check_runs(app.config.get('CHECK_RUNS_RETENTION_DAYS', 14))
+        purge_sweep_checkpoints(app.config.get('CHECK_RUNS_RETENTION_DAYS', 14))
+
+
+def run_notification_delivery(app):
+    """Drain the notification outbox inside an application context"""
+    with app.app_context():
+        dispatcher = OutboxDispatcher.from_config(app.config)
+        dispatcher.dispatch()
+        dispatcher.purge()
+
+
+def get_scheduler_status():
+    """Get scheduler state for status displays"""
+    running = scheduler is not None and scheduler.running
+    job = scheduler.get_job('check_updates') if running else None
+    next_run = getattr(job, 'next_run_time', None)
+    return {
+        'running': running,
+        'next_run_time': next_run.isoformat() if next_run else None
+    }
+
+
+def _acquire_scheduler_lock(app):
+    """
+    Take an exclusive, non-blocking lock so only one process runs the scheduler
+    
+    Gunicorn workers all call start_scheduler(); the first one to lock the file
+    runs the jobs. The lock is released when that process exits.
+    """
+    global _scheduler_lock_file
+    
+    if _scheduler_lock_file is not None:
+        return True
+    try:
+        import fcntl
+    except ImportError:
+        return True  # No advisory locks on Windows; single-process servers only
+    
+    path = app.config.get('SCHEDULER_LOCK_FILE') or os.path.join(app.instance_path, 'scheduler.lock')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lock_file = open(path, 'a')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return False
+    
+    _scheduler_lock_file = lock_file
+    return True
+
+
+def scheduled_check_job():
+    """Scheduler entry point of the update sweep; holds no app reference so it can be persisted"""
+    run_scheduled_check(_scheduler_app)
+
+
+def notification_delivery_job():
+    """Scheduler entry point of notification delivery"""
+    run_notification_delivery(_scheduler_app)
+
+
+def _ensure_interval_job(scheduler, job_id, func, seconds, **options):
+    """
+    Add an interval job unless the job store already holds it unchanged
+    
+    Keeping a persisted job keeps its next run time, so a restart does not
+    push the schedule back by a full interval.
+    """
+    job = scheduler.get_job(job_id)
+    interval = getattr(getattr(job, 'trigger', None), 'interval', None)
+    if job is not None and job.func_ref == func and interval is not None and interval.total_seconds() == seconds:
+        return job
+    return scheduler.add_job(func, trigger='interval', seconds=seconds, id=job_id, replace_existing=True, **options)
 
 
 def start_scheduler(app):
     """Start background scheduler"""
+    global _scheduler_app
+    
     try:
+        scheduler = get_scheduler(app)
+        if not scheduler.running and not _acquire_scheduler_lock(app):
+            logger.info(f'Background scheduler runs in another process (pid {os.getpid()} idle)')
+            return
+        
+        _scheduler_app = app
+        already_running = scheduler.running
+        if not already_running:
+            scheduler.start()
+        
         # Get update check interval from config (in seconds)
         interval = app.config.get('UPDATE_CHECK_INTERVAL', 3600)
         
-        scheduler.add_job(
-            func=check_all_updates,
-            trigger="interval",
-            seconds=interval,
-            id='check_updates',
+        # A run missed while the process was down fires once after restart
+        _ensure_interval_job(
+            scheduler,
+            'check_updates',
+            'background_tasks:scheduled_check_job',
+            interval,
             name='Check for project updates',
-            replace_existing=True,
-            misfire_grace_time=60
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=interval
         )
         
-        if not scheduler.running:
-            scheduler.start()
-            minutes = interval / 60
-            logger.info(f'Background scheduler started - checking every {minutes:.1f} minute(s)')
-        else:
+        delivery_interval = app.config.get('NOTIFICATION_DELIVERY_INTERVAL', 30)
+        _ensure_interval_job(
+            scheduler,
+            'deliver_notifications',
+            'background_tasks:notification_delivery_job',
+            delivery_interval,
+            name='Deliver queued webhook notifications',
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=delivery_interval
+        )
+        
+        # Continue a sweep interrupted by the restart right away
+        with app.app_context():
+            interrupted = unfinished_sweep()
+        if interrupted is not None:
+            logger.info(f"Resuming interrupted sweep {interrupted['sweep_id']} at {interrupted['cursor']}/{interrupted['total']}")
+            scheduler.modify_job('check_updates', next_run_time=datetime.now(timezone.utc))
+        
+        if already_running:
             logger.info('Background scheduler already running')
+        else:
+            minutes = interval / 60
+            logger.info(f'Background scheduler started in pid {os.getpid()} - checking every {minutes:.1f} minute(s)')
             
     except Exception as e:
         logger.error(f'Error starting scheduler: {e}')
@@ -154,7 +643,7 @@ def start_scheduler(app):
 def stop_scheduler():
     """Stop background scheduler"""
     try:
-        if scheduler.running:
+        if scheduler is not None and scheduler.running:
             scheduler.shutdown()
             logger.info('Background scheduler stopped')
     except Exception as e:
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+End-to-end benchmark of the update sweep (check_all_updates)
+
+Starts local GitHub and PyPI stub servers, seeds a throwaway SQLite database
+with N projects and runs one full sweep against the stubs. Reports
+throughput, per-project latency percentiles, upstream call counts and peak
+memory. Project latency is the upstream fetch plus applying its result; a
+fetch shared by several projects is charged to the first of them. Results
+are written as JSON so runs can be compared:
+
+    python benchmarks/bench_sweep.py --projects 5000 --latency-ms 20 --output before.json
+    python benchmarks/bench_sweep.py --projects 5000 --latency-ms 20 --compare before.json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import compare, peak_rss_mb, percentile, run_info  # noqa: E402
+from stub_servers import GitHubStub, PyPIStub  # noqa: E402
+
+
+def seed_projects(db, Project, count: int, github_share: float) -> None:
+    """Bulk insert synthetic projects; a share of them point at the GitHub stub"""
+    github_every = int(round(1 / github_share)) if github_share > 0 else 0
+    batch = []
+    for i in range(count):
+        name = f'bench-package-{i}'
+        batch.append({
+            'name': name,
+            'pypi_package': name,
+            'github_repo': f'https://github.com/bench/{name}' if github_every and i % github_every == 0 else None,
+            'current_version': '1.0.0',
+            'category': f'category-{i % 10}',
+            'active': True,
+            'notify_on_update': True
+        })
+        if len(batch) >= 1000:
+            db.session.execute(db.insert(Project), batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(Project), batch)
+    db.session.commit()
+
+
+def run(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix='version-tracker-bench-')
+    os.environ['DATABASE_URL'] = f'sqlite:///{os.path.join(workdir, "bench.db")}'
+    os.environ['SCHEDULER_AUTOSTART'] = 'False'
+
+    github = GitHubStub(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                        payload_kb=args.payload_kb, rate_limit=args.rate_limit, seed=1).start()
+    pypi = PyPIStub(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+                    payload_kb=args.payload_kb, seed=2).start()
+
+    import logging
+    import background_tasks
+    from app import create_app
+    from models import db, Project, Version, Update
+
+    app = create_app('development')
+    # Injected upstream errors would otherwise flood the output
+    logging.getLogger().setLevel(logging.ERROR)
+    app.config['GITHUB_API_BASE_URL'] = github.base_url
+    app.config['PYPI_API_BASE_URL'] = f'{pypi.base_url}/pypi'
+    background_tasks.init_services(app)
+
+    latencies = []
+    check_project_updates = background_tasks.check_project_updates
+    fetch_update_info = background_tasks.fetch_update_info
+    # Upstream time of the last fetch, charged to the first project that applies it
+    unclaimed_fetch = [0.0]
+
+    def timed_fetch(*args):
+        started = time.perf_counter()
+        try:
+            return fetch_update_info(*args)
+        finally:
+            unclaimed_fetch[0] += time.perf_counter() - started
+
+    def timed_check(project, **kwargs):
+        # The sweep fetches before calling check_project_updates(fetched=...)
+        upstream = unclaimed_fetch[0] if kwargs.get('fetched') is not None else 0.0
+        unclaimed_fetch[0] = 0.0
+        started = time.perf_counter()
+        try:
+            return check_project_updates(project, **kwargs)
+        finally:
+            latencies.append(upstream + time.perf_counter() - started)
+            unclaimed_fetch[0] = 0.0
+
+    background_tasks.fetch_update_info = timed_fetch
+    background_tasks.check_project_updates = timed_check
+    try:
+        with app.app_context():
+            db.create_all()
+            seed_started = time.perf_counter()
+            seed_projects(db, Project, args.projects, args.github_share)
+            seed_seconds = time.perf_counter() - seed_started
+            db.session.remove()
+
+            if args.tracemalloc:
+                tracemalloc.start()
+            started = time.perf_counter()
+            background_tasks.check_all_updates()
+            duration = time.perf_counter() - started
+            traced_peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024) if args.tracemalloc else None
+            tracemalloc.stop()
+
+            versions = db.session.query(db.func.count(Version.id)).scalar()
+            updates = db.session.query(db.func.count(Update.id)).scalar()
+    finally:
+        background_tasks.check_project_updates = check_project_updates
+        background_tasks.fetch_update_info = fetch_update_info
+        github.stop()
+        pypi.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return dict(run_info(), **{
+        'params': {
+            'projects': args.projects,
+            'github_share': args.github_share,
+            'latency_ms': args.latency_ms,
+            'jitter_ms': args.jitter_ms,
+            'error_rate': args.error_rate,
+            'payload_kb': args.payload_kb,
+            'rate_limit': args.rate_limit
+        },
+        'results': {
+            'seed_seconds': round(seed_seconds, 3),
+            'sweep_seconds': round(duration, 3),
+            'projects_per_second': round(args.projects / duration, 2) if duration else None,
+            'project_p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+            'project_p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+            'project_max_ms': round(max(latencies) * 1000, 3) if latencies else 0.0,
+            'projects_checked': len(latencies),
+            'versions_recorded': versions,
+            'updates_recorded': updates,
+            'upstream': {'github': dict(github.counts), 'pypi': dict(pypi.counts)},
+            'upstream_calls_per_project': round(
+                (github.counts['requests'] + pypi.counts['requests']) / max(1, args.projects), 3
+            ),
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'peak_traced_mb': round(traced_peak, 1) if traced_peak is not None else None
+        }
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark check_all_updates against local stub servers')
+    parser.add_argument('--projects', type=int, default=1000)
+    parser.add_argument('--github-share', type=float, default=0.5, help='fraction of projects with a GitHub repo')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='added latency per upstream request')
+    parser.add_argument('--jitter-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of upstream requests answered 503')
+    parser.add_argument('--payload-kb', type=int, default=4, help='approximate upstream response size')
+    parser.add_argument('--rate-limit', type=int, default=0, help='GitHub requests allowed per hour (0 = unlimited)')
+    parser.add_argument('--tracemalloc', action='store_true', help='also report traced Python allocations')
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--compare', help='previous results JSON to compare against')
+    args = parser.parse_args()
+
+    result = run(args)
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
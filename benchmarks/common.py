@@ -0,0 +1,61 @@
+# MIT License
+
+"""
+Helpers shared by the benchmark scripts
+"""
+
+import os
+import platform
+import resource
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values, fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run_info() -> dict:
+    """Metadata identifying a benchmark run"""
+    return {
+        'timestamp': datetime.utcnow().isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform()
+    }
+
+
+def compare(current: dict, previous: dict, prefix: str = '') -> None:
+    """Print relative changes of numeric values, recursing into nested dicts"""
+    if not prefix:
+        print(f"\nCompared with {previous.get('revision', '?')} ({previous.get('timestamp', '?')}):")
+        current, previous = current['results'], previous.get('results', {})
+    for key, value in current.items():
+        before = previous.get(key) if isinstance(previous, dict) else None
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            compare(value, before or {}, prefix=f'{name}.')
+        elif isinstance(value, (int, float)) and isinstance(before, (int, float)) and before:
+            print(f'  {name:48s} {before:>12} -> {value:>12}  ({(value - before) / before * 100:+.1f}%)')
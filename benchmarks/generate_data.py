@@ -0,0 +1,218 @@
+#!/usr/bin/env python
+"""
+Synthetic dataset generator
+
+Bulk-loads N projects with release histories whose intervals follow a
+heavy-tailed (log-normal) cadence like real PyPI packages, plus the updates
+detected since each project started being tracked, a share of them unread:
+
+    python benchmarks/generate_data.py --projects 20000 --database-url sqlite:///bench.db
+    python benchmarks/generate_data.py --projects 20000 --database-url postgresql://localhost/tracker_bench --reset
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CATEGORIES = ['web', 'data', 'ml', 'testing', 'devops', 'cli', 'database', 'security', 'async', 'utilities']
+# Zipf-like popularity of categories
+CATEGORY_WEIGHTS = [1 / (rank + 1) for rank in range(len(CATEGORIES))]
+
+WORDS = ['flask', 'rapid', 'py', 'json', 'async', 'data', 'frame', 'core', 'lite', 'tool', 'kit', 'http',
+         'graph', 'test', 'cli', 'db', 'auth', 'cache', 'queue', 'stream', 'vector', 'model', 'schema']
+
+BATCH_SIZE = 5000
+
+
+class DatasetProfile:
+    """Distribution parameters for generated data"""
+
+    def __init__(self, median_interval_days: float = 21.0, interval_sigma: float = 1.2,
+                 max_age_years: float = 12.0, max_releases: int = 300, tracked_days: int = 730,
+                 notified_ratio: float = 0.9, github_ratio: float = 0.7, inactive_ratio: float = 0.05,
+                 prerelease_ratio: float = 0.05, behind_ratio: float = 0.3):
+        self.median_interval_days = median_interval_days
+        self.interval_sigma = interval_sigma
+        self.max_age_years = max_age_years
+        self.max_releases = max_releases
+        self.tracked_days = tracked_days
+        self.notified_ratio = notified_ratio
+        self.github_ratio = github_ratio
+        self.inactive_ratio = inactive_ratio
+        self.prerelease_ratio = prerelease_ratio
+        self.behind_ratio = behind_ratio
+
+
+def _bump(rng: random.Random, version):
+    major, minor, patch = version
+    roll = rng.random()
+    if roll < 0.03:
+        return major + 1, 0, 0, 'major'
+    if roll < 0.25:
+        return major, minor + 1, 0, 'minor'
+    return major, minor, patch + 1, 'patch'
+
+
+def release_history(rng: random.Random, profile: DatasetProfile, now: datetime):
+    """Yield (version, release_date, is_prerelease, update_type) from oldest to newest"""
+    age_days = rng.uniform(30, profile.max_age_years * 365)
+    released = now - timedelta(days=age_days)
+    version = (0, 1, 0)
+    mu = math.log(profile.median_interval_days)
+    history = [('0.1.0', released, False, None)]
+
+    while len(history) < profile.max_releases:
+        released += timedelta(days=rng.lognormvariate(mu, profile.interval_sigma))
+        if released >= now:
+            break
+        major, minor, patch, update_type = _bump(rng, version)
+        version = (major, minor, patch)
+        number = f'{major}.{minor}.{patch}'
+        if rng.random() < profile.prerelease_ratio:
+            history.append((f'{number}rc1', released - timedelta(days=rng.uniform(1, 7)), True, update_type))
+        history.append((number, released, False, update_type))
+    return history
+
+
+def generate(db, projects: int, profile: DatasetProfile, seed: int = 0, log=print) -> dict:
+    """Insert projects, versions and updates (requires an application context)"""
+    from models import Project, Version, Update
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    start_id = (db.session.query(db.func.max(Project.id)).scalar() or 0) + 1
+    counts = {'projects': 0, 'versions': 0, 'updates': 0, 'unread_updates': 0}
+    rows = {Project: [], Version: [], Update: []}
+
+    def flush(force: bool = False):
+        if not force and len(rows[Version]) < BATCH_SIZE and len(rows[Update]) < BATCH_SIZE:
+            return
+        # Parents first so foreign keys hold on server databases
+        for model in (Project, Version, Update):
+            if rows[model]:
+                db.session.execute(db.insert(model), rows[model])
+                rows[model] = []
+        db.session.commit()
+
+    started = time.perf_counter()
+    for project_id in range(start_id, start_id + projects):
+        name = f'{rng.choice(WORDS)}-{rng.choice(WORDS)}-{project_id}'
+        history = release_history(rng, profile, now)
+        finals = [release for release in history if not release[2]]
+        latest = finals[-1]
+
+        # Tracking started some time ago; releases after that produced updates
+        tracked_since = now - timedelta(days=rng.uniform(1, profile.tracked_days))
+        detected = [release for release in finals if release[1] >= tracked_since]
+        current = latest
+        if len(finals) > 1 and rng.random() < profile.behind_ratio:
+            current = finals[-1 - rng.randint(1, min(5, len(finals) - 1))]
+
+        rows[Project].append({
+            'id': project_id,
+            'name': name,
+            'description': f'Synthetic {name} package',
+            'github_repo': f'https://github.com/synthetic/{name}' if rng.random() < profile.github_ratio else None,
+            'pypi_package': name,
+            'category': rng.choices(CATEGORIES, weights=CATEGORY_WEIGHTS)[0],
+            'current_version': current[0],
+            'latest_version': latest[0],
+            'latest_release_date': latest[1],
+            'active': rng.random() >= profile.inactive_ratio,
+            'notify_on_update': True,
+            'created_at': tracked_since,
+            'updated_at': detected[-1][1] if detected else tracked_since,
+            'last_checked': now - timedelta(minutes=rng.uniform(0, 120))
+        })
+
+        for number, released, is_prerelease, _ in history:
+            rows[Version].append({
+                'project_id': project_id,
+                'version_number': number,
+                'release_date': released,
+                'download_url': f'https://pypi.org/project/{name}/{number}/',
+                'is_prerelease': is_prerelease,
+                'is_latest': number == latest[0],
+                'created_at': max(released, tracked_since)
+            })
+
+        previous = None
+        for release in finals:
+            if release[1] >= tracked_since and previous is not None:
+                detected_at = release[1] + timedelta(minutes=rng.uniform(1, 180))
+                notified = rng.random() < profile.notified_ratio
+                rows[Update].append({
+                    'project_id': project_id,
+                    'old_version': previous[0],
+                    'new_version': release[0],
+                    'update_type': release[3],
+                    'description': f'Release {release[0]}',
+                    'detected_at': detected_at,
+                    'release_date': release[1],
+                    'notified': notified,
+                    'notified_at': detected_at + timedelta(hours=rng.uniform(0, 48)) if notified else None
+                })
+                counts['updates'] += 1
+                counts['unread_updates'] += not notified
+            previous = release
+
+        counts['projects'] += 1
+        counts['versions'] += len(history)
+        flush()
+        if counts['projects'] % 10000 == 0:
+            log(f'  {counts["projects"]} projects, {counts["versions"]} versions, {counts["updates"]} updates')
+
+    flush(force=True)
+    counts['seconds'] = round(time.perf_counter() - started, 2)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load a synthetic Version Tracker dataset')
+    parser.add_argument('--projects', type=int, default=10000)
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', 'sqlite:///bench.db'))
+    parser.add_argument('--reset', action='store_true', help='drop and recreate all tables first')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--median-interval-days', type=float, default=21.0, help='median time between releases')
+    parser.add_argument('--max-releases', type=int, default=300)
+    parser.add_argument('--tracked-days', type=int, default=730, help='how long projects have been tracked')
+    parser.add_argument('--notified-ratio', type=float, default=0.9, help='share of updates already read')
+    parser.add_argument('--behind-ratio', type=float, default=0.3, help='share of projects behind latest')
+    args = parser.parse_args()
+
+    os.environ['DATABASE_URL'] = args.database_url
+    os.environ['SCHEDULER_AUTOSTART'] = 'False'
+    os.environ['AUTO_CREATE_SCHEMA'] = 'False'
+
+    import logging
+    from app import create_app
+    from cli import upgrade_schema
+    from models import db
+
+    app = create_app('production')
+    logging.getLogger().setLevel(logging.WARNING)
+
+    profile = DatasetProfile(
+        median_interval_days=args.median_interval_days,
+        max_releases=args.max_releases,
+        tracked_days=args.tracked_days,
+        notified_ratio=args.notified_ratio,
+        behind_ratio=args.behind_ratio
+    )
+    with app.app_context():
+        if args.reset:
+            db.drop_all()
+        upgrade_schema()
+        counts = generate(db, args.projects, profile, seed=args.seed)
+    print(json.dumps(dict(counts, database_url=args.database_url), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python
+"""
+Mixed read/write load driver for the API
+
+Replays a weighted mix of list, detail, history, notification, statistics
+and write requests and reports per-endpoint latency percentiles, throughput
+and SQL query counts (from the Server-Timing header added by request
+profiling). Runs in-process against a database URL, or against a running
+server with --url (start it with PROFILING_ENABLED=True to get query counts):
+
+    python benchmarks/generate_data.py --projects 20000 --database-url sqlite:///bench.db
+    python benchmarks/load_driver.py --database-url sqlite:///bench.db --requests 5000 --concurrency 8
+    python benchmarks/load_driver.py --url http://localhost:5000 --duration 60 --output run.json
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import compare, percentile, run_info  # noqa: E402
+
+# endpoint label -> weight
+DEFAULT_MIX = {
+    'GET /api/projects': 25,
+    'GET /api/projects?filter': 10,
+    'GET /api/projects/<id>': 10,
+    'GET /api/updates/history': 15,
+    'GET /api/notifications/unread': 10,
+    'GET /api/statistics': 10,
+    'GET /api/dashboard': 10,
+    'PUT /api/projects/<id>': 5,
+    'POST /api/notifications/mark-read': 5,
+}
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+def build_request(label: str, rng: random.Random, projects, categories, pages: int):
+    """Return (method, path, json body) for an endpoint label"""
+    if label == 'GET /api/projects':
+        return 'GET', f'/api/projects?page={rng.randint(1, pages)}', None
+    if label == 'GET /api/projects?filter':
+        category = rng.choice(categories)
+        return 'GET', f'/api/projects?category={category}&active=true&page={rng.randint(1, min(3, pages))}', None
+    if label == 'GET /api/projects/<id>':
+        return 'GET', f'/api/projects/{rng.choice(projects)["id"]}', None
+    if label == 'GET /api/updates/history':
+        return 'GET', f'/api/updates/history?page={rng.randint(1, pages)}', None
+    if label == 'GET /api/notifications/unread':
+        return 'GET', '/api/notifications/unread', None
+    if label == 'GET /api/statistics':
+        return 'GET', '/api/statistics', None
+    if label == 'GET /api/dashboard':
+        return 'GET', '/api/dashboard', None
+    if label == 'PUT /api/projects/<id>':
+        project = rng.choice(projects)
+        return 'PUT', f'/api/projects/{project["id"]}', {'description': f'Edited {time.time():.3f}'}
+    if label == 'POST /api/notifications/mark-read':
+        return 'POST', f'/api/notifications/mark-read/{rng.choice(projects)["name"]}', None
+    raise ValueError(f'Unknown endpoint label: {label}')
+
+
+class InProcessClient:
+    """Issues requests through the Flask test client"""
+
+    def __init__(self, app):
+        self.app = app
+
+    def request(self, method: str, path: str, body):
+        response = self.app.test_client().open(path, method=method, json=body)
+        response.get_data()
+        return response.status_code, response.headers.get('Server-Timing', '')
+
+
+class HTTPClient:
+    """Issues requests to a running server, one session per thread"""
+
+    def __init__(self, base_url: str):
+        import requests
+        self.base_url = base_url.rstrip('/')
+        self._requests = requests
+        self._local = threading.local()
+
+    def request(self, method: str, path: str, body):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = self._requests.Session()
+        response = session.request(method, self.base_url + path, json=body, timeout=60)
+        return response.status_code, response.headers.get('Server-Timing', '')
+
+
+def load_projects(client):
+    """Fetch project ids, names and categories through the export endpoint"""
+    status, _ = client.request('GET', '/api/projects?page=1', None)
+    if status != 200:
+        raise SystemExit(f'GET /api/projects returned {status}')
+    if isinstance(client, InProcessClient):
+        body = client.app.test_client().get('/api/projects:export').get_data(as_text=True)
+    else:
+        body = client._requests.get(client.base_url + '/api/projects:export', timeout=300).text
+    projects = [json.loads(line) for line in body.splitlines() if line.strip()]
+    if not projects:
+        raise SystemExit('No projects found; run benchmarks/generate_data.py first')
+    return projects
+
+
+def run(args) -> dict:
+    if args.url:
+        client = HTTPClient(args.url)
+    else:
+        os.environ['DATABASE_URL'] = args.database_url
+        os.environ['SCHEDULER_AUTOSTART'] = 'False'
+        os.environ['AUTO_CREATE_SCHEMA'] = 'False'
+        os.environ['PROFILING_ENABLED'] = 'True'
+        os.environ['PROFILING_SLOW_REQUEST_MS'] = str(10 ** 9)
+        if args.no_cache:
+            os.environ['RESPONSE_CACHE_BACKEND'] = 'null'
+
+        import logging
+        from app import create_app
+        app = create_app('production')
+        logging.getLogger().setLevel(logging.WARNING)
+        client = InProcessClient(app)
+
+    mix = dict(DEFAULT_MIX)
+    for item in filter(None, (args.mix or '').split(',')):
+        label, weight = item.rsplit('=', 1)
+        mix[label.strip()] = float(weight)
+    labels = [label for label, weight in mix.items() if weight > 0]
+    weights = [mix[label] for label in labels]
+
+    projects = load_projects(client)
+    categories = sorted({p.get('category') for p in projects if p.get('category')}) or ['none']
+    pages = max(1, min(args.max_page, len(projects) // 20))
+
+    samples = {label: [] for label in labels}
+    errors = {label: 0 for label in labels}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.duration if args.duration else None
+    issued = [0]
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        while True:
+            with lock:
+                if (deadline and time.perf_counter() >= deadline) or (not deadline and issued[0] >= args.requests):
+                    return
+                issued[0] += 1
+            label = rng.choices(labels, weights=weights)[0]
+            method, path, body = build_request(label, rng, projects, categories, pages)
+            started = time.perf_counter()
+            try:
+                status, timing = client.request(method, path, body)
+            except Exception:
+                status, timing = 0, ''
+            elapsed = time.perf_counter() - started
+
+            match = _SERVER_TIMING_DB.search(timing)
+            with lock:
+                if status >= 400 or status == 0:
+                    errors[label] += 1
+                samples[label].append((
+                    elapsed,
+                    int(match.group(2)) if match else None,
+                    float(match.group(1)) if match else None
+                ))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for future in [executor.submit(worker, args.seed + i) for i in range(args.concurrency)]:
+            future.result()
+    wall = time.perf_counter() - started
+
+    endpoints = {}
+    for label in labels:
+        rows = samples[label]
+        if not rows:
+            continue
+        latencies = [row[0] for row in rows]
+        queries = [row[1] for row in rows if row[1] is not None]
+        db_ms = [row[2] for row in rows if row[2] is not None]
+        endpoints[label] = {
+            'requests': len(rows),
+            'errors': errors[label],
+            'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'max_ms': round(max(latencies) * 1000, 2),
+            'queries_mean': round(sum(queries) / len(queries), 2) if queries else None,
+            'queries_max': max(queries) if queries else None,
+            'db_ms_mean': round(sum(db_ms) / len(db_ms), 2) if db_ms else None
+        }
+
+    total = sum(len(rows) for rows in samples.values())
+    all_latencies = [row[0] for rows in samples.values() for row in rows]
+    return dict(run_info(), **{
+        'params': {
+            'target': args.url or args.database_url,
+            'concurrency': args.concurrency,
+            'requests': args.requests if not args.duration else None,
+            'duration': args.duration,
+            'cache': not args.no_cache,
+            'projects': len(projects),
+            'mix': mix
+        },
+        'results': {
+            'requests': total,
+            'errors': sum(errors.values()),
+            'seconds': round(wall, 2),
+            'throughput_rps': round(total / wall, 2) if wall else None,
+            'p50_ms': round(percentile(all_latencies, 0.50) * 1000, 2),
+            'p99_ms': round(percentile(all_latencies, 0.99) * 1000, 2),
+            'endpoints': endpoints
+        }
+    })
+
+
+def print_table(result: dict) -> None:
+    print(f"\n{'endpoint':38s} {'n':>6} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8} {'db ms':>7}")
+    for label, stats in result['results']['endpoints'].items():
+        print(f"{label:38s} {stats['requests']:>6} {stats['errors']:>4} {stats['p50_ms']:>8} "
+              f"{stats['p95_ms']:>8} {stats['p99_ms']:>8} {str(stats['queries_mean']):>8} {str(stats['db_ms_mean']):>7}")
+    results = result['results']
+    print(f"\n{results['requests']} requests in {results['seconds']} s: {results['throughput_rps']} req/s, "
+          f"p50 {results['p50_ms']} ms, p99 {results['p99_ms']} ms, {results['errors']} errors")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay a mixed API workload and report latency per endpoint')
+    parser.add_argument('--database-url', default=os.getenv('DATABASE_URL', 'sqlite:///bench.db'),
+                        help='database for the in-process app')
+    parser.add_argument('--url', help='base URL of a running server instead of the in-process app')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--duration', type=float, help='run for this many seconds instead of --requests')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--mix', help='override weights, e.g. "GET /api/statistics=0,PUT /api/projects/<id>=20"')
+    parser.add_argument('--max-page', type=int, default=50, help='highest page number requested')
+    parser.add_argument('--no-cache', action='store_true', help='disable the response cache (in-process only)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--compare', help='previous results JSON to compare against')
+    args = parser.parse_args()
+
+    result = run(args)
+    print_table(result)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
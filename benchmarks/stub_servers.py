@@ -0,0 +1,196 @@
+# MIT License
+
+"""
+Local stand-ins for the GitHub releases API and the PyPI JSON API
+
+Both servers answer every package/repository with a deterministic release so
+benchmark runs are reproducible. Latency, error rate, payload size and GitHub
+rate limiting are configurable.
+"""
+
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+
+def release_for(name: str, generations: int = 5) -> str:
+    """Deterministic "latest" version for a package name"""
+    digest = int(hashlib.md5(name.encode('utf-8')).hexdigest()[:8], 16)
+    return f'1.{digest % generations}.{digest % 3}'
+
+
+class StubServer:
+    """Threaded HTTP server with latency/error injection and request counters"""
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 payload_kb: int = 4, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.payload_kb = payload_kb
+        self.counts = {'requests': 0, 'errors': 0, 'rate_limited': 0, 'bytes': 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.counts[key] += amount
+
+    def _delay(self) -> None:
+        if self.latency_ms or self.jitter_ms:
+            with self._lock:
+                jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def _inject_error(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def rate_limit_headers(self) -> Optional[Dict[str, str]]:
+        """Extra headers for a response; None means the request is rejected"""
+        return {}
+
+    def handle(self, path: str):
+        """Return (status, body dict) for a request path"""
+        raise NotImplementedError
+
+    def start(self) -> 'StubServer':
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                stub._count('requests')
+                stub._delay()
+
+                headers = stub.rate_limit_headers()
+                if headers is None:
+                    stub._count('rate_limited')
+                    status, body, headers = 403, {'message': 'API rate limit exceeded'}, stub.exhausted_headers()
+                elif stub._inject_error():
+                    stub._count('errors')
+                    status, body = 503, {'message': 'Service unavailable'}
+                else:
+                    status, body = stub.handle(self.path)
+
+                payload = json.dumps(body).encode('utf-8')
+                stub._count('bytes', len(payload))
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class GitHubStub(StubServer):
+    """GET /repos/<owner>/<repo>/releases/latest, with GitHub rate-limit headers"""
+
+    def __init__(self, rate_limit: int = 0, rate_limit_window: int = 3600, **kwargs):
+        super().__init__(**kwargs)
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self._remaining = rate_limit
+        self._reset_at = time.time() + rate_limit_window
+
+    def _reset_if_due(self) -> None:
+        if time.time() >= self._reset_at:
+            self._remaining = self.rate_limit
+            self._reset_at = time.time() + self.rate_limit_window
+
+    def exhausted_headers(self) -> Dict[str, str]:
+        return {
+            'X-RateLimit-Limit': str(self.rate_limit),
+            'X-RateLimit-Remaining': '0',
+            'X-RateLimit-Reset': str(int(self._reset_at))
+        }
+
+    def rate_limit_headers(self) -> Optional[Dict[str, str]]:
+        if not self.rate_limit:
+            return {}
+        with self._lock:
+            self._reset_if_due()
+            if self._remaining <= 0:
+                return None
+            self._remaining -= 1
+            return {
+                'X-RateLimit-Limit': str(self.rate_limit),
+                'X-RateLimit-Remaining': str(self._remaining),
+                'X-RateLimit-Reset': str(int(self._reset_at))
+            }
+
+    def handle(self, path: str):
+        parts = path.strip('/').split('/')
+        if len(parts) == 5 and parts[0] == 'repos' and parts[3:] == ['releases', 'latest']:
+            repo = parts[2]
+            tag = release_for(repo)
+            return 200, {
+                'tag_name': tag,
+                'name': f'{repo} {tag}',
+                'html_url': f'https://github.com/{parts[1]}/{repo}/releases/tag/{tag}',
+                'published_at': '2024-01-15T12:00:00Z',
+                'prerelease': False,
+                # Release notes make up most of a real payload
+                'body': 'x' * (self.payload_kb * 1024)
+            }
+        return 404, {'message': 'Not Found'}
+
+
+class PyPIStub(StubServer):
+    """GET /pypi/<package>/json with a release history sized by payload_kb"""
+
+    def handle(self, path: str):
+        parts = path.strip('/').split('/')
+        if len(parts) == 3 and parts[0] == 'pypi' and parts[2] == 'json':
+            package = parts[1]
+            latest = release_for(package)
+            # Roughly 256 bytes per file entry
+            history = max(1, self.payload_kb * 4)
+            releases = {
+                f'0.{i}.0': [{'filename': f'{package}-0.{i}.0.tar.gz', 'size': 1024 * i,
+                              'upload_time_iso_8601': '2020-01-01T00:00:00.000000Z',
+                              'url': f'https://files.example/{package}/0.{i}.0.tar.gz'}]
+                for i in range(history)
+            }
+            releases[latest] = [{'filename': f'{package}-{latest}.tar.gz', 'size': 2048,
+                                 'upload_time_iso_8601': '2024-01-15T12:00:00.000000Z',
+                                 'url': f'https://files.example/{package}/{latest}.tar.gz'}]
+            return 200, {
+                'info': {
+                    'name': package,
+                    'version': latest,
+                    'summary': f'Synthetic package {package}',
+                    'project_url': f'https://pypi.org/project/{package}/'
+                },
+                'releases': releases
+            }
+        return 404, {'message': 'Not Found'}
@@ -0,0 +1,385 @@
+# MIT License
+
+"""
+Response cache for hot GET endpoints of the API blueprint
+Entries are evicted by LRU/TTL and invalidated by tags fired from write paths
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+from flask import current_app, make_response, request
+
+logger = logging.getLogger(__name__)
+
+# Headers that must not be replayed from a cached response
+_SKIP_HEADERS = {'content-length', 'set-cookie'}
+
+
+class CacheBackend:
+    """Base class for response cache backends"""
+
+    name = 'base'
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a stored entry or None if missing/expired"""
+        raise NotImplementedError
+
+    def set(self, key: str, entry: Dict, ttl: int) -> None:
+        """Store an entry for ttl seconds"""
+        raise NotImplementedError
+
+    def tag_versions(self, tags: Iterable[str]) -> Dict[str, str]:
+        """Return the current version token of each tag"""
+        raise NotImplementedError
+
+    def bump_tags(self, tags: Iterable[str]) -> None:
+        """Give each tag a new version token, invalidating entries stored under the old one"""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        raise NotImplementedError
+
+    def info(self) -> Dict:
+        """Return backend size information"""
+        return {}
+
+
+class NullCacheBackend(CacheBackend):
+    """Backend that never stores anything (caching disabled)"""
+
+    name = 'null'
+
+    def get(self, key):
+        return None
+
+    def set(self, key, entry, ttl):
+        pass
+
+    def tag_versions(self, tags):
+        return {}
+
+    def bump_tags(self, tags):
+        pass
+
+    def clear(self):
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Process-local LRU backend with TTL and a memory cap"""
+
+    name = 'memory'
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 32 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry['expires'] < time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry, ttl):
+        size = len(entry['body']) + len(key)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            entry = dict(entry, expires=time.time() + ttl, size=size)
+            self._entries[key] = entry
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def tag_versions(self, tags):
+        with self._lock:
+            return {tag: self._tags.setdefault(tag, uuid.uuid4().hex) for tag in tags}
+
+    def bump_tags(self, tags):
+        with self._lock:
+            for tag in tags:
+                self._tags[tag] = uuid.uuid4().hex
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def info(self):
+        return {'entries': len(self._entries), 'bytes': self._bytes}
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._bytes -= entry['size']
+
+
+class FileCacheBackend(CacheBackend):
+    """Backend shared by all workers on a host through a local directory"""
+
+    name = 'file'
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 1024,
+                 max_bytes: int = 32 * 1024 * 1024):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), 'version_tracker_cache')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries_dir = os.path.join(self.directory, 'entries')
+        self._tags_dir = os.path.join(self.directory, 'tags')
+        os.makedirs(self._entries_dir, exist_ok=True)
+        os.makedirs(self._tags_dir, exist_ok=True)
+        self._writes = 0
+
+    def get(self, key):
+        path = self._entry_path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        if entry['expires'] < time.time():
+            self._unlink(path)
+            return None
+
+        # Touch the file so pruning approximates LRU order
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def set(self, key, entry, ttl):
+        if len(entry['body']) > self.max_bytes:
+            return
+
+        entry = dict(entry, expires=time.time() + ttl)
+        self._atomic_write(self._entry_path(key), pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+
+        self._writes += 1
+        if self._writes % 64 == 0:
+            self._prune()
+
+    def tag_versions(self, tags):
+        versions = {}
+        for tag in tags:
+            path = self._tag_path(tag)
+            try:
+                with open(path, 'r') as f:
+                    versions[tag] = f.read()
+            except OSError:
+                versions[tag] = self._write_tag(path)
+        return versions
+
+    def bump_tags(self, tags):
+        for tag in tags:
+            self._write_tag(self._tag_path(tag))
+
+    def clear(self):
+        for item in os.scandir(self._entries_dir):
+            self._unlink(item.path)
+
+    def info(self):
+        entries = [item.stat().st_size for item in os.scandir(self._entries_dir)]
+        return {'entries': len(entries), 'bytes': sum(entries), 'directory': self.directory}
+
+    def _entry_path(self, key):
+        return os.path.join(self._entries_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def _tag_path(self, tag):
+        return os.path.join(self._tags_dir, hashlib.sha1(tag.encode('utf-8')).hexdigest())
+
+    def _write_tag(self, path):
+        token = uuid.uuid4().hex
+        self._atomic_write(path, token.encode('ascii'))
+        return token
+
+    def _atomic_write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f'Error writing cache file {path}: {e}')
+            self._unlink(tmp_path)
+
+    def _prune(self):
+        """Drop least recently used files until the directory fits the limits"""
+        try:
+            items = sorted(
+                ((item.stat().st_mtime, item.stat().st_size, item.path) for item in os.scandir(self._entries_dir)),
+                reverse=True
+            )
+        except OSError:
+            return
+
+        total = 0
+        for index, (_, size, path) in enumerate(items):
+            total += size
+            if index >= self.max_entries or total > self.max_bytes:
+                self._unlink(path)
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+BACKENDS = {
+    'null': lambda config: NullCacheBackend(),
+    'memory': lambda config: MemoryCacheBackend(
+        max_entries=config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024),
+        max_bytes=config.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+    ),
+    'file': lambda config: FileCacheBackend(
+        directory=config.get('RESPONSE_CACHE_DIR'),
+        max_entries=config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024),
+        max_bytes=config.get('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024)
+    ),
+}
+
+
+class ResponseCache:
+    """Caches serialized GET responses and invalidates them by tag"""
+
+    def __init__(self):
+        self.backend = NullCacheBackend()
+        self.ttl = 300
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def init_app(self, app) -> None:
+        """Configure the backend from application config"""
+        backend_name = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        factory = BACKENDS.get(backend_name)
+        if factory is None:
+            raise ValueError(f'Unknown response cache backend: {backend_name}')
+        if backend_name == 'memory' and app.config.get('WORKER_PROCESSES', 1) > 1:
+            # Tag versions would only change in the worker handling the write
+            raise ValueError('The memory response cache cannot be shared by several worker processes; '
+                             'set RESPONSE_CACHE_BACKEND=file')
+
+        self.backend = factory(app.config)
+        self.ttl = app.config.get('RESPONSE_CACHE_TTL', 300)
+        self.hits = 0
+        self.misses = 0
+        app.extensions['response_cache'] = self
+        logger.info(f'Response cache backend: {self.backend.name}')
+
+    @staticmethod
+    def register_backend(name: str, factory: Callable) -> None:
+        """Register a backend factory taking the app config"""
+        BACKENDS[name] = factory
+
+    def add_listener(self, listener: Callable[[List[str]], None]) -> None:
+        """Call listener(tags) whenever tags are invalidated"""
+        self._listeners.append(listener)
+
+    def invalidate(self, *tags: str) -> None:
+        """Invalidate every entry stored under any of the given tags"""
+        self.backend.bump_tags(tags)
+        for listener in self._listeners:
+            try:
+                listener(list(tags))
+            except Exception as e:
+                logger.error(f'Error in cache invalidation listener: {e}')
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        self.backend.clear()
+
+    def stats(self) -> Dict:
+        """Return hit/miss counters for tuning"""
+        lookups = self.hits + self.misses
+        return dict(
+            self.backend.info(),
+            backend=self.backend.name,
+            ttl=self.ttl,
+            hits=self.hits,
+            misses=self.misses,
+            hit_rate=round(self.hits / lookups, 4) if lookups else 0.0
+        )
+
+    def cached(self, tags):
+        """
+        Decorator caching a GET view; tags is a list or a callable taking the view kwargs
+
+        A callable returning None skips the cache for that request.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if request.method != 'GET' or isinstance(self.backend, NullCacheBackend):
+                    return view(*args, **kwargs)
+
+                entry_tags = tags(**kwargs) if callable(tags) else list(tags)
+                if entry_tags is None:
+                    return view(*args, **kwargs)
+                key = request.full_path
+
+                # Tag versions are read before the view runs so a concurrent
+                # write always invalidates what we are about to store
+                versions = self.backend.tag_versions(entry_tags)
+                entry = self.backend.get(key)
+                if entry is not None and entry['tags'] == versions:
+                    self._count(hit=True)
+                    response = current_app.response_class(
+                        entry['body'], status=entry['status'], headers=entry['headers']
+                    )
+                    return response.make_conditional(request)
+
+                self._count(hit=False)
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and not response.is_streamed:
+                    self.backend.set(key, {
+                        'body': response.get_data(),
+                        'status': response.status_code,
+                        'headers': [
+                            (name, value) for name, value in response.headers.items()
+                            if name.lower() not in _SKIP_HEADERS
+                        ],
+                        'tags': versions
+                    }, self.ttl)
+                return response
+            return wrapper
+        return decorator
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+# Global response cache instance
+response_cache = ResponseCache()
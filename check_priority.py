@@ -0,0 +1,129 @@
+# MIT License
+
+"""
+Priority-aware ordering of scheduled checks
+Each project gets a score from its explicit priority, notify setting,
+recent user interest (decayed project page views) and staleness. Staleness
+grows with every check interval that passes without a check, so low
+priority projects age into the front of the queue instead of starving.
+Sweeps pop source groups from a max-heap and stop fetching when the
+per-sweep upstream budget is spent.
+"""
+
+import heapq
+import itertools
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from models import db, Project
+
+logger = logging.getLogger(__name__)
+
+# Explicit Project.priority levels
+PRIORITY_LOW = -1
+PRIORITY_NORMAL = 0
+PRIORITY_HIGH = 1
+PRIORITY_CRITICAL = 2
+PRIORITY_LEVELS = {'low': PRIORITY_LOW, 'normal': PRIORITY_NORMAL, 'high': PRIORITY_HIGH, 'critical': PRIORITY_CRITICAL}
+
+DEFAULT_WEIGHTS = {
+    'priority': 10.0,         # Per explicit priority level
+    'notify': 5.0,            # Projects that notify on updates
+    'interest': 4.0,          # Times log(1 + decayed page views)
+    'aging': 3.0,             # Per check interval since the last check
+    'never_checked': 1000.0,  # New projects go first
+    'dormant': -5.0           # No release for ANALYTICS_STALE_MONTHS
+}
+
+
+def decayed_interest(interest: Optional[float], updated_at: Optional[datetime], now: datetime,
+                     half_life_hours: float) -> float:
+    """Page view count halved every half_life_hours since it was last updated"""
+    if not interest or updated_at is None:
+        return 0.0
+    hours = max((now - updated_at).total_seconds() / 3600, 0.0)
+    return interest * 0.5 ** (hours / half_life_hours)
+
+
+def record_interest(project_id: int, half_life_hours: float = 24.0) -> None:
+    """Count a project page view; leaves updated_at and the response caches alone"""
+    try:
+        row = db.session.query(Project.interest, Project.interest_updated_at).filter(Project.id == project_id).first()
+        if row is None:
+            return
+        now = datetime.utcnow()
+        interest = decayed_interest(row.interest, row.interest_updated_at, now, half_life_hours) + 1.0
+        db.session.execute(
+            db.update(Project).where(Project.id == project_id).values(
+                interest=interest, interest_updated_at=now, updated_at=Project.updated_at
+            )
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Error recording interest in project {project_id}: {e}')
+
+
+class PriorityScorer:
+    """Scores projects for one sweep"""
+
+    def __init__(self, check_interval: float = 3600, weights: Optional[Dict] = None,
+                 half_life_hours: float = 24.0, dormant_months: int = 6, now: Optional[datetime] = None):
+        self.check_interval = max(check_interval, 1)
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.half_life_hours = half_life_hours
+        self.now = now or datetime.utcnow()
+        self.dormant_before = self.now - timedelta(days=dormant_months * 30.44)
+
+    @classmethod
+    def from_config(cls, config, now: Optional[datetime] = None) -> 'PriorityScorer':
+        """Build a scorer from application config"""
+        return cls(
+            check_interval=config.get('UPDATE_CHECK_INTERVAL', 3600),
+            weights=config.get('CHECK_PRIORITY_WEIGHTS'),
+            half_life_hours=config.get('CHECK_INTEREST_HALF_LIFE_HOURS', 24),
+            dormant_months=config.get('ANALYTICS_STALE_MONTHS', 6),
+            now=now
+        )
+
+    def score(self, project: Project) -> float:
+        weights = self.weights
+        score = weights['priority'] * (project.priority or 0)
+        if project.notify_on_update:
+            score += weights['notify']
+        interest = decayed_interest(project.interest, project.interest_updated_at, self.now, self.half_life_hours)
+        score += weights['interest'] * math.log1p(interest)
+        if project.last_checked is None:
+            score += weights['never_checked']
+        else:
+            intervals = max((self.now - project.last_checked).total_seconds(), 0.0) / self.check_interval
+            score += weights['aging'] * intervals
+        cadence = project.release_cadence
+        if cadence is not None and cadence.last_release is not None and cadence.last_release < self.dormant_before:
+            score += weights['dormant']
+        return round(score, 3)
+
+
+class CheckQueue:
+    """Max-heap of source groups ordered by their most important member"""
+
+    def __init__(self, groups: Dict[Tuple, List[Project]], scorer: PriorityScorer):
+        self._heap = []
+        order = itertools.count()
+        for key, members in groups.items():
+            score = max(scorer.score(project) for project in members)
+            self._heap.append((-score, next(order), key, members))
+        heapq.heapify(self._heap)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def pop(self) -> Tuple[Tuple, List[Project], float]:
+        """Highest scoring (key, members, score); ties keep the original order"""
+        negative, _, key, members = heapq.heappop(self._heap)
+        return key, members, -negative
+
+    def remaining_projects(self) -> int:
+        return sum(len(members) for _, _, _, members in self._heap)
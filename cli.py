@@ -0,0 +1,132 @@
+# MIT License
+
+"""
+Flask CLI commands
+Schema creation runs as an explicit deploy step (`flask --app app migrate`)
+instead of on every worker boot.
+"""
+
+import logging
+from typing import Dict, List
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import inspect, text
+
+from models import db
+from search import rebuild_search_index
+from upstream_sources import resolve_missing_sources
+
+logger = logging.getLogger(__name__)
+
+
+def _column_ddl(column, dialect) -> str:
+    """ALTER TABLE ... ADD COLUMN clause for a model column"""
+    ddl = f'{column.name} {column.type.compile(dialect=dialect)}'
+    default = column.default.arg if column.default is not None and column.default.is_scalar else None
+    if default is not None:
+        literal = int(default) if isinstance(default, bool) else default
+        ddl += f' DEFAULT {literal!r}' if isinstance(literal, str) else f' DEFAULT {literal}'
+    if not column.nullable and default is not None:
+        ddl += ' NOT NULL'
+    return ddl
+
+
+# Columns the models no longer have; NOT NULL ones would break inserts
+RETIRED_COLUMNS = {
+    'sweep_checkpoints': ('completed_ids',),  # Replaced by sweep_checkpoint_projects
+}
+
+
+def upgrade_schema(rebuild_index: bool = True) -> Dict[str, List[str]]:
+    """
+    Create missing tables, columns and indexes (requires an application context)
+
+    With rebuild_index=False the full-text index is left alone; app startup
+    builds it only when missing (search.ensure_search_index).
+    """
+    engine = db.engine
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+
+    db.create_all()
+
+    added = {'tables': [], 'columns': [], 'indexes': [], 'dropped': []}
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            added['tables'].append(table.name)
+            continue
+
+        present = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in present:
+                db.session.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {_column_ddl(column, engine.dialect)}'))
+                added['columns'].append(f'{table.name}.{column.name}')
+        for name in RETIRED_COLUMNS.get(table.name, ()):
+            if name in present:
+                db.session.execute(text(f'ALTER TABLE {table.name} DROP COLUMN {name}'))
+                added['dropped'].append(f'{table.name}.{name}')
+        db.session.commit()
+
+        indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in indexes:
+                index.create(bind=engine, checkfirst=True)
+                added['indexes'].append(index.name)
+
+    if rebuild_index:
+        rebuild_search_index()
+    return added
+
+
+@click.command('migrate')
+@with_appcontext
+def migrate_command():
+    """Create or upgrade the database schema and rebuild the search index"""
+    added = upgrade_schema()
+    for kind, label in (('tables', 'table'), ('columns', 'column'), ('indexes', 'index')):
+        for name in added[kind]:
+            click.echo(f'Created {label}: {name}')
+    for name in added['dropped']:
+        click.echo(f'Dropped column: {name}')
+    linked = resolve_missing_sources()
+    if linked:
+        click.echo(f'Linked {linked} projects to upstream sources')
+    click.echo('Database schema is up to date')
+
+
+@click.command('mirror-ingest')
+@click.option('--source', help='Mirror directory (default PYPI_MIRROR_SOURCE)')
+@click.option('--index', 'index_path', help='Index file to write (default PYPI_MIRROR_INDEX)')
+@click.option('--full', is_flag=True, help='Re-parse every file instead of only changed ones')
+@with_appcontext
+def mirror_ingest_command(source, index_path, full):
+    """Build or refresh the offline PyPI mirror index"""
+    from flask import current_app
+    from services.pypi_mirror import ingest
+
+    source = source or current_app.config.get('PYPI_MIRROR_SOURCE')
+    index_path = index_path or current_app.config.get('PYPI_MIRROR_INDEX')
+    if not source or not index_path:
+        raise click.UsageError('Set PYPI_MIRROR_SOURCE and PYPI_MIRROR_INDEX or pass --source and --index')
+    result = ingest(source, index_path, full=full)
+    click.echo(f"Indexed {result['packages']} packages ({result['parsed']} files parsed, "
+               f"{result['removed']} removed) in {result['seconds']} s")
+
+
+@click.command('analytics-refresh')
+@click.option('--full', is_flag=True, help='Recompute every project instead of only changed ones')
+@with_appcontext
+def analytics_refresh_command(full):
+    """Refresh the release-cadence rollups"""
+    from analytics import refresh_release_analytics
+
+    refreshed = refresh_release_analytics(full=full)
+    click.echo(f'Refreshed release analytics of {refreshed} projects')
+
+
+def register_commands(app) -> None:
+    """Attach CLI commands to the app"""
+    app.cli.add_command(migrate_command)
+    app.cli.add_command(mirror_ingest_command)
+    app.cli.add_command(analytics_refresh_command)
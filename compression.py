@@ -0,0 +1,69 @@
+# MIT License
+
+"""
+Negotiated response compression (brotli or gzip) for large API payloads
+"""
+
+import gzip
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'text/html',
+    'text/css',
+    'application/javascript',
+    'text/javascript',
+}
+
+
+def _choose_encoding():
+    """Pick the best encoding the client accepts"""
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return None
+
+
+def init_compression(app) -> None:
+    """Register the after_request hook compressing eligible responses"""
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+    gzip_level = app.config.get('COMPRESSION_GZIP_LEVEL', 6)
+    brotli_quality = app.config.get('COMPRESSION_BROTLI_QUALITY', 4)
+
+    @app.after_request
+    def compress_response(response):
+        if not app.config.get('COMPRESSION_ENABLED', True):
+            return response
+        if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+            return response
+        # Streams (exports, server-sent events) are sent as produced
+        if response.is_streamed or response.direct_passthrough:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if response.status_code != 200 or 'Content-Encoding' in response.headers:
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        encoding = _choose_encoding()
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=brotli_quality))
+        elif encoding == 'gzip':
+            response.set_data(gzip.compress(data, compresslevel=gzip_level))
+        else:
+            return response
+
+        response.headers['Content-Encoding'] = encoding
+        return response
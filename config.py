@@ -29,35 +29,176 @@ class Config:
     # PyPI API
     PYPI_API_BASE_URL = 'https://pypi.org/pypi'
     
+    # Offline PyPI mirror: resolve versions from an index file built by
+    # `flask --app app mirror-ingest` from PYPI_MIRROR_SOURCE (JSON API dumps
+    # or a Simple-index mirror) instead of HTTP. The scheduled sweep refreshes
+    # the index incrementally first. Packages missing from the mirror are
+    # fetched from PYPI_API_BASE_URL only with PYPI_MIRROR_FALLBACK=True
+    PYPI_MIRROR_SOURCE = os.getenv('PYPI_MIRROR_SOURCE')
+    PYPI_MIRROR_INDEX = os.getenv('PYPI_MIRROR_INDEX')
+    PYPI_MIRROR_FALLBACK = os.getenv('PYPI_MIRROR_FALLBACK', 'False') == 'True'
+    
     # Scheduler
     SCHEDULER_API_ENABLED = True
     SCHEDULER_TIMEZONE = 'UTC'
     
+    # Start the scheduler from create_app(). gunicorn.conf.py turns this off and
+    # starts it after fork instead; SCHEDULER_LOCK_FILE (default
+    # instance/scheduler.lock) ensures only one process runs the jobs
+    SCHEDULER_AUTOSTART = os.getenv('SCHEDULER_AUTOSTART', 'True') == 'True'
+    SCHEDULER_LOCK_FILE = os.getenv('SCHEDULER_LOCK_FILE')
+    
+    # Scheduler jobs are persisted in the apscheduler_jobs table of the main
+    # database (or SCHEDULER_JOBSTORE_URL; 'memory' disables persistence), so a
+    # restart keeps the schedule. Scheduled sweeps check the least recently
+    # checked projects first and save a checkpoint every CHECKPOINT_INTERVAL
+    # projects; an interrupted sweep is continued after a restart unless its
+    # checkpoint is older than CHECKPOINT_MAX_AGE_HOURS
+    SCHEDULER_JOBSTORE_URL = os.getenv('SCHEDULER_JOBSTORE_URL')
+    SWEEP_CHECKPOINT_INTERVAL = 50
+    SWEEP_CHECKPOINT_MAX_AGE_HOURS = 24
+    
+    # Scheduled sweeps check the most important projects first: explicit
+    # priority, notify_on_update, project page views (halved every
+    # INTEREST_HALF_LIFE_HOURS) and time since the last check, which keeps
+    # low priority projects from starving. CHECK_PRIORITY_WEIGHTS overrides
+    # entries of check_priority.DEFAULT_WEIGHTS. With SWEEP_UPSTREAM_BUDGET set,
+    # a sweep makes at most that many upstream fetches (0 = unlimited)
+    CHECK_PRIORITY_WEIGHTS = None
+    CHECK_INTEREST_HALF_LIFE_HOURS = 24
+    SWEEP_UPSTREAM_BUDGET = int(os.getenv('SWEEP_UPSTREAM_BUDGET', '0'))
+    
+    # GitHub release webhooks at /api/webhooks/github, signed with
+    # GITHUB_WEBHOOK_SECRET (the endpoint is disabled without it). Repositories
+    # that delivered an event in the last ACTIVE_DAYS are polled only every
+    # WEBHOOK_FALLBACK_INTERVAL seconds
+    GITHUB_WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET')
+    GITHUB_WEBHOOK_ACTIVE_DAYS = 7
+    WEBHOOK_FALLBACK_INTERVAL = int(os.getenv('WEBHOOK_FALLBACK_INTERVAL', str(24 * 3600)))
+    
+    # Create missing tables and columns on startup. Production runs `flask --app app migrate`
+    # as an explicit deploy step instead
+    AUTO_CREATE_SCHEMA = os.getenv('AUTO_CREATE_SCHEMA', 'True') == 'True'
+    
     # Update check interval (in seconds, minimum 30)
     UPDATE_CHECK_INTERVAL = int(os.getenv('UPDATE_CHECK_INTERVAL', '3600'))
     
+    # Server-sent notification stream (seconds); streams are recycled after
+    # the max duration and clients reconnect with Last-Event-ID
+    SSE_HEARTBEAT_INTERVAL = int(os.getenv('SSE_HEARTBEAT_INTERVAL', '15'))
+    SSE_MAX_STREAM_DURATION = int(os.getenv('SSE_MAX_STREAM_DURATION', '300'))
+    # Open streams per worker; keep it below the gunicorn thread count so
+    # API requests still get threads. Further clients get 503 + Retry-After
+    SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', '4'))
+    
+    # Bulk check-updates: upstream worker threads, total deadline (seconds)
+    # and maximum number of projects per request
+    BULK_CHECK_MAX_WORKERS = int(os.getenv('BULK_CHECK_MAX_WORKERS', '8'))
+    BULK_CHECK_DEADLINE = int(os.getenv('BULK_CHECK_DEADLINE', '30'))
+    BULK_CHECK_MAX_PROJECTS = int(os.getenv('BULK_CHECK_MAX_PROJECTS', '1000'))
+    
+    # Maximum size of dependency files uploaded to /api/outdated
+    OUTDATED_MAX_FILE_SIZE = 5 * 1024 * 1024
+    
+    # Webhook notifications: comma-separated target URLs. Deliveries are queued
+    # in the notification outbox and sent as digests every DELIVERY_INTERVAL
+    # seconds once the oldest pending entry is DIGEST_WINDOW seconds old
+    NOTIFICATION_WEBHOOKS = [url.strip() for url in os.getenv('NOTIFICATION_WEBHOOKS', '').split(',') if url.strip()]
+    NOTIFICATION_DELIVERY_INTERVAL = int(os.getenv('NOTIFICATION_DELIVERY_INTERVAL', '30'))
+    NOTIFICATION_DIGEST_WINDOW = int(os.getenv('NOTIFICATION_DIGEST_WINDOW', '60'))
+    NOTIFICATION_BATCH_SIZE = 100
+    NOTIFICATION_MAX_ATTEMPTS = 5
+    NOTIFICATION_RETRY_BASE_DELAY = 30
+    NOTIFICATION_TARGET_CONCURRENCY = 2
+    NOTIFICATION_TIMEOUT = 10
+    NOTIFICATION_OUTBOX_RETENTION_DAYS = 7
+    # Seconds a dispatcher run owns the rows it claimed; a crashed run's rows
+    # are picked up again after the lease
+    NOTIFICATION_CLAIM_LEASE = int(os.getenv('NOTIFICATION_CLAIM_LEASE', '300'))
+    
+    # Per-project check trace: one check_runs row per check (source, upstream
+    # latency, HTTP status, bytes, DB time, error), written in batches of
+    # BATCH_SIZE and purged after RETENTION_DAYS by the scheduled sweep
+    CHECK_RUNS_ENABLED = os.getenv('CHECK_RUNS_ENABLED', 'True') == 'True'
+    CHECK_RUNS_BATCH_SIZE = 200
+    CHECK_RUNS_RETENTION_DAYS = int(os.getenv('CHECK_RUNS_RETENTION_DAYS', '14'))
+    
+    # Release-cadence rollups, refreshed for changed projects after every
+    # sweep (`flask --app app analytics-refresh --full` rebuilds them); projects
+    # without a release for STALE_MONTHS are reported as stale
+    ANALYTICS_STALE_MONTHS = int(os.getenv('ANALYTICS_STALE_MONTHS', '6'))
+    
+    # Prometheus metrics at /metrics. With several worker processes set
+    # METRICS_MULTIPROC_DIR to a directory shared by all workers (cleared on
+    # deploy); each worker writes its samples there every FLUSH_INTERVAL seconds
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+    METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR')
+    METRICS_FLUSH_INTERVAL = 5
+    
+    # Opt-in request profiling: Server-Timing headers with SQL counts/time,
+    # a warning log for requests slower than PROFILING_SLOW_REQUEST_MS listing
+    # their worst queries, and cProfile captures saved to PROFILING_DIR
+    # (default instance/profiles) for sampled requests or requests sending
+    # PROFILING_HEADER (whose value must equal PROFILING_TOKEN when set)
+    PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False') == 'True'
+    PROFILING_SLOW_REQUEST_MS = int(os.getenv('PROFILING_SLOW_REQUEST_MS', '500'))
+    PROFILING_SLOW_QUERY_COUNT = 5
+    PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+    PROFILING_HEADER = 'X-Profile'
+    PROFILING_TOKEN = os.getenv('PROFILING_TOKEN')
+    PROFILING_DIR = os.getenv('PROFILING_DIR')
+    
     # Pagination
     ITEMS_PER_PAGE = 20
     
+    # Number of recent updates included in /api/dashboard
+    DASHBOARD_RECENT_UPDATES = 10
+    
+    # NDJSON bulk import/export batch sizes
+    IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '500'))
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '500'))
+    
     # API
     JSON_SORT_KEYS = False
-    JSONIFY_PRETTYPRINT_REGULAR = True
+    JSONIFY_PRETTYPRINT_REGULAR = False
+    
+    # Negotiated gzip/brotli compression of responses larger than COMPRESSION_MIN_SIZE bytes
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True') == 'True'
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_GZIP_LEVEL = 6
+    COMPRESSION_BROTLI_QUALITY = 4
+    
+    # HTTP caching: read endpoints send weak ETags, clients and proxies revalidate
+    API_CACHE_CONTROL = os.getenv('API_CACHE_CONTROL', 'public, no-cache')
+    
+    # Response cache for hot GET endpoints ('memory', 'file' or 'null')
+    # Use 'file' when running several workers so invalidation is shared;
+    # 'memory' is refused when WORKER_PROCESSES (set by gunicorn.conf.py) > 1
+    WORKER_PROCESSES = int(os.getenv('WORKER_PROCESSES', '1'))
+    RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+    RESPONSE_CACHE_MAX_BYTES = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))
+    RESPONSE_CACHE_DIR = os.getenv('RESPONSE_CACHE_DIR')
 
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     TESTING = False
+    JSONIFY_PRETTYPRINT_REGULAR = True
 
 class TestingConfig(Config):
     """Testing configuration"""
     DEBUG = True
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    SCHEDULER_AUTOSTART = False
 
 class ProductionConfig(Config):
     """Production configuration"""
     DEBUG = False
     TESTING = False
+    AUTO_CREATE_SCHEMA = os.getenv('AUTO_CREATE_SCHEMA', 'False') == 'True'
     
     # Ensure these are set in production
     @classmethod
@@ -0,0 +1,112 @@
+# MIT License
+
+"""
+Precomputed dashboard payload
+Statistics, recent updates, unread count and scheduler status in one document,
+rebuilt after sweeps and after writes and served from memory.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Tuple
+
+from sqlalchemy import func
+
+from cache import response_cache
+from models import db, Project, Version, Update
+
+logger = logging.getLogger(__name__)
+
+# Cache tags whose invalidation makes the dashboard stale
+DASHBOARD_TAGS = ('projects', 'updates')
+
+
+class DashboardService:
+    """Builds the dashboard payload once and serves it until data changes"""
+
+    def __init__(self, recent_limit: int = 10):
+        self.recent_limit = recent_limit
+        self._payload = None
+        self._etag = None
+        self._tag_versions = None
+        self._dirty = True
+        self._lock = threading.Lock()
+        response_cache.add_listener(self._on_invalidate)
+
+    def init_app(self, app) -> None:
+        """Read settings and drop any payload built for a previous app"""
+        self.recent_limit = app.config.get('DASHBOARD_RECENT_UPDATES', 10)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Mark the payload stale; it is rebuilt on the next read or refresh"""
+        self._dirty = True
+
+    def _on_invalidate(self, tags) -> None:
+        if any(tag in DASHBOARD_TAGS for tag in tags):
+            self.invalidate()
+
+    def _is_stale(self) -> bool:
+        # Tag versions come from the shared cache backend, so writes made
+        # by other workers are noticed as well
+        if self._dirty or self._payload is None:
+            return True
+        return response_cache.backend.tag_versions(DASHBOARD_TAGS) != self._tag_versions
+
+    def refresh(self) -> Dict:
+        """Rebuild the payload (requires an application context)"""
+        from background_tasks import get_scheduler_status
+
+        with self._lock:
+            self._dirty = False
+            tag_versions = response_cache.backend.tag_versions(DASHBOARD_TAGS)
+
+            project_stats = db.session.query(
+                func.count(Project.id),
+                func.count(Project.id).filter(Project.active == True)
+            ).one()
+            update_stats = db.session.query(
+                func.count(Update.id),
+                func.count(Update.id).filter(Update.notified == False)
+            ).one()
+            recent = db.session.query(Update, Project.name).join(
+                Project, Project.id == Update.project_id
+            ).order_by(Update.detected_at.desc(), Update.id.desc()).limit(self.recent_limit).all()
+
+            recent_updates = []
+            for update, project_name in recent:
+                item = update.to_dict()
+                item['project'] = project_name
+                recent_updates.append(item)
+
+            payload = {
+                'statistics': {
+                    'total_projects': project_stats[0],
+                    'active_projects': project_stats[1],
+                    'total_versions': db.session.query(func.count(Version.id)).scalar(),
+                    'total_updates': update_stats[0]
+                },
+                'recent_updates': recent_updates,
+                'unread_count': update_stats[1],
+                'scheduler': get_scheduler_status(),
+                'generated_at': datetime.utcnow().isoformat()
+            }
+
+            body = json.dumps({k: v for k, v in payload.items() if k != 'generated_at'}, sort_keys=True)
+            self._etag = hashlib.sha1(body.encode('utf-8')).hexdigest()[:24]
+            self._payload = payload
+            self._tag_versions = tag_versions
+            return payload
+
+    def get(self) -> Tuple[Dict, str]:
+        """Return the current payload and its ETag, rebuilding it if stale"""
+        if self._is_stale():
+            self.refresh()
+        return self._payload, self._etag
+
+
+# Global dashboard instance
+dashboard = DashboardService()
@@ -0,0 +1,254 @@
+# MIT License
+
+"""
+Dependency graph of tracked projects
+Edges come from the requires_dist metadata of each project's latest PyPI
+release and are stored in dependency_edges. An in-memory reverse adjacency
+index answers "which tracked projects are affected by a release of X"
+without touching the database; it is patched in place when one project's
+requirements change and rebuilt when other workers change edges.
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from packaging.requirements import InvalidRequirement, Requirement
+from packaging.utils import canonicalize_name
+
+from cache import response_cache
+from models import db, Project, DependencyEdge
+
+logger = logging.getLogger(__name__)
+
+# Edges change through this tag; node names change with 'projects'
+EDGE_TAGS = ('dependencies',)
+NAME_TAGS = ('projects',)
+
+
+def parse_requires_dist(requires_dist: Optional[Iterable[str]]) -> Dict[str, Dict]:
+    """Normalized dependency name -> {specifier, marker, optional}"""
+    edges = {}
+    for line in requires_dist or []:
+        try:
+            requirement = Requirement(line)
+        except InvalidRequirement:
+            logger.debug(f'Skipping invalid requirement: {line}')
+            continue
+        marker = str(requirement.marker) if requirement.marker else None
+        optional = bool(marker and 'extra' in marker)
+        name = canonicalize_name(requirement.name)
+        if name in edges and (optional or not edges[name]['optional']):
+            continue  # Keep the first entry; a required entry beats an optional one
+        edges[name] = {
+            'specifier': str(requirement.specifier) or None,
+            'marker': marker[:500] if marker else None,
+            'optional': optional
+        }
+    return edges
+
+
+def sync_project_dependencies(project_id: int, requires_dist) -> Optional[Dict[str, bool]]:
+    """
+    Replace a project's edges with requires_dist in the current transaction
+
+    Returns the new name -> optional map when anything changed, else None.
+    """
+    wanted = parse_requires_dist(requires_dist)
+    existing = {edge.dependency_name: edge for edge in DependencyEdge.query.filter_by(project_id=project_id)}
+
+    changed = False
+    for name, edge in existing.items():
+        if name not in wanted:
+            db.session.delete(edge)
+            changed = True
+    for name, fields in wanted.items():
+        edge = existing.get(name)
+        if edge is None:
+            db.session.add(DependencyEdge(project_id=project_id, dependency_name=name, **fields))
+            changed = True
+        elif (edge.specifier, edge.marker, edge.optional) != (fields['specifier'], fields['marker'], fields['optional']):
+            edge.specifier, edge.marker, edge.optional = fields['specifier'], fields['marker'], fields['optional']
+            changed = True
+
+    if not changed:
+        return None
+    return {name: fields['optional'] for name, fields in wanted.items()}
+
+
+class DependencyGraph:
+    """Reverse adjacency of tracked projects with memoized transitive impact"""
+
+    def __init__(self):
+        self._requires = None       # project id -> {dependency name: optional}
+        self._names = None          # normalized package name -> project id
+        self._project_names = {}    # project id -> display name
+        self._dependents = {}       # project id -> {dependent project id: optional}
+        self._impact = {}           # (project id, include optional) -> impact list
+        self._edge_versions = None
+        self._name_versions = None
+        self._dirty = True
+        self._lock = threading.RLock()
+        response_cache.add_listener(self._on_invalidate)
+
+    def invalidate(self) -> None:
+        """Drop the graph; edges and names are reloaded on next use"""
+        with self._lock:
+            self._dirty = True
+            self._names = None
+
+    def _on_invalidate(self, tags) -> None:
+        if any(tag in EDGE_TAGS for tag in tags):
+            self._dirty = True
+
+    def _load_names(self) -> None:
+        """Map package names to tracked projects; explicit PyPI packages win over names"""
+        self._name_versions = response_cache.backend.tag_versions(NAME_TAGS)
+        rows = db.session.query(Project.id, Project.name, Project.pypi_package).all()
+        names = {}
+        for project_id, name, pypi_package in rows:
+            if not pypi_package:
+                names.setdefault(canonicalize_name(name), project_id)
+        for project_id, name, pypi_package in rows:
+            if pypi_package:
+                names[canonicalize_name(pypi_package)] = project_id
+
+        project_names = {project_id: name for project_id, name, _ in rows}
+        if names != self._names:
+            self._names = names
+            self._project_names = project_names
+            self._rebuild_dependents()
+        elif project_names != self._project_names:
+            self._project_names = project_names
+            self._impact = {}
+
+    def _load_edges(self) -> None:
+        self._dirty = False
+        self._edge_versions = response_cache.backend.tag_versions(EDGE_TAGS)
+        requires = {}
+        for project_id, name, optional in db.session.query(
+            DependencyEdge.project_id, DependencyEdge.dependency_name, DependencyEdge.optional
+        ):
+            requires.setdefault(project_id, {})[name] = optional
+        self._requires = requires
+        self._rebuild_dependents()
+
+    def _rebuild_dependents(self) -> None:
+        self._impact = {}
+        self._dependents = {}
+        if self._requires is None or self._names is None:
+            return
+        for project_id, requirements in self._requires.items():
+            self._link(project_id, requirements)
+
+    def _link(self, project_id: int, requirements: Dict[str, bool]) -> None:
+        if project_id not in self._project_names:
+            return  # Deleted project whose edges are not reloaded yet
+        for name, optional in requirements.items():
+            dependency_id = self._names.get(name)
+            if dependency_id is not None and dependency_id != project_id:
+                self._dependents.setdefault(dependency_id, {})[project_id] = optional
+
+    def _unlink(self, project_id: int, requirements: Dict[str, bool]) -> None:
+        for name in requirements:
+            dependency_id = self._names.get(name)
+            dependents = self._dependents.get(dependency_id)
+            if dependents is not None:
+                dependents.pop(project_id, None)
+
+    def _ensure_current(self) -> None:
+        """Reload whatever part of the graph other writers changed (requires an application context)"""
+        if (self._dirty or self._requires is None
+                or response_cache.backend.tag_versions(EDGE_TAGS) != self._edge_versions):
+            self._load_edges()
+        if self._names is None or response_cache.backend.tag_versions(NAME_TAGS) != self._name_versions:
+            self._load_names()
+
+    def _forward_closure(self, names: Iterable[str]) -> set:
+        """Project ids reachable from the given dependency names"""
+        seen = set()
+        pending = deque(self._names[name] for name in names if name in self._names)
+        while pending:
+            project_id = pending.popleft()
+            if project_id in seen:
+                continue
+            seen.add(project_id)
+            for name in self._requires.get(project_id, {}):
+                dependency_id = self._names.get(name)
+                if dependency_id is not None and dependency_id not in seen:
+                    pending.append(dependency_id)
+        return seen
+
+    def update_project(self, project_id: int, requirements: Dict[str, bool]) -> None:
+        """Apply one project's new requirements after they were committed"""
+        with self._lock:
+            current = (not self._dirty and self._requires is not None
+                       and response_cache.backend.tag_versions(EDGE_TAGS) == self._edge_versions)
+        response_cache.invalidate('dependencies')
+        with self._lock:
+            if not current or self._names is None:
+                return  # Rebuilt from the database on next use
+            previous = self._requires.get(project_id, {})
+            # Only impacts of projects this one (transitively) depends on change
+            for affected in self._forward_closure(set(previous) | set(requirements)):
+                self._impact.pop((affected, False), None)
+                self._impact.pop((affected, True), None)
+            self._unlink(project_id, previous)
+            if requirements:
+                self._requires[project_id] = dict(requirements)
+                self._link(project_id, requirements)
+            else:
+                self._requires.pop(project_id, None)
+            self._dirty = False
+            self._edge_versions = response_cache.backend.tag_versions(EDGE_TAGS)
+
+    def _traverse(self, project_id: int, include_optional: bool) -> List[Tuple[int, int, int]]:
+        """(dependent id, depth, via id) for every project reaching project_id"""
+        result = []
+        seen = {project_id}
+        pending = deque([(project_id, 0)])
+        while pending:
+            current, depth = pending.popleft()
+            for dependent, optional in self._dependents.get(current, {}).items():
+                if dependent in seen or (optional and not include_optional):
+                    continue
+                seen.add(dependent)
+                result.append((dependent, depth + 1, current))
+                pending.append((dependent, depth + 1))
+        return result
+
+    def impact(self, project_id: int, include_optional: bool = False) -> List[Dict]:
+        """Tracked projects transitively depending on project_id, nearest first"""
+        with self._lock:
+            self._ensure_current()
+            key = (project_id, include_optional)
+            cached = self._impact.get(key)
+            if cached is None:
+                names = self._project_names
+                cached = [
+                    {'project_id': dependent, 'name': names.get(dependent), 'depth': depth,
+                     'via': {'project_id': via, 'name': names.get(via)}}
+                    for dependent, depth, via in self._traverse(project_id, include_optional)
+                ]
+                self._impact[key] = cached
+            return cached
+
+    def dependents(self, project_id: int) -> List[Dict]:
+        """Tracked projects depending directly on project_id"""
+        with self._lock:
+            self._ensure_current()
+            return [
+                {'project_id': dependent, 'name': self._project_names.get(dependent), 'optional': optional}
+                for dependent, optional in sorted(self._dependents.get(project_id, {}).items())
+            ]
+
+    def resolve(self, name: str) -> Optional[int]:
+        """Tracked project id for a normalized package name"""
+        with self._lock:
+            self._ensure_current()
+            return self._names.get(name)
+
+
+# Global dependency graph instance
+dependency_graph = DependencyGraph()
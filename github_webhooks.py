@@ -0,0 +1,102 @@
+# MIT License
+
+"""
+GitHub release webhooks
+Repositories that send `release` events to /api/webhooks/github get new
+versions applied within seconds through the same path as polled checks.
+A repository counts as push-enabled while it delivered any event in the last
+GITHUB_WEBHOOK_ACTIVE_DAYS; its projects are then polled only every
+WEBHOOK_FALLBACK_INTERVAL seconds as a safety net.
+"""
+
+import hashlib
+import hmac
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from models import db, Project, UpstreamSource
+from services import check_trace
+from upstream_sources import canonical_github_key
+
+logger = logging.getLogger(__name__)
+
+# Release actions that make a release public
+RELEASE_ACTIONS = ('published', 'released')
+
+
+def verify_signature(secret: str, body: bytes, header: Optional[str]) -> bool:
+    """Check an X-Hub-Signature-256 header against the request body"""
+    if not secret or not header or not header.startswith('sha256='):
+        return False
+    expected = hmac.new(secret.encode('utf-8'), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, header[len('sha256='):])
+
+
+def repository_key(payload: Dict) -> Optional[str]:
+    """Canonical 'owner/repo' key of the repository an event is about"""
+    repository = payload.get('repository') or {}
+    full_name = repository.get('full_name')
+    if full_name and '/' in full_name:
+        return full_name.lower()
+    return canonical_github_key(repository.get('html_url'))
+
+
+def release_from_event(payload: Dict) -> Optional[Dict]:
+    """The release of a `release` event if it is a published, final release"""
+    release = payload.get('release')
+    if payload.get('action') not in RELEASE_ACTIONS or not isinstance(release, dict):
+        return None
+    if release.get('draft') or release.get('prerelease') or not release.get('tag_name'):
+        return None
+    return release
+
+
+def mark_delivery(key: str) -> Optional[UpstreamSource]:
+    """Record that a repository delivers webhooks; returns its source if tracked"""
+    source = UpstreamSource.query.filter_by(provider='github', key=key).first()
+    if source is not None:
+        source.webhook_at = datetime.utcnow()
+        db.session.commit()
+    return source
+
+
+def webhook_trace() -> check_trace.CheckTrace:
+    """Check trace of a release applied from a webhook; no upstream calls"""
+    trace = check_trace.CheckTrace()
+    trace.source = 'webhook'
+    return trace
+
+
+def apply_release_event(source: UpstreamSource, release: Dict, recorder=None) -> List[Dict]:
+    """Apply a release to every active project tracking the repository"""
+    from background_tasks import check_project_updates, get_upstream_services, version_checker
+
+    github, _ = get_upstream_services()
+    update_info = github.extract_version_info(release)
+    results = []
+    projects = Project.query.filter_by(github_source_id=source.id, active=True).order_by(Project.id).all()
+    for project in projects:
+        result = {'project_id': project.id, 'name': project.name}
+        previous_version = project.current_version
+        # A backport published after a newer release must not roll the project back
+        if previous_version and version_checker.is_newer(previous_version, update_info['version_number']):
+            results.append(dict(result, status='older_release'))
+            continue
+        try:
+            version = check_project_updates(project, recorder=recorder, fetched=(update_info, webhook_trace()))
+        except Exception as e:
+            logger.error(f'Error applying webhook release to {project.name}: {e}')
+            results.append(dict(result, status='error', error=str(e)))
+            continue
+        updated = version is not None and version.version_number != previous_version
+        results.append(dict(result, status='updated' if updated else 'up_to_date', latest_version=project.latest_version))
+    return results
+
+
+def covered_by_webhook(project: Project, now: datetime, active_days: int, fallback_interval: float) -> bool:
+    """True when a push-enabled project was checked within the fallback polling interval"""
+    source = project.github_source
+    if source is None or source.webhook_at is None or source.webhook_at < now - timedelta(days=active_days):
+        return False
+    return project.last_checked is not None and project.last_checked >= now - timedelta(seconds=fallback_interval)
@@ -0,0 +1,67 @@
+# MIT License
+
+"""
+Gunicorn settings for Version Tracker
+
+The app is imported once in the master (preload_app) and shared with workers
+copy-on-write. Anything that owns threads or sockets - the scheduler, database
+connections - is created in each worker after fork.
+
+    gunicorn -c gunicorn.conf.py "app:create_app()"
+"""
+
+import gc
+import os
+import shutil
+import tempfile
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+# Notification streams hold a thread each (at most SSE_MAX_STREAMS per
+# worker), see API_DOCS.md
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+timeout = 60
+preload_app = True
+
+# create_app() in the master must not start scheduler threads; post_worker_init
+# starts it instead and the scheduler lock picks a single worker to run jobs
+os.environ.setdefault('SCHEDULER_AUTOSTART', 'False')
+
+# Workers write metric samples here and /metrics merges them
+os.environ.setdefault('METRICS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'version-tracker-metrics'))
+
+# Cache invalidations (and the dashboard, outdated and dependency graph
+# staleness checks built on them) must be seen by every worker
+os.environ['WORKER_PROCESSES'] = str(workers)
+if workers > 1:
+    os.environ.setdefault('RESPONSE_CACHE_BACKEND', 'file')
+    os.environ.setdefault('RESPONSE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'version-tracker-cache'))
+
+
+def on_starting(server):
+    # Samples from a previous run would be merged into the new totals
+    shutil.rmtree(os.environ['METRICS_MULTIPROC_DIR'], ignore_errors=True)
+    os.makedirs(os.environ['METRICS_MULTIPROC_DIR'], exist_ok=True)
+    # Bodies cached by the previous deploy may not match the new code
+    if os.getenv('RESPONSE_CACHE_BACKEND') == 'file' and os.getenv('RESPONSE_CACHE_DIR'):
+        shutil.rmtree(os.environ['RESPONSE_CACHE_DIR'], ignore_errors=True)
+
+
+def pre_fork(server, worker):
+    # Move preloaded objects out of the collected generations so the cyclic
+    # GC does not touch (and copy) their pages in every worker
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    from models import db
+    from background_tasks import start_scheduler
+
+    app = worker.wsgi
+    with app.app_context():
+        # Never reuse connections inherited from the master
+        db.engine.dispose(close=False)
+
+    if os.getenv('SCHEDULER_ENABLED', 'True') == 'True':
+        start_scheduler(app)
@@ -0,0 +1,490 @@
+# MIT License
+
+"""
+In-process metrics with Prometheus text exposition at /metrics
+
+Counters, gauges and histograms live in plain dicts guarded by a lock per
+metric. Under gunicorn each worker periodically writes its samples to
+METRICS_MULTIPROC_DIR and the worker answering a scrape merges all files.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names, values) -> str:
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+class _Metric:
+    """Base class: one value per label combination"""
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (), shared: bool = False):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        # Shared metrics describe state outside the process (e.g. the database);
+        # they are computed at scrape time and never merged across workers
+        self.shared = shared
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def values(self) -> Dict[Tuple[str, ...], object]:
+        with self._lock:
+            return {key: self._copy(value) for key, value in self._values.items()}
+
+    @staticmethod
+    def _copy(value):
+        return value
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+    kind = 'counter'
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels) -> None:
+        """Mirror a counter maintained elsewhere (used by collectors)"""
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    kind = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """Bucketed distribution; stores per-bucket counts and the sum"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS, shared: bool = False):
+        super().__init__(name, documentation, labelnames, shared)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            entry[0][index] += 1
+            entry[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of a with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    @staticmethod
+    def _copy(value):
+        return [list(value[0]), value[1]]
+
+
+class MetricsRegistry:
+    """Holds metrics and renders them in the Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self.multiproc_dir = None
+        self.flush_interval = 5.0
+        self._last_flush = 0.0
+        if hasattr(os, 'register_at_fork'):
+            # Workers forked from a preloaded master must not report the
+            # master's samples a second time
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self) -> None:
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+        for metric in self._metrics.values():
+            metric._lock = threading.Lock()
+            metric._values = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames=(), shared: bool = False) -> Counter:
+        return self._register(Counter(name, documentation, labelnames, shared))
+
+    def gauge(self, name: str, documentation: str, labelnames=(), shared: bool = False) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, shared))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS,
+                  shared: bool = False) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets, shared))
+
+    def register_collector(self, func: Callable[[], None], shared: bool = False) -> None:
+        """
+        Add a callback that refreshes metric values before they are read
+
+        Per-process collectors run before every snapshot; shared collectors
+        run only in the process answering the scrape.
+        """
+        self._collectors.append((func, shared))
+
+    def _run_collectors(self, shared: bool) -> None:
+        for func, is_shared in self._collectors:
+            if is_shared != shared:
+                continue
+            try:
+                func()
+            except Exception as e:
+                logger.warning(f'Metrics collector {func.__name__} failed: {e}')
+
+    def configure(self, multiproc_dir: Optional[str] = None, flush_interval: float = 5.0) -> None:
+        """Enable file-based aggregation across processes"""
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        if multiproc_dir:
+            os.makedirs(multiproc_dir, exist_ok=True)
+
+    def snapshot(self) -> Dict:
+        """Serializable samples of this process's metrics"""
+        self._run_collectors(shared=False)
+        return {
+            name: [[list(key), value] for key, value in metric.values().items()]
+            for name, metric in self._metrics.items()
+            if not metric.shared
+        }
+
+    def flush(self, force: bool = False) -> None:
+        """Write this process's samples to the multi-process directory (throttled)"""
+        if not self.multiproc_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+
+        path = os.path.join(self.multiproc_dir, f'metrics_{os.getpid()}.json')
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f'Error writing metrics snapshot: {e}')
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+        return True
+
+    def _read_snapshots(self) -> List[Tuple[int, Dict]]:
+        self.flush(force=True)
+        snapshots = []
+        for filename in os.listdir(self.multiproc_dir):
+            if not (filename.startswith('metrics_') and filename.endswith('.json')):
+                continue
+            try:
+                pid = int(filename[len('metrics_'):-len('.json')])
+                with open(os.path.join(self.multiproc_dir, filename)) as f:
+                    snapshots.append((pid, json.load(f)))
+            except (OSError, ValueError) as e:
+                logger.debug(f'Skipping metrics file {filename}: {e}')
+        return snapshots
+
+    def collect(self) -> Dict[str, Dict[Tuple[str, ...], object]]:
+        """Current values of every metric, merged across processes when configured"""
+        if not self.multiproc_dir:
+            self._run_collectors(shared=False)
+            merged = {name: metric.values() for name, metric in self._metrics.items() if not metric.shared}
+        else:
+            merged = {name: {} for name, metric in self._metrics.items() if not metric.shared}
+            for pid, snapshot in self._read_snapshots():
+                alive = self._pid_alive(pid)
+                for name, samples in snapshot.items():
+                    metric = self._metrics.get(name)
+                    if metric is None or metric.shared:
+                        continue
+                    # Counters and histograms of exited workers stay in the
+                    # totals; their gauges no longer describe anything
+                    if metric.kind == 'gauge' and not alive:
+                        continue
+                    values = merged[name]
+                    for key, value in samples:
+                        key = tuple(key)
+                        if metric.kind == 'histogram':
+                            current = values.setdefault(key, [[0] * len(value[0]), 0.0])
+                            current[0] = [a + b for a, b in zip(current[0], value[0])]
+                            current[1] += value[1]
+                        else:
+                            values[key] = values.get(key, 0.0) + value
+
+        self._run_collectors(shared=True)
+        merged.update({name: metric.values() for name, metric in self._metrics.items() if metric.shared})
+        return merged
+
+    def render(self) -> str:
+        """Prometheus text exposition of all metrics"""
+        merged = self.collect()
+        lines = []
+        for name, metric in self._metrics.items():
+            lines.append(f'# HELP {name} {_escape(metric.documentation)}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            for key, value in sorted(merged.get(name, {}).items()):
+                if metric.kind != 'histogram':
+                    lines.append(f'{name}{_format_labels(metric.labelnames, key)} {_format_value(value)}')
+                    continue
+
+                counts, total = value
+                names = metric.labelnames + ('le',)
+                cumulative = 0
+                for bound, count in zip(metric.buckets + (float('inf'),), counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(names, key + (_format_value(bound),))} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(metric.labelnames, key)} {_format_value(total)}')
+                lines.append(f'{name}_count{_format_labels(metric.labelnames, key)} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
+
+UPSTREAM_REQUEST_DURATION = metrics.histogram(
+    'version_tracker_upstream_request_duration_seconds', 'Latency of GitHub, PyPI and webhook requests',
+    ('host', 'endpoint')
+)
+UPSTREAM_REQUESTS = metrics.counter(
+    'version_tracker_upstream_requests_total', 'Upstream requests by HTTP status (or "error")',
+    ('host', 'endpoint', 'status')
+)
+SWEEP_DURATION = metrics.histogram(
+    'version_tracker_sweep_duration_seconds', 'Duration of update sweeps', ('trigger',),
+    buckets=(1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0, 3600.0)
+)
+SWEEP_PROJECTS = metrics.histogram(
+    'version_tracker_sweep_projects', 'Projects checked per sweep', ('trigger',),
+    buckets=(1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+)
+SWEEP_RESULTS = metrics.counter(
+    'version_tracker_sweep_project_checks_total', 'Project checks by outcome', ('trigger', 'status')
+)
+SWEEP_QUEUE_DEPTH = metrics.gauge(
+    'version_tracker_sweep_queue_depth', 'Projects waiting for an upstream check', ('trigger',)
+)
+SCHEDULER_LAG = metrics.histogram(
+    'version_tracker_scheduler_lag_seconds', 'Delay between a job\'s scheduled and actual start', ('job',),
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0)
+)
+SCHEDULER_JOBS = metrics.counter(
+    'version_tracker_scheduler_job_runs_total', 'Scheduler job runs by outcome', ('job', 'outcome')
+)
+HTTP_REQUESTS = metrics.counter(
+    'version_tracker_http_requests_total', 'HTTP requests by route, method and status', ('route', 'method', 'status')
+)
+HTTP_REQUEST_DURATION = metrics.histogram(
+    'version_tracker_http_request_duration_seconds', 'Time to build HTTP responses', ('route',)
+)
+DB_QUERIES = metrics.counter(
+    'version_tracker_db_queries_total', 'SQL statements executed, by route ("background" outside requests)', ('route',)
+)
+DB_QUERY_TIME = metrics.counter(
+    'version_tracker_db_query_seconds_total', 'Time spent executing SQL, by route', ('route',)
+)
+DB_QUERIES_PER_REQUEST = metrics.histogram(
+    'version_tracker_db_queries_per_request', 'SQL statements per HTTP request', ('route',),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200)
+)
+CACHE_LOOKUPS = metrics.counter(
+    'version_tracker_cache_lookups_total', 'Cache lookups by cache and result', ('cache', 'result')
+)
+STREAM_SUBSCRIBERS = metrics.gauge(
+    'version_tracker_notification_stream_subscribers', 'Open notification event streams'
+)
+OUTBOX_ENTRIES = metrics.gauge(
+    'version_tracker_notification_outbox_entries', 'Webhook outbox entries by status', ('status',), shared=True
+)
+OUTBOX_OLDEST_PENDING = metrics.gauge(
+    'version_tracker_notification_outbox_oldest_pending_seconds', 'Age of the oldest pending webhook delivery',
+    shared=True
+)
+
+_host_cache = {}
+
+
+def record_upstream_request(base_url: str, endpoint: str, status: str, duration: float) -> None:
+    """Record one upstream HTTP call"""
+    host = _host_cache.get(base_url)
+    if host is None:
+        host = _host_cache[base_url] = urlparse(base_url).netloc or base_url
+    UPSTREAM_REQUEST_DURATION.observe(duration, host=host, endpoint=endpoint)
+    UPSTREAM_REQUESTS.inc(host=host, endpoint=endpoint, status=status)
+
+
+def _collect_caches() -> None:
+    from cache import response_cache
+    from services.version_checker import VersionChecker
+    from services.event_broker import event_broker
+
+    CACHE_LOOKUPS.set_total(response_cache.hits, cache='response', result='hit')
+    CACHE_LOOKUPS.set_total(response_cache.misses, cache='response', result='miss')
+    info = VersionChecker.cache_info()
+    CACHE_LOOKUPS.set_total(info['hits'], cache='version_parse', result='hit')
+    CACHE_LOOKUPS.set_total(info['misses'], cache='version_parse', result='miss')
+    STREAM_SUBSCRIBERS.set(event_broker.subscriber_count())
+
+
+def _collect_outbox() -> None:
+    from datetime import datetime
+    from models import db, NotificationOutbox
+
+    OUTBOX_ENTRIES.clear()
+    for status in ('pending', 'sent', 'failed'):
+        OUTBOX_ENTRIES.set(0, status=status)
+    rows = db.session.query(
+        NotificationOutbox.status, db.func.count(NotificationOutbox.id)
+    ).group_by(NotificationOutbox.status).all()
+    for status, count in rows:
+        OUTBOX_ENTRIES.set(count, status=status)
+
+    oldest = db.session.query(db.func.min(NotificationOutbox.created_at)).filter(
+        NotificationOutbox.status == 'pending'
+    ).scalar()
+    OUTBOX_OLDEST_PENDING.set((datetime.utcnow() - oldest).total_seconds() if oldest else 0)
+
+
+metrics.register_collector(_collect_caches)
+metrics.register_collector(_collect_outbox, shared=True)
+
+_engine_events_installed = False
+
+
+def _current_route() -> str:
+    from flask import has_request_context, request
+
+    if not has_request_context():
+        return 'background'
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def _install_engine_events() -> None:
+    """Count and time every SQL statement on any engine"""
+    global _engine_events_installed
+    if _engine_events_installed:
+        return
+    _engine_events_installed = True
+
+    from flask import g, has_request_context
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['metrics_query_start'] = time.perf_counter()
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('metrics_query_start', None)
+        if started is None:
+            return
+        route = _current_route()
+        DB_QUERIES.inc(route=route)
+        DB_QUERY_TIME.inc(time.perf_counter() - started, route=route)
+        if has_request_context():
+            g.metrics_queries = g.get('metrics_queries', 0) + 1
+
+
+def init_metrics(app) -> None:
+    """Install request/DB instrumentation and the /metrics endpoint"""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+
+    from flask import Response, g, request
+
+    metrics.configure(
+        multiproc_dir=app.config.get('METRICS_MULTIPROC_DIR'),
+        flush_interval=app.config.get('METRICS_FLUSH_INTERVAL', 5)
+    )
+    _install_engine_events()
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = 0
+
+    @app.after_request
+    def record_request(response):
+        started = g.get('metrics_started')
+        if started is not None:
+            route = _current_route()
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, route=route)
+            HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+            DB_QUERIES_PER_REQUEST.observe(g.get('metrics_queries', 0), route=route)
+        metrics.flush()
+        return response
+
+    def metrics_endpoint():
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics_endpoint)
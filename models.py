@@ -14,7 +14,7 @@ class Project(db.Model):
     description = db.Column(db.Text, nullable=True)
     github_repo = db.Column(db.String(255), nullable=True, unique=True)
     pypi_package = db.Column(db.String(255), nullable=True, unique=True)
-    category = db.Column(db.String(100), nullable=True)  # e.g., 'framework', 'library', 'tool'
+    category = db.Column(db.String(100), nullable=True, index=True)  # e.g., 'framework', 'library', 'tool'
     
     # Tracking info
     current_version = db.Column(db.String(50), nullable=True)
@@ -28,11 +28,27 @@ class Project(db.Model):
     # Metadata
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    last_checked = db.Column(db.DateTime, nullable=True)
+    last_checked = db.Column(db.DateTime, nullable=True, index=True)
+    
+    # Check scheduling: explicit priority (-1 low, 0 normal, 1 high, 2 critical)
+    # and project page views, decayed over time (see check_priority.py)
+    priority = db.Column(db.Integer, nullable=False, default=0)
+    interest = db.Column(db.Float, nullable=False, default=0.0)
+    interest_updated_at = db.Column(db.DateTime, nullable=True)
+    
+    # Normalized upstream sources, resolved from github_repo/pypi_package on flush
+    github_source_id = db.Column(db.Integer, db.ForeignKey('upstream_sources.id'), nullable=True, index=True)
+    pypi_source_id = db.Column(db.Integer, db.ForeignKey('upstream_sources.id'), nullable=True, index=True)
     
     # Relationships
+    github_source = db.relationship('UpstreamSource', foreign_keys=[github_source_id])
+    pypi_source = db.relationship('UpstreamSource', foreign_keys=[pypi_source_id])
     versions = db.relationship('Version', backref='project', lazy=True, cascade='all, delete-orphan')
     updates = db.relationship('Update', backref='project', lazy=True, cascade='all, delete-orphan')
+    check_runs = db.relationship('CheckRun', backref='project', lazy=True, cascade='all, delete-orphan')
+    dependencies = db.relationship('DependencyEdge', backref='project', lazy=True, cascade='all, delete-orphan')
+    release_cadence = db.relationship('ReleaseCadence', backref='project', uselist=False, cascade='all, delete-orphan')
+    release_months = db.relationship('ReleaseMonth', backref='project', lazy=True, cascade='all, delete-orphan')
     
     def __repr__(self):
         return f'<Project {self.name}>'
@@ -51,6 +67,7 @@ class Project(db.Model):
             'latest_release_date': self.latest_release_date.isoformat() if self.latest_release_date else None,
             'active': self.active,
             'notify_on_update': self.notify_on_update,
+            'priority': self.priority,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
             'last_checked': self.last_checked.isoformat() if self.last_checked else None,
@@ -98,6 +115,10 @@ class Version(db.Model):
 class Update(db.Model):
     """Model for tracking version updates"""
     __tablename__ = 'updates'
+    __table_args__ = (
+        db.Index('ix_updates_project_notified', 'project_id', 'notified'),
+        db.Index('ix_updates_type_project', 'update_type', 'project_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
@@ -117,6 +138,9 @@ class Update(db.Model):
     notified = db.Column(db.Boolean, default=False)
     notified_at = db.Column(db.DateTime, nullable=True)
     
+    # Relationships
+    deliveries = db.relationship('NotificationOutbox', backref='update', lazy=True, cascade='all, delete-orphan')
+    
     def __repr__(self):
         return f'<Update {self.old_version} -> {self.new_version}>'
     
@@ -134,3 +158,247 @@ class Update(db.Model):
             'notified': self.notified,
             'notified_at': self.notified_at.isoformat() if self.notified_at else None
         }
+
+
+class NotificationOutbox(db.Model):
+    """Webhook delivery queued in the same transaction as its Update"""
+    __tablename__ = 'notification_outbox'
+    __table_args__ = (
+        db.Index('ix_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    update_id = db.Column(db.Integer, db.ForeignKey('updates.id'), nullable=False, index=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    
+    target = db.Column(db.String(500), nullable=False)
+    payload = db.Column(db.Text, nullable=False)  # JSON document
+    dedupe_key = db.Column(db.String(700), nullable=False, unique=True)
+    
+    # Delivery state: 'pending', 'sending' (claimed by a dispatcher run), 'sent' or 'failed'
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    
+    # Dispatcher run that owns a 'sending' row; the claim expires at claimed_until
+    claimed_by = db.Column(db.String(100), nullable=True)
+    claimed_until = db.Column(db.DateTime, nullable=True)
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<NotificationOutbox {self.target} {self.status}>'
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'update_id': self.update_id,
+            'project_id': self.project_id,
+            'target': self.target,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'sent_at': self.sent_at.isoformat() if self.sent_at else None
+        }
+
+
+class CheckRun(db.Model):
+    """One project check: where the release came from and what it cost"""
+    __tablename__ = 'check_runs'
+    __table_args__ = (
+        db.Index('ix_check_runs_project_started', 'project_id', 'started_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    sweep_id = db.Column(db.String(36), nullable=True, index=True)  # None for single checks
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False)
+    trigger = db.Column(db.String(20), nullable=False)  # 'scheduled', 'bulk', 'single'
+    
+    # 'updated', 'up_to_date', 'no_release', 'error', 'timeout'
+    status = db.Column(db.String(20), nullable=False)
+    changed = db.Column(db.Boolean, nullable=False, default=False)
+    source = db.Column(db.String(20), nullable=True)  # 'github', 'pypi'
+    
+    http_status = db.Column(db.Integer, nullable=True)
+    upstream_calls = db.Column(db.Integer, nullable=False, default=0)
+    upstream_ms = db.Column(db.Float, nullable=True)
+    bytes = db.Column(db.Integer, nullable=True)
+    db_ms = db.Column(db.Float, nullable=True)
+    total_ms = db.Column(db.Float, nullable=True)
+    error = db.Column(db.String(500), nullable=True)
+    
+    started_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f'<CheckRun {self.project_id} {self.status}>'
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'sweep_id': self.sweep_id,
+            'project_id': self.project_id,
+            'trigger': self.trigger,
+            'status': self.status,
+            'changed': self.changed,
+            'source': self.source,
+            'http_status': self.http_status,
+            'upstream_calls': self.upstream_calls,
+            'upstream_ms': self.upstream_ms,
+            'bytes': self.bytes,
+            'db_ms': self.db_ms,
+            'total_ms': self.total_ms,
+            'error': self.error,
+            'started_at': self.started_at.isoformat() if self.started_at else None
+        }
+
+
+class DependencyEdge(db.Model):
+    """Requirement of a tracked project, from the requires_dist of its latest release"""
+    __tablename__ = 'dependency_edges'
+    __table_args__ = (
+        db.UniqueConstraint('project_id', 'dependency_name', name='uq_dependency_edges_project_dependency'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
+    dependency_name = db.Column(db.String(255), nullable=False, index=True)  # Normalized package name
+    specifier = db.Column(db.String(255), nullable=True)
+    marker = db.Column(db.String(500), nullable=True)
+    optional = db.Column(db.Boolean, nullable=False, default=False)  # Only required by an extra
+    
+    def __repr__(self):
+        return f'<DependencyEdge {self.project_id} -> {self.dependency_name}>'
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'dependency_name': self.dependency_name,
+            'specifier': self.specifier,
+            'marker': self.marker,
+            'optional': self.optional
+        }
+
+
+class UpstreamSource(db.Model):
+    """A GitHub repository or PyPI package, shared by every project tracking it"""
+    __tablename__ = 'upstream_sources'
+    __table_args__ = (
+        db.UniqueConstraint('provider', 'key', name='uq_upstream_sources_provider_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    provider = db.Column(db.String(20), nullable=False)  # 'github' or 'pypi'
+    key = db.Column(db.String(255), nullable=False)  # 'owner/repo' or normalized package name
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    webhook_at = db.Column(db.DateTime, nullable=True)  # Last GitHub webhook delivery
+    
+    def __repr__(self):
+        return f'<UpstreamSource {self.provider}:{self.key}>'
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'id': self.id,
+            'provider': self.provider,
+            'key': self.key,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'webhook_at': self.webhook_at.isoformat() if self.webhook_at else None
+        }
+
+
+class ReleaseCadence(db.Model):
+    """Rollup of one project's release history, maintained by analytics.refresh_release_analytics"""
+    __tablename__ = 'release_cadence'
+    
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), primary_key=True)
+    releases = db.Column(db.Integer, nullable=False, default=0)  # Non-prerelease versions
+    first_release = db.Column(db.DateTime, nullable=True)
+    last_release = db.Column(db.DateTime, nullable=True, index=True)
+    median_interval_days = db.Column(db.Float, nullable=True)
+    p90_interval_days = db.Column(db.Float, nullable=True)
+    releases_per_month = db.Column(db.Float, nullable=True)
+    major_updates = db.Column(db.Integer, nullable=False, default=0)
+    minor_updates = db.Column(db.Integer, nullable=False, default=0)
+    patch_updates = db.Column(db.Integer, nullable=False, default=0)
+    last_update_at = db.Column(db.DateTime, nullable=True)
+    refreshed_at = db.Column(db.DateTime, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<ReleaseCadence {self.project_id}>'
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'project_id': self.project_id,
+            'releases': self.releases,
+            'first_release': self.first_release.isoformat() if self.first_release else None,
+            'last_release': self.last_release.isoformat() if self.last_release else None,
+            'median_interval_days': self.median_interval_days,
+            'p90_interval_days': self.p90_interval_days,
+            'releases_per_month': self.releases_per_month,
+            'update_types': {
+                'major': self.major_updates,
+                'minor': self.minor_updates,
+                'patch': self.patch_updates
+            },
+            'last_update_at': self.last_update_at.isoformat() if self.last_update_at else None,
+            'refreshed_at': self.refreshed_at.isoformat() if self.refreshed_at else None
+        }
+
+
+class ReleaseMonth(db.Model):
+    """Releases of one project in one calendar month"""
+    __tablename__ = 'release_months'
+    __table_args__ = (
+        db.UniqueConstraint('project_id', 'month', name='uq_release_months_project_month'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id'), nullable=False, index=True)
+    month = db.Column(db.String(7), nullable=False, index=True)  # 'YYYY-MM'
+    releases = db.Column(db.Integer, nullable=False, default=0)
+
+
+class SweepCheckpoint(db.Model):
+    """Progress of a scheduled sweep, so a restarted process continues it"""
+    __tablename__ = 'sweep_checkpoints'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    sweep_id = db.Column(db.String(36), nullable=False, unique=True)
+    status = db.Column(db.String(20), nullable=False, default='running', index=True)  # 'running', 'completed', 'abandoned'
+    cursor = db.Column(db.Integer, nullable=False, default=0)  # Projects processed so far
+    total = db.Column(db.Integer, nullable=False, default=0)
+    resumes = db.Column(db.Integer, nullable=False, default=0)
+    started_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    def __repr__(self):
+        return f'<SweepCheckpoint {self.sweep_id} {self.status}>'
+    
+    def to_dict(self):
+        """Convert to dictionary"""
+        return {
+            'sweep_id': self.sweep_id,
+            'status': self.status,
+            'cursor': self.cursor,
+            'total': self.total,
+            'resumes': self.resumes,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class SweepCheckpointProject(db.Model):
+    """Project checked by a running sweep; each checkpoint appends only new rows"""
+    __tablename__ = 'sweep_checkpoint_projects'
+    
+    checkpoint_id = db.Column(db.Integer, db.ForeignKey('sweep_checkpoints.id'), primary_key=True)
+    project_id = db.Column(db.Integer, primary_key=True)
@@ -0,0 +1,126 @@
+# MIT License
+
+"""
+Bulk "what is outdated" evaluation of dependency pins
+Pins are matched against an in-memory index of tracked latest versions,
+so evaluation never calls upstream APIs.
+"""
+
+import logging
+import threading
+from typing import Dict, List
+
+from packaging.utils import canonicalize_name
+
+from cache import response_cache
+from models import db, Project
+from services.version_checker import VersionChecker
+
+logger = logging.getLogger(__name__)
+
+# Cache tag whose invalidation makes the index stale
+INDEX_TAGS = ('projects',)
+
+
+class LatestVersionIndex:
+    """Normalized package name -> latest tracked version, rebuilt when projects change"""
+
+    def __init__(self):
+        self._index = None
+        self._tag_versions = None
+        self._dirty = True
+        self._lock = threading.Lock()
+        response_cache.add_listener(self._on_invalidate)
+
+    def invalidate(self) -> None:
+        """Mark the index stale"""
+        self._dirty = True
+
+    def _on_invalidate(self, tags) -> None:
+        if any(tag in INDEX_TAGS for tag in tags):
+            self.invalidate()
+
+    def _is_stale(self) -> bool:
+        if self._dirty or self._index is None:
+            return True
+        return response_cache.backend.tag_versions(INDEX_TAGS) != self._tag_versions
+
+    def rebuild(self) -> Dict[str, Dict]:
+        """Load the index with one column-projected query (requires an application context)"""
+        with self._lock:
+            self._dirty = False
+            tag_versions = response_cache.backend.tag_versions(INDEX_TAGS)
+            rows = db.session.query(
+                Project.id, Project.name, Project.pypi_package, Project.latest_version
+            ).all()
+
+            index = {}
+            # Projects without a PyPI package are indexed by name, but never
+            # shadow a project that declares the package explicitly
+            for project_id, name, pypi_package, latest_version in rows:
+                if not pypi_package:
+                    index.setdefault(canonicalize_name(name), {
+                        'project_id': project_id, 'latest_version': latest_version
+                    })
+            for project_id, name, pypi_package, latest_version in rows:
+                if pypi_package:
+                    index[canonicalize_name(pypi_package)] = {
+                        'project_id': project_id, 'latest_version': latest_version
+                    }
+
+            self._index = index
+            self._tag_versions = tag_versions
+            return index
+
+    def get(self) -> Dict[str, Dict]:
+        """Return the current index, rebuilding it if stale"""
+        if self._is_stale():
+            return self.rebuild()
+        return self._index
+
+
+def evaluate_pins(pins: List[Dict], index: Dict[str, Dict]) -> List[Dict]:
+    """Compare pins against the latest tracked versions in one batch"""
+    results = []
+    pairs = []
+    for pin in pins:
+        tracked = index.get(pin['canonical_name'])
+        result = {
+            'name': pin['name'],
+            'pinned': pin['version'],
+            'specifier': pin['specifier'],
+            'line': pin['line'],
+            'project_id': tracked['project_id'] if tracked else None,
+            'latest_version': tracked['latest_version'] if tracked else None,
+            'update_type': None
+        }
+        if tracked is None:
+            result['status'] = 'untracked'
+        elif not tracked['latest_version']:
+            result['status'] = 'unknown'
+        elif not pin['version']:
+            result['status'] = 'unpinned'
+        elif not VersionChecker.is_valid(pin['version']):
+            # Not comparable, so neither current nor outdated
+            result['status'] = 'invalid'
+        elif not VersionChecker.is_valid(tracked['latest_version']):
+            result['status'] = 'unknown'
+        else:
+            pairs.append((len(results), pin['version'], tracked['latest_version']))
+        results.append(result)
+
+    update_types = VersionChecker.classify_many((old, new) for _, old, new in pairs)
+    for (position, pinned, latest), update_type in zip(pairs, update_types):
+        result = results[position]
+        result['update_type'] = update_type
+        if update_type:
+            result['status'] = 'outdated'
+        elif VersionChecker.version_key(pinned) > VersionChecker.version_key(latest):
+            result['status'] = 'ahead'
+        else:
+            result['status'] = 'current'
+    return results
+
+
+# Global latest-version index instance
+latest_version_index = LatestVersionIndex()
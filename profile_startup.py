@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Startup profile for Version Tracker
+
+Measures cold import time per module (python -X importtime), create_app()
+time and resident memory after each phase. Run before and after changes that
+touch imports or app setup:
+
+    python profile_startup.py [--top 20] [--config production]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Runs in a fresh interpreter so nothing is imported yet
+PROBE = '''
+import json, resource, sys, time
+
+def rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+import_rss = rss_mb()
+application = app.create_app(sys.argv[1])
+created = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'create_app_ms': (created - imported) * 1000,
+    'rss_after_import_mb': import_rss,
+    'rss_after_create_app_mb': rss_mb(),
+    'modules': len(sys.modules)
+}))
+'''
+
+
+def parse_importtime(stderr: str):
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth) rows"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile application startup')
+    parser.add_argument('--top', type=int, default=20, help='number of slowest imports to show')
+    parser.add_argument('--config', default='production', help='configuration name passed to create_app')
+    args = parser.parse_args()
+
+    env = dict(os.environ, SCHEDULER_AUTOSTART='False', AUTO_CREATE_SCHEMA='False')
+    env.setdefault('GITHUB_TOKEN', 'profile-token')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', PROBE, args.config],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        sys.exit(result.returncode)
+
+    summary = json.loads(result.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(result.stderr)
+
+    print('=' * 60)
+    print('Startup profile')
+    print('=' * 60)
+    print(f"Import app:        {summary['import_ms']:8.1f} ms")
+    print(f"create_app():      {summary['create_app_ms']:8.1f} ms")
+    print(f"RSS after import:  {summary['rss_after_import_mb']:8.1f} MB")
+    print(f"RSS after startup: {summary['rss_after_create_app_mb']:8.1f} MB")
+    print(f"Modules loaded:    {summary['modules']:8d}")
+
+    print(f'\nTop-level imports by cumulative time:')
+    for name, _, cumulative_us, _ in sorted((r for r in rows if r[3] == 1), key=lambda r: -r[2])[:args.top]:
+        print(f'  {cumulative_us / 1000:8.1f} ms  {name}')
+
+    print(f'\nSlowest modules by self time:')
+    for name, self_us, _, _ in sorted(rows, key=lambda r: -r[1])[:args.top]:
+        print(f'  {self_us / 1000:8.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
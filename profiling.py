@@ -0,0 +1,132 @@
+# MIT License
+
+"""
+Opt-in per-request profiling
+SQL statement counts and time via engine events, Server-Timing headers, a
+slow-request log listing the worst queries, and sampled cProfile captures.
+Nothing is installed unless PROFILING_ENABLED is set.
+"""
+
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+from collections import Counter
+from datetime import datetime
+
+from flask import g, has_request_context, request
+
+logger = logging.getLogger(__name__)
+
+_engine_events_installed = False
+
+# Literals are collapsed so the same query with different parameters groups together
+_LITERALS = re.compile(r"'[^']*'|\b\d+\b")
+
+
+def _install_engine_events() -> None:
+    """Record each SQL statement and its duration on the current request"""
+    global _engine_events_installed
+    if _engine_events_installed:
+        return
+    _engine_events_installed = True
+
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    @event.listens_for(Engine, 'before_cursor_execute')
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info['profiling_query_start'] = time.perf_counter()
+
+    @event.listens_for(Engine, 'after_cursor_execute')
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('profiling_query_start', None)
+        if started is None or not has_request_context():
+            return
+        queries = g.get('profiling_queries')
+        if queries is not None:
+            queries.append((time.perf_counter() - started, statement))
+
+
+def _repeated_statements(queries, minimum: int = 3):
+    """Statements run several times in one request (likely N+1 patterns)"""
+    counts = Counter(_LITERALS.sub('?', ' '.join(statement.split())) for _, statement in queries)
+    return [(statement, count) for statement, count in counts.most_common() if count >= minimum]
+
+
+def init_profiling(app) -> None:
+    """Register profiling hooks when PROFILING_ENABLED is set"""
+    if not app.config.get('PROFILING_ENABLED', False):
+        return
+
+    slow_threshold = app.config.get('PROFILING_SLOW_REQUEST_MS', 500) / 1000
+    worst_queries = app.config.get('PROFILING_SLOW_QUERY_COUNT', 5)
+    sample_rate = app.config.get('PROFILING_SAMPLE_RATE', 0.0)
+    header = app.config.get('PROFILING_HEADER', 'X-Profile')
+    token = app.config.get('PROFILING_TOKEN')
+    profile_dir = app.config.get('PROFILING_DIR') or os.path.join(app.instance_path, 'profiles')
+
+    _install_engine_events()
+
+    def _profile_requested() -> bool:
+        value = request.headers.get(header)
+        if value is not None and (not token or value == token):
+            return True
+        return sample_rate > 0 and random.random() < sample_rate
+
+    @app.before_request
+    def start_profiling():
+        g.profiling_started = time.perf_counter()
+        g.profiling_queries = []
+        g.profiler = None
+        if _profile_requested():
+            g.profiler = cProfile.Profile()
+            g.profiler.enable()
+
+    @app.after_request
+    def finish_profiling(response):
+        started = g.get('profiling_started')
+        if started is None:
+            return response
+
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+
+        elapsed = time.perf_counter() - started
+        queries = g.pop('profiling_queries', [])
+        db_time = sum(duration for duration, _ in queries)
+
+        timings = [
+            f'db;dur={db_time * 1000:.1f};desc="{len(queries)} queries"',
+            f'app;dur={(elapsed - db_time) * 1000:.1f}',
+            f'total;dur={elapsed * 1000:.1f}'
+        ]
+
+        if profiler is not None:
+            endpoint = (request.endpoint or 'unmatched').replace('.', '-')
+            filename = f'{datetime.utcnow():%Y%m%dT%H%M%S%f}-{endpoint}.prof'
+            try:
+                os.makedirs(profile_dir, exist_ok=True)
+                profiler.dump_stats(os.path.join(profile_dir, filename))
+                timings.append(f'profile;desc="{filename}"')
+                logger.info(f'Saved profile of {request.method} {request.path} to {filename}')
+            except OSError as e:
+                logger.warning(f'Error saving profile: {e}')
+
+        response.headers.add('Server-Timing', ', '.join(timings))
+
+        if elapsed >= slow_threshold:
+            lines = [
+                f'Slow request {request.method} {request.full_path.rstrip("?")} -> {response.status_code}: '
+                f'{elapsed * 1000:.1f} ms, {len(queries)} queries in {db_time * 1000:.1f} ms'
+            ]
+            for duration, statement in sorted(queries, key=lambda q: q[0], reverse=True)[:worst_queries]:
+                lines.append(f'  {duration * 1000:8.2f} ms  {" ".join(statement.split())[:300]}')
+            for statement, count in _repeated_statements(queries)[:worst_queries]:
+                lines.append(f'  repeated x{count}: {statement[:300]}')
+            logger.warning('\n'.join(lines))
+
+        return response
@@ -1,41 +1,153 @@
 # MIT License
 
-from flask import Blueprint, request, jsonify, current_app
-from models import db, Project, Version, Update
-from services.github_service import GitHubService
-from services.pypi_service import PyPIService
-from services.version_checker import VersionChecker
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from models import db, Project, Version, Update, NotificationOutbox, DependencyEdge
 from services.notifier import notification_service
-from datetime import datetime
+from services.event_broker import event_broker
+from services.notification_delivery import OutboxDispatcher
+from services.check_runs import CheckRunRecorder, list_sweeps, project_report, sweep_report, window_summary
+from services.requirements_parser import DependencyFileError, parse_dependency_file
+from cache import response_cache
+from dashboard import dashboard
+from outdated import evaluate_pins, latest_version_index
+from dependency_graph import dependency_graph
+from check_priority import PRIORITY_LEVELS, PRIORITY_NORMAL
+from github_webhooks import apply_release_event, mark_delivery, release_from_event, repository_key, verify_signature
+from analytics import fleet_summary, project_cadence, releases_per_month, stale_projects
+from search import build_project_filters
+from serialization import PROJECT_FIELDS, UPDATE_FIELDS, paginate_rows, parse_fields
+from datetime import datetime, timezone
+import hashlib
+import json
 import logging
+import queue
+import time
+import uuid
 
 logger = logging.getLogger(__name__)
 
 api_bp = Blueprint('api', __name__)
 
-# Initialize services
-github_service = GitHubService(token=None)  # Token will be set from config
-pypi_service = PyPIService()
-version_checker = VersionChecker()
+# ============================================================================
+# HTTP CACHING HELPERS
+# ============================================================================
+
+def _collection_state(model, *criteria):
+    """Cheap fingerprint of a table (row count and newest id)"""
+    query = db.session.query(func.count(model.id), func.max(model.id))
+    if criteria:
+        query = query.filter(*criteria)
+    return tuple(query.one())
+
+def _make_etag(*parts):
+    """Build an opaque ETag value from the state of the current request"""
+    raw = '|'.join(str(part) for part in (request.path, request.query_string.decode()) + parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:24]
+
+def _newest(*moments):
+    """Latest of the given timestamps, ignoring missing ones"""
+    present = [moment for moment in moments if moment is not None]
+    return max(present) if present else None
+
+def _not_modified(etag, last_modified=None):
+    """
+    Return a 304 response if the client already holds this representation
+    
+    If-None-Match wins over If-Modified-Since; the date is only compared when
+    the route can give a Last-Modified (timestamps miss deleted rows, so
+    collection routes validate by ETag alone).
+    """
+    if request.if_none_match:
+        if not request.if_none_match.contains_weak(etag):
+            return None
+    elif last_modified is None or request.if_modified_since is None:
+        return None
+    elif last_modified.replace(tzinfo=timezone.utc, microsecond=0) > request.if_modified_since:
+        return None
+    response = current_app.response_class(status=304)
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = current_app.config.get('API_CACHE_CONTROL', 'no-cache')
+    return response
+
+def _cacheable_json(payload, etag, last_modified=None):
+    """Serialize a payload and attach validators for conditional requests"""
+    response = jsonify(payload)
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = current_app.config.get('API_CACHE_CONTROL', 'no-cache')
+    return response
 
 # ============================================================================
 # PROJECT ROUTES
 # ============================================================================
 
+def _parse_priority(value):
+    """(priority level, error) for an integer level or a level name"""
+    if isinstance(value, str) and value in PRIORITY_LEVELS:
+        return PRIORITY_LEVELS[value], None
+    if isinstance(value, int) and not isinstance(value, bool) and value in PRIORITY_LEVELS.values():
+        return value, None
+    return None, f"priority must be one of {', '.join(PRIORITY_LEVELS)} or {min(PRIORITY_LEVELS.values())}..{max(PRIORITY_LEVELS.values())}"
+
+def _projects_cache_tags():
+    """Cache tags of a projects list request; stale_hours depends on the current time and is not cached"""
+    if 'stale_hours' in request.args:
+        return None
+    return ['projects', 'updates'] if 'has_unread' in request.args else ['projects']
+
 @api_bp.route('/projects', methods=['GET'])
+@response_cache.cached(_projects_cache_tags)
 def get_projects():
-    """Get all projects"""
+    """Get all projects, optionally filtered and searched"""
     page = request.args.get('page', 1, type=int)
     per_page = current_app.config.get('ITEMS_PER_PAGE', 20)
+    fields, error = parse_fields(request.args.get('fields'), PROJECT_FIELDS)
+    if error:
+        return jsonify({'error': error}), 400
+    criteria, error = build_project_filters(request.args)
+    if error:
+        return jsonify({'error': error}), 400
     
-    pagination = Project.query.paginate(page=page, per_page=per_page)
+    # A stale_hours result changes as time passes without any write, so it
+    # gets no ETag a client could revalidate against
+    time_relative = 'stale_hours' in request.args
+    etag = None
+    if not time_relative:
+        last_modified = db.session.query(func.max(Project.updated_at)).scalar()
+        last_notified = db.session.query(func.max(Update.notified_at)).scalar()
+        etag = _make_etag(
+            per_page,
+            last_modified,
+            last_notified,
+            _collection_state(Project),
+            _collection_state(Version),
+            _collection_state(Update)
+        )
+        cached = _not_modified(etag)
+        if cached:
+            return cached
     
-    return jsonify({
-        'projects': [p.to_dict() for p in pagination.items],
-        'total': pagination.total,
-        'pages': pagination.pages,
+    result = paginate_rows(
+        PROJECT_FIELDS, fields, criteria=criteria, order_by=[Project.id],
+        count_column=Project.id, page=page, per_page=per_page
+    )
+    if result is None:
+        return jsonify({'error': 'Not found'}), 404
+    
+    payload = {
+        'projects': result['items'],
+        'total': result['total'],
+        'pages': result['pages'],
         'current_page': page
-    })
+    }
+    if time_relative:
+        return jsonify(payload)
+    return _cacheable_json(payload, etag)
 
 @api_bp.route('/projects', methods=['POST'])
 def create_project():
@@ -50,6 +162,10 @@ def create_project():
     if Project.query.filter_by(name=data['name']).first():
         return jsonify({'error': 'Project with this name already exists'}), 400
     
+    priority, error = _parse_priority(data.get('priority', PRIORITY_NORMAL))
+    if error:
+        return jsonify({'error': error}), 400
+    
     try:
         project = Project(
             name=data['name'],
@@ -58,11 +174,13 @@ def create_project():
             pypi_package=data.get('pypi_package'),
             category=data.get('category'),
             current_version=data.get('current_version'),
-            notify_on_update=data.get('notify_on_update', True)
+            notify_on_update=data.get('notify_on_update', True),
+            priority=priority
         )
         
         db.session.add(project)
         db.session.commit()
+        response_cache.invalidate('projects')
         
         logger.info(f'Project created: {project.name}')
         return jsonify(project.to_dict()), 201
@@ -72,10 +190,28 @@ def create_project():
         return jsonify({'error': str(e)}), 400
 
 @api_bp.route('/projects/<int:project_id>', methods=['GET'])
+@response_cache.cached(lambda project_id: [f'project:{project_id}'])
 def get_project(project_id):
     """Get a specific project"""
     project = Project.query.get_or_404(project_id)
-    return jsonify(project.to_dict())
+    
+    etag = _make_etag(
+        project.updated_at,
+        _collection_state(Version, Version.project_id == project_id),
+        _collection_state(Update, Update.project_id == project_id)
+    )
+    last_modified = _newest(
+        project.updated_at,
+        db.session.query(func.max(Version.created_at)).filter(Version.project_id == project_id).scalar(),
+        *db.session.query(func.max(Update.detected_at), func.max(Update.notified_at)).filter(
+            Update.project_id == project_id
+        ).one()
+    )
+    cached = _not_modified(etag, last_modified)
+    if cached:
+        return cached
+    
+    return _cacheable_json(project.to_dict(), etag, last_modified)
 
 @api_bp.route('/projects/<int:project_id>', methods=['PUT'])
 def update_project(project_id):
@@ -83,6 +219,11 @@ def update_project(project_id):
     project = Project.query.get_or_404(project_id)
     data = request.get_json() or {}
     
+    if 'priority' in data:
+        priority, error = _parse_priority(data['priority'])
+        if error:
+            return jsonify({'error': error}), 400
+    
     try:
         if 'name' in data:
             project.name = data['name']
@@ -100,8 +241,11 @@ def update_project(project_id):
             project.active = data['active']
         if 'notify_on_update' in data:
             project.notify_on_update = data['notify_on_update']
+        if 'priority' in data:
+            project.priority = priority
         
         db.session.commit()
+        response_cache.invalidate('projects', f'project:{project_id}')
         logger.info(f'Project updated: {project.name}')
         return jsonify(project.to_dict())
     except Exception as e:
@@ -117,6 +261,7 @@ def delete_project(project_id):
     try:
         db.session.delete(project)
         db.session.commit()
+        response_cache.invalidate('projects', f'project:{project_id}', 'updates', 'dependencies', 'analytics')
         logger.info(f'Project deleted: {project.name}')
         return jsonify({'message': 'Project deleted successfully'})
     except Exception as e:
@@ -124,11 +269,181 @@ def delete_project(project_id):
         logger.error(f'Error deleting project: {e}')
         return jsonify({'error': str(e)}), 400
 
+# Fields that can be set through the create/import endpoints
+PROJECT_WRITABLE_FIELDS = (
+    'name', 'description', 'github_repo', 'pypi_package', 'category',
+    'current_version', 'active', 'notify_on_update', 'priority'
+)
+
+def _validate_project_record(record):
+    """Return an error message for an invalid import record, or None"""
+    if not isinstance(record, dict):
+        return 'Record must be a JSON object'
+    if not record.get('name') or not isinstance(record['name'], str):
+        return 'Name is required'
+    
+    for field in PROJECT_WRITABLE_FIELDS:
+        if field not in record or record[field] is None:
+            continue
+        value = record[field]
+        if field in ('active', 'notify_on_update'):
+            if not isinstance(value, bool):
+                return f'{field} must be a boolean'
+        elif field == 'priority':
+            _, error = _parse_priority(value)
+            if error:
+                return error
+        elif not isinstance(value, str):
+            return f'{field} must be a string'
+        else:
+            length = Project.__table__.c[field].type.length
+            if length and len(value) > length:
+                return f'{field} is longer than {length} characters'
+    return None
+
+def _apply_project_record(project, record):
+    """Copy writable fields of an import record onto a project"""
+    for field in PROJECT_WRITABLE_FIELDS:
+        if field == 'priority' and record.get(field) is not None:
+            project.priority = _parse_priority(record[field])[0]
+        elif field in record:
+            setattr(project, field, record[field])
+
+def _import_batch(batch, summary):
+    """Upsert a batch of (line, record) pairs in one transaction"""
+    names = {record['name'] for _, record in batch}
+    existing = {p.name: p for p in Project.query.filter(Project.name.in_(names))}
+    
+    created = updated = 0
+    try:
+        for _, record in batch:
+            project = existing.get(record['name'])
+            if project is None:
+                project = Project()
+                existing[record['name']] = project
+                db.session.add(project)
+                created += 1
+            else:
+                updated += 1
+            _apply_project_record(project, record)
+        db.session.commit()
+        summary['created'] += created
+        summary['updated'] += updated
+        return [p.id for p in existing.values()]
+    except IntegrityError:
+        db.session.rollback()
+    
+    # Slow path: find the offending lines by committing records one at a time
+    project_ids = []
+    for line_number, record in batch:
+        project = Project.query.filter_by(name=record['name']).first()
+        is_new = project is None
+        if is_new:
+            project = Project()
+            db.session.add(project)
+        _apply_project_record(project, record)
+        
+        try:
+            db.session.commit()
+        except IntegrityError as e:
+            db.session.rollback()
+            summary['errors'].append({'line': line_number, 'error': str(e.orig)})
+            continue
+        
+        summary['created' if is_new else 'updated'] += 1
+        project_ids.append(project.id)
+    return project_ids
+
+def _export_record(project):
+    """Serialize project columns without touching relationships"""
+    record = {}
+    for column in Project.__table__.columns:
+        value = getattr(project, column.name)
+        record[column.name] = value.isoformat() if isinstance(value, datetime) else value
+    return record
+
+@api_bp.route('/projects:import', methods=['POST'])
+def import_projects():
+    """Create or update projects from an NDJSON request body"""
+    batch_size = current_app.config.get('IMPORT_BATCH_SIZE', 500)
+    summary = {'created': 0, 'updated': 0, 'errors': []}
+    touched = []
+    batch = []
+    
+    for line_number, raw_line in enumerate(request.stream, start=1):
+        line = raw_line.strip()
+        if not line:
+            continue
+        
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            summary['errors'].append({'line': line_number, 'error': f'Invalid JSON: {e}'})
+            continue
+        
+        error = _validate_project_record(record)
+        if error:
+            summary['errors'].append({'line': line_number, 'error': error})
+            continue
+        
+        batch.append((line_number, record))
+        if len(batch) >= batch_size:
+            touched.extend(_import_batch(batch, summary))
+            batch = []
+    
+    if batch:
+        touched.extend(_import_batch(batch, summary))
+    
+    if touched:
+        response_cache.invalidate('projects', *(f'project:{project_id}' for project_id in set(touched)))
+    
+    logger.info(
+        f'Projects imported: {summary["created"]} created, {summary["updated"]} updated, '
+        f'{len(summary["errors"])} errors'
+    )
+    return jsonify(summary)
+
+@api_bp.route('/projects:export', methods=['GET'])
+def export_projects():
+    """Stream all projects (optionally with versions) as NDJSON"""
+    app = current_app._get_current_object()
+    batch_size = app.config.get('EXPORT_BATCH_SIZE', 500)
+    include_versions = request.args.get('include_versions', 'false').lower() in ('1', 'true', 'yes')
+    
+    def generate():
+        with app.app_context():
+            last_id = 0
+            while True:
+                # Keyset pagination keeps memory constant regardless of table size
+                projects = Project.query.filter(Project.id > last_id).order_by(Project.id).limit(batch_size).all()
+                if not projects:
+                    break
+                
+                versions = {}
+                if include_versions:
+                    rows = Version.query.filter(
+                        Version.project_id.in_([p.id for p in projects])
+                    ).order_by(Version.project_id, Version.id)
+                    for version in rows:
+                        versions.setdefault(version.project_id, []).append(version.to_dict())
+                
+                for project in projects:
+                    record = _export_record(project)
+                    if include_versions:
+                        record['versions'] = versions.get(project.id, [])
+                    yield json.dumps(record) + '\n'
+                
+                last_id = projects[-1].id
+                db.session.expunge_all()
+    
+    return Response(generate(), mimetype='application/x-ndjson')
+
 # ============================================================================
 # VERSION ROUTES
 # ============================================================================
 
 @api_bp.route('/projects/<int:project_id>/versions', methods=['GET'])
+@response_cache.cached(lambda project_id: [f'project:{project_id}'])
 def get_versions(project_id):
     """Get versions for a project"""
     project = Project.query.get_or_404(project_id)
@@ -136,18 +451,33 @@ def get_versions(project_id):
     page = request.args.get('page', 1, type=int)
     per_page = current_app.config.get('ITEMS_PER_PAGE', 20)
     
+    latest_id = db.session.query(Version.id).filter_by(
+        project_id=project_id, is_latest=True
+    ).scalar()
+    etag = _make_etag(
+        per_page,
+        latest_id,
+        _collection_state(Version, Version.project_id == project_id)
+    )
+    # Versions are only added, or deleted together with the project
+    last_modified = db.session.query(func.max(Version.created_at)).filter(Version.project_id == project_id).scalar()
+    cached = _not_modified(etag, last_modified)
+    if cached:
+        return cached
+    
     pagination = Version.query.filter_by(project_id=project_id).order_by(
         Version.release_date.desc()
     ).paginate(page=page, per_page=per_page)
     
-    return jsonify({
+    return _cacheable_json({
         'versions': [v.to_dict() for v in pagination.items],
         'total': pagination.total,
         'pages': pagination.pages,
         'current_page': page
-    })
+    }, etag, last_modified)
 
 @api_bp.route('/projects/<int:project_id>/latest-version', methods=['GET'])
+@response_cache.cached(lambda project_id: [f'project:{project_id}'])
 def get_latest_version(project_id):
     """Get latest version for a project"""
     project = Project.query.get_or_404(project_id)
@@ -166,88 +496,20 @@ def get_latest_version(project_id):
 @api_bp.route('/projects/<int:project_id>/check-update', methods=['POST'])
 def check_update(project_id):
     """Check for updates for a project"""
+    from background_tasks import check_project_updates
+    
     project = Project.query.get_or_404(project_id)
+    recorder = CheckRunRecorder.from_config(current_app.config, trigger='single')
     
     try:
-        update_info = None
-        
-        # Check GitHub
-        if project.github_repo:
-            owner, repo = github_service.parse_repo_url(project.github_repo)
-            if owner and repo:
-                release = github_service.get_latest_release(owner, repo)
-                if release:
-                    update_info = github_service.extract_version_info(release)
-        
-        # Check PyPI
-        if project.pypi_package and not update_info:
-            latest_version = pypi_service.get_latest_version(project.pypi_package)
-            if latest_version:
-                update_info = pypi_service.extract_version_info(project.pypi_package)
-        
-        if update_info:
-            new_version = update_info['version_number']
-            
-            # Check if version already exists
-            existing = Version.query.filter_by(
-                project_id=project_id,
-                version_number=new_version
-            ).first()
-            
-            if not existing:
-                version = Version(
-                    project_id=project_id,
-                    version_number=new_version,
-                    release_date=update_info.get('release_date'),
-                    download_url=update_info.get('download_url'),
-                    is_prerelease=update_info.get('is_prerelease', False),
-                    is_latest=True
-                )
-                
-                # Mark old versions as not latest
-                Version.query.filter_by(project_id=project_id, is_latest=True).update({'is_latest': False})
-                
-                db.session.add(version)
-                
-                # Check if it's an update
-                if project.current_version:
-                    update_type = version_checker.compare_versions(
-                        project.current_version,
-                        new_version
-                    )
-                    
-                    if update_type:
-                        update = Update(
-                            project_id=project_id,
-                            old_version=project.current_version,
-                            new_version=new_version,
-                            update_type=update_type,
-                            description=update_info.get('description')
-                        )
-                db.session.add(update)
-                
-                # Always send notification for new updates
-                notification_service.notify_update(
-                    project.name,
-                    project.current_version,
-                    new_version
-                )
-                
-                project.current_version = new_version
-                project.latest_version = new_version
-                project.latest_release_date = update_info.get('release_date')
-                project.last_checked = datetime.utcnow()
-                
-                db.session.commit()
-                logger.info(f'Update detected for {project.name}: {new_version}')
-                
-                return jsonify({
-                    'message': 'Update found',
-                    'version': version.to_dict()
-                })
+        version = check_project_updates(project, recorder=recorder)
         
-        project.last_checked = datetime.utcnow()
-        db.session.commit()
+        if version is not None:
+            logger.info(f'Update detected for {project.name}: {version.version_number}')
+            return jsonify({
+                'message': 'Update found',
+                'version': version.to_dict()
+            })
         
         return jsonify({'message': 'No updates available'})
     
@@ -255,25 +517,108 @@ def check_update(project_id):
         db.session.rollback()
         logger.error(f'Error checking updates for project {project_id}: {e}')
         return jsonify({'error': str(e)}), 400
+    finally:
+        recorder.flush()
+
+@api_bp.route('/check-updates', methods=['POST'])
+def check_updates_bulk():
+    """Check updates for many projects concurrently"""
+    from background_tasks import check_projects_concurrently
+    
+    data = request.get_json() or {}
+    project_ids = data.get('project_ids')
+    category = data.get('category')
+    
+    if project_ids is None and not category:
+        return jsonify({'error': 'project_ids or category is required'}), 400
+    if project_ids is not None and (
+        not isinstance(project_ids, list) or not all(isinstance(i, int) for i in project_ids)
+    ):
+        return jsonify({'error': 'project_ids must be a list of integers'}), 400
+    
+    max_projects = current_app.config.get('BULK_CHECK_MAX_PROJECTS', 1000)
+    query = Project.query
+    if project_ids is not None:
+        query = query.filter(Project.id.in_(project_ids))
+    if category:
+        query = query.filter_by(category=category, active=True)
+    projects = query.order_by(Project.id).limit(max_projects + 1).all()
+    
+    if len(projects) > max_projects:
+        return jsonify({'error': f'At most {max_projects} projects can be checked at once'}), 400
+    
+    max_deadline = current_app.config.get('BULK_CHECK_DEADLINE', 30)
+    try:
+        deadline = min(float(data.get('deadline', max_deadline)), max_deadline)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'deadline must be a number'}), 400
+    
+    found = {p.id for p in projects}
+    missing = [
+        {'project_id': project_id, 'status': 'not_found'}
+        for project_id in (project_ids or []) if project_id not in found
+    ]
+    recorder = CheckRunRecorder.from_config(current_app.config, sweep_id=str(uuid.uuid4()), trigger='bulk')
+    results = check_projects_concurrently(
+        projects,
+        max_workers=current_app.config.get('BULK_CHECK_MAX_WORKERS', 8),
+        deadline=deadline,
+        recorder=recorder
+    )
+    
+    if request.args.get('stream', 'false').lower() in ('1', 'true', 'yes'):
+        def generate():
+            for result in missing:
+                yield json.dumps(result) + '\n'
+            for result in results:
+                yield json.dumps(result) + '\n'
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    
+    started = time.monotonic()
+    results = missing + list(results)
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    
+    return jsonify({
+        'results': results,
+        'summary': summary,
+        'sweep_id': recorder.sweep_id,
+        'elapsed': round(time.monotonic() - started, 3)
+    })
 
 @api_bp.route('/updates/history', methods=['GET'])
+@response_cache.cached(['updates'])
 def get_updates_history():
     """Get update history"""
     page = request.args.get('page', 1, type=int)
     per_page = current_app.config.get('ITEMS_PER_PAGE', 20)
+    fields, error = parse_fields(request.args.get('fields'), UPDATE_FIELDS)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    last_notified = db.session.query(func.max(Update.notified_at)).scalar()
+    etag = _make_etag(per_page, last_notified, _collection_state(Update))
+    cached = _not_modified(etag)
+    if cached:
+        return cached
     
-    pagination = Update.query.order_by(Update.detected_at.desc()).paginate(
-        page=page, per_page=per_page
+    result = paginate_rows(
+        UPDATE_FIELDS, fields, criteria=[], order_by=[Update.detected_at.desc(), Update.id.desc()],
+        count_column=Update.id, page=page, per_page=per_page
     )
+    if result is None:
+        return jsonify({'error': 'Not found'}), 404
     
-    return jsonify({
-        'updates': [u.to_dict() for u in pagination.items],
-        'total': pagination.total,
-        'pages': pagination.pages,
+    return _cacheable_json({
+        'updates': result['items'],
+        'total': result['total'],
+        'pages': result['pages'],
         'current_page': page
-    })
+    }, etag)
 
 @api_bp.route('/projects/<int:project_id>/updates', methods=['GET'])
+@response_cache.cached(lambda project_id: [f'project:{project_id}', 'updates'])
 def get_project_updates(project_id):
     """Get updates for a specific project"""
     project = Project.query.get_or_404(project_id)
@@ -292,11 +637,52 @@ def get_project_updates(project_id):
         'current_page': page
     })
 
+@api_bp.route('/outdated', methods=['POST'])
+def evaluate_outdated():
+    """Report which pins of an uploaded dependency file are behind tracked versions"""
+    upload = request.files.get('file')
+    if upload is not None:
+        raw = upload.read()
+        filename = upload.filename
+    else:
+        raw = request.get_data()
+        filename = request.args.get('filename')
+    
+    max_size = current_app.config.get('OUTDATED_MAX_FILE_SIZE', 5 * 1024 * 1024)
+    if not raw:
+        return jsonify({'error': 'A dependency file is required'}), 400
+    if len(raw) > max_size:
+        return jsonify({'error': f'File is larger than {max_size} bytes'}), 400
+    
+    started = time.monotonic()
+    try:
+        pins = parse_dependency_file(
+            raw.decode('utf-8-sig'), filename=filename, file_format=request.args.get('format')
+        )
+    except (DependencyFileError, UnicodeDecodeError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    results = evaluate_pins(pins, latest_version_index.get())
+    summary = {}
+    for result in results:
+        summary[result['status']] = summary.get(result['status'], 0) + 1
+    
+    if request.args.get('only_outdated', 'false').lower() in ('1', 'true', 'yes'):
+        results = [result for result in results if result['status'] == 'outdated']
+    
+    return jsonify({
+        'results': results,
+        'summary': summary,
+        'total': len(pins),
+        'elapsed': round(time.monotonic() - started, 4)
+    })
+
 # ============================================================================
 # NOTIFICATION ROUTES
 # ============================================================================
 
 @api_bp.route('/notifications/unread', methods=['GET'])
+@response_cache.cached(['updates'])
 def get_unread_notifications():
     """Get unread notifications"""
     notifications = notification_service.get_unread_notifications()
@@ -305,12 +691,274 @@ def get_unread_notifications():
         'count': len(notifications)
     })
 
+@api_bp.route('/notifications/stream', methods=['GET'])
+def stream_notifications():
+    """Stream new update notifications as server-sent events"""
+    app = current_app._get_current_object()
+    heartbeat = app.config.get('SSE_HEARTBEAT_INTERVAL', 15)
+    max_duration = app.config.get('SSE_MAX_STREAM_DURATION', 300)
+    
+    # Streams are capped per worker so they cannot take every request thread
+    subscription = event_broker.subscribe(limit=app.config.get('SSE_MAX_STREAMS', 4))
+    if subscription is None:
+        response = jsonify({'error': 'Too many notification streams, retry later'})
+        response.status_code = 503
+        response.headers['Retry-After'] = str(heartbeat)
+        return response
+    
+    # Resume after the last event the client saw, or start from now
+    try:
+        latest_id = db.session.query(func.max(Update.id)).scalar() or 0
+    except Exception:
+        event_broker.unsubscribe(subscription)
+        raise
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if last_event_id is None:
+        last_event_id = request.args.get('last_event_id', type=int)
+    if last_event_id is None:
+        last_event_id = latest_id
+    db.session.remove()
+    
+    def load_since(cursor):
+        with app.app_context():
+            return notification_service.get_notifications_since(cursor)
+    
+    # Updates committed by other workers reach the broker through its single poller
+    event_broker.watch(load_since, heartbeat, latest_id)
+    
+    def generate():
+        cursor = last_event_id
+        deadline = time.monotonic() + max_duration
+        try:
+            yield f'retry: {int(heartbeat * 1000)}\n\n'
+            pending = load_since(cursor) if cursor < latest_id else []
+            while True:
+                for notification in pending:
+                    cursor = notification['id']
+                    yield event_broker.format_event(cursor, 'update', json.dumps(notification))
+                
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                
+                try:
+                    event = subscription.get(timeout=min(heartbeat, remaining))
+                except queue.Empty:
+                    pending = []
+                    yield ': heartbeat\n\n'
+                    continue
+                
+                if event['id'] == cursor + 1:
+                    pending = [event['data']]
+                elif event['id'] > cursor:
+                    # Missed events (full queue, out-of-order commits) are read back once
+                    pending = load_since(cursor)
+                else:
+                    pending = []
+        finally:
+            event_broker.unsubscribe(subscription)
+    
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    # Also release the slot when the body is never iterated
+    response.call_on_close(lambda: event_broker.unsubscribe(subscription))
+    return response
+
 @api_bp.route('/notifications/mark-read/<project_name>', methods=['POST'])
 def mark_notification_read(project_name):
     """Mark notifications as read for a project"""
     notification_service.mark_as_read(project_name)
     return jsonify({'message': 'Notifications marked as read'})
 
+@api_bp.route('/notifications/outbox', methods=['GET'])
+def get_notification_outbox():
+    """Get webhook delivery backlog and recent failures"""
+    failures = NotificationOutbox.query.filter(
+        NotificationOutbox.last_error.isnot(None),
+        NotificationOutbox.status != 'sent'
+    ).order_by(NotificationOutbox.id.desc()).limit(20).all()
+    
+    return jsonify({
+        'backlog': OutboxDispatcher.backlog(),
+        'recent_failures': [entry.to_dict() for entry in failures]
+    })
+
+@api_bp.route('/projects/<int:project_id>/dependencies', methods=['GET'])
+def get_project_dependencies(project_id):
+    """Get requirements of a project and tracked projects depending on it"""
+    Project.query.get_or_404(project_id)
+    edges = DependencyEdge.query.filter_by(project_id=project_id).order_by(DependencyEdge.dependency_name).all()
+    
+    requires = []
+    for edge in edges:
+        requires.append(dict(edge.to_dict(), project_id=dependency_graph.resolve(edge.dependency_name)))
+    
+    return jsonify({
+        'project_id': project_id,
+        'requires': requires,
+        'dependents': dependency_graph.dependents(project_id)
+    })
+
+@api_bp.route('/projects/<int:project_id>/impact', methods=['GET'])
+def get_project_impact(project_id):
+    """Get tracked projects transitively affected by a release of a project"""
+    project = Project.query.get_or_404(project_id)
+    include_optional = request.args.get('include_optional', 'false').lower() in ('1', 'true', 'yes')
+    max_depth = request.args.get('max_depth', type=int)
+    
+    affected = dependency_graph.impact(project_id, include_optional)
+    if max_depth is not None:
+        affected = [item for item in affected if item['depth'] <= max_depth]
+    
+    return jsonify({
+        'project_id': project_id,
+        'name': project.name,
+        'latest_version': project.latest_version,
+        'include_optional': include_optional,
+        'count': len(affected),
+        'affected': affected
+    })
+
+# ============================================================================
+# WEBHOOK ROUTES
+# ============================================================================
+
+@api_bp.route('/webhooks/github', methods=['POST'])
+def github_webhook():
+    """Apply GitHub release events to the projects tracking the repository"""
+    from analytics import refresh_release_analytics
+    
+    secret = current_app.config.get('GITHUB_WEBHOOK_SECRET')
+    if not secret:
+        return jsonify({'error': 'GitHub webhooks are not configured'}), 404
+    body = request.get_data()
+    if not verify_signature(secret, body, request.headers.get('X-Hub-Signature-256')):
+        return jsonify({'error': 'Invalid signature'}), 401
+    
+    event = request.headers.get('X-GitHub-Event', '')
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return jsonify({'error': 'Invalid JSON payload'}), 400
+    if not isinstance(payload, dict):
+        return jsonify({'error': 'Invalid JSON payload'}), 400
+    
+    key = repository_key(payload)
+    source = mark_delivery(key) if key else None
+    if event == 'ping':
+        return jsonify({'message': 'pong', 'tracked': source is not None})
+    if event != 'release':
+        return jsonify({'status': 'ignored', 'reason': f'Unhandled event {event!r}'}), 202
+    release = release_from_event(payload)
+    if release is None:
+        return jsonify({'status': 'ignored', 'reason': 'Not a published final release'}), 202
+    if source is None:
+        return jsonify({'status': 'ignored', 'reason': 'Repository is not tracked'}), 202
+    
+    recorder = CheckRunRecorder.from_config(current_app.config, trigger='webhook')
+    results = apply_release_event(source, release, recorder)
+    recorder.flush()
+    if any(result['status'] == 'updated' for result in results):
+        refresh_release_analytics()
+    logger.info(f"Webhook release {release.get('tag_name')} for {key} applied to {len(results)} projects")
+    return jsonify({'status': 'applied', 'repository': key, 'results': results})
+
+# ============================================================================
+# CHECK RUN ROUTES
+# ============================================================================
+
+@api_bp.route('/check-runs/sweeps', methods=['GET'])
+def get_check_run_sweeps():
+    """Get recent sweeps with check counts and durations"""
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    return jsonify({'sweeps': list_sweeps(limit)})
+
+@api_bp.route('/check-runs/sweeps/<sweep_id>', methods=['GET'])
+def get_check_run_sweep(sweep_id):
+    """Get time split, slowest projects and error hotspots of a sweep"""
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    report = sweep_report(sweep_id, limit)
+    if report is None:
+        return jsonify({'error': 'Sweep not found'}), 404
+    return jsonify(report)
+
+@api_bp.route('/check-runs/summary', methods=['GET'])
+def get_check_run_summary():
+    """Get an aggregate of all checks in the last N hours"""
+    hours = max(1, request.args.get('hours', 24, type=int))
+    limit = min(request.args.get('limit', 10, type=int), 100)
+    return jsonify(window_summary(hours, limit))
+
+@api_bp.route('/projects/<int:project_id>/check-runs', methods=['GET'])
+def get_project_check_runs(project_id):
+    """Get check latency, error rate and recent check runs of a project"""
+    Project.query.get_or_404(project_id)
+    limit = min(request.args.get('limit', 20, type=int), 100)
+    return jsonify(project_report(project_id, limit))
+
+# ============================================================================
+# CACHE ROUTES
+# ============================================================================
+
+@api_bp.route('/cache/stats', methods=['GET'])
+def get_cache_stats():
+    """Get response cache hit/miss statistics"""
+    return jsonify(response_cache.stats())
+
+# ============================================================================
+# DASHBOARD ROUTES
+# ============================================================================
+
+@api_bp.route('/dashboard', methods=['GET'])
+def get_dashboard():
+    """Get statistics, recent updates, unread count and scheduler status in one response"""
+    payload, etag = dashboard.get()
+    cached = _not_modified(etag)
+    if cached:
+        return cached
+    return _cacheable_json(payload, etag)
+
+# ============================================================================
+# ANALYTICS ROUTES
+# ============================================================================
+
+def _stale_months():
+    return max(1, request.args.get('months', current_app.config.get('ANALYTICS_STALE_MONTHS', 6), type=int))
+
+@api_bp.route('/analytics/summary', methods=['GET'])
+@response_cache.cached(['analytics'])
+def get_analytics_summary():
+    """Get fleet-wide release cadence, update type shares and stale project count"""
+    months = min(max(1, request.args.get('window', 12, type=int)), 120)
+    return jsonify(fleet_summary(_stale_months(), months))
+
+@api_bp.route('/analytics/releases-per-month', methods=['GET'])
+@response_cache.cached(['analytics'])
+def get_analytics_releases_per_month():
+    """Get fleet-wide release counts per calendar month"""
+    months = min(max(1, request.args.get('window', 12, type=int)), 120)
+    return jsonify({'monthly': releases_per_month(months)})
+
+@api_bp.route('/analytics/stale', methods=['GET'])
+@response_cache.cached(['analytics'])
+def get_analytics_stale():
+    """Get active projects without a release in the last N months"""
+    months = _stale_months()
+    limit = min(request.args.get('limit', 50, type=int), 500)
+    return jsonify({'months': months, 'projects': stale_projects(months, limit)})
+
+@api_bp.route('/analytics/projects/<int:project_id>', methods=['GET'])
+@response_cache.cached(['analytics'])
+def get_analytics_project(project_id):
+    """Get release cadence of one project"""
+    months = min(max(1, request.args.get('window', 12, type=int)), 120)
+    payload = project_cadence(project_id, months)
+    if payload is None:
+        return jsonify({'error': 'No analytics for this project yet'}), 404
+    return jsonify(payload)
+
 # ============================================================================
 # STATISTICS ROUTES
 # ============================================================================
@@ -0,0 +1,183 @@
+# MIT License
+
+"""
+Server-side filtering and full-text search for projects
+SQLite uses an FTS5 index kept in sync by triggers, PostgreSQL a tsvector
+expression index; other databases fall back to LIKE matching. Databases
+created before the index existed get it at startup (ensure_search_index), and
+SQLite searches use LIKE until it is there.
+"""
+
+import logging
+import re
+import weakref
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import DDL, and_, column, event, exists, func, or_, text
+
+from models import db, Project, Update
+
+logger = logging.getLogger(__name__)
+
+UPDATE_TYPES = ('major', 'minor', 'patch')
+MAX_STALE_HOURS = 24 * 365 * 100
+
+_SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5("
+    "name, description, content='projects', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_insert AFTER INSERT ON projects BEGIN "
+    "INSERT INTO projects_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_delete AFTER DELETE ON projects BEGIN "
+    "INSERT INTO projects_fts(projects_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_update AFTER UPDATE OF name, description ON projects BEGIN "
+    "INSERT INTO projects_fts(projects_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO projects_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+]
+
+_POSTGRES_FTS_DDL = [
+    "CREATE INDEX IF NOT EXISTS ix_projects_fulltext ON projects USING gin ("
+    "to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(description, '')))",
+]
+
+for statement in _SQLITE_FTS_DDL:
+    event.listen(Project.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+for statement in _POSTGRES_FTS_DDL:
+    event.listen(Project.__table__, 'after_create', DDL(statement).execute_if(dialect='postgresql'))
+event.listen(Project.__table__, 'before_drop', DDL('DROP TABLE IF EXISTS projects_fts').execute_if(dialect='sqlite'))
+
+
+def rebuild_search_index() -> None:
+    """Create the full-text index if missing and repopulate it from the projects table"""
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite':
+        for statement in _SQLITE_FTS_DDL:
+            db.session.execute(text(statement))
+        db.session.execute(text("INSERT INTO projects_fts(projects_fts) VALUES ('rebuild')"))
+    elif dialect == 'postgresql':
+        for statement in _POSTGRES_FTS_DDL:
+            db.session.execute(text(statement))
+    db.session.commit()
+
+
+# Engines whose SQLite FTS5 table is known to exist
+_sqlite_fts_ready = weakref.WeakSet()
+
+
+def _sqlite_fts_exists() -> bool:
+    engine = db.engine
+    if engine not in _sqlite_fts_ready:
+        found = db.session.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'projects_fts'"
+        )).first()
+        if found is None:
+            return False
+        _sqlite_fts_ready.add(engine)
+    return True
+
+
+def ensure_search_index() -> None:
+    """Build the full-text index of an existing database that does not have one yet"""
+    try:
+        if db.engine.dialect.name != 'sqlite' or not db.inspect(db.engine).has_table('projects'):
+            return
+        if not _sqlite_fts_exists():
+            logger.info('Full-text index missing, building it')
+            rebuild_search_index()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Error in ensure_search_index: {e}')
+
+
+def _like_criterion(tokens: List[str]):
+    return and_(*[
+        or_(Project.name.ilike(f'%{token}%'), Project.description.ilike(f'%{token}%'))
+        for token in tokens
+    ])
+
+
+def _fulltext_criterion(query: str):
+    """Build a full-text match criterion for the current database"""
+    tokens = re.findall(r'\w+', query, flags=re.UNICODE)
+    if not tokens:
+        return None
+
+    dialect = db.engine.dialect.name
+    if dialect == 'sqlite' and _sqlite_fts_exists():
+        # Quote every token and use prefix matching so user input is never parsed as FTS syntax
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        matches = text('SELECT rowid FROM projects_fts WHERE projects_fts MATCH :fts_query').bindparams(
+            fts_query=match
+        ).columns(column('rowid'))
+        return Project.id.in_(matches)
+
+    if dialect == 'postgresql':
+        document = func.to_tsvector(
+            'simple', func.coalesce(Project.name, '') + ' ' + func.coalesce(Project.description, '')
+        )
+        ts_query = func.to_tsquery('simple', ' & '.join(f'{token}:*' for token in tokens))
+        return document.op('@@')(ts_query)
+
+    return _like_criterion(tokens)
+
+
+def _parse_bool(value: str) -> Optional[bool]:
+    value = value.strip().lower()
+    if value in ('1', 'true', 'yes'):
+        return True
+    if value in ('0', 'false', 'no'):
+        return False
+    return None
+
+
+def build_project_filters(args) -> Tuple[List, Optional[str]]:
+    """
+    Translate query string arguments into SQL criteria for the projects list
+
+    Supported: category, active, stale_hours, has_unread, update_type, q.
+    Returns (criteria, error).
+    """
+    criteria = []
+
+    if args.get('category'):
+        criteria.append(Project.category == args['category'])
+
+    if 'active' in args:
+        active = _parse_bool(args['active'])
+        if active is None:
+            return [], 'active must be true or false'
+        criteria.append(Project.active == active)
+
+    if 'stale_hours' in args:
+        try:
+            hours = float(args['stale_hours'])
+        except ValueError:
+            hours = None
+        # Rejects inf/nan and values timedelta cannot hold
+        if hours is None or not 0 <= hours <= MAX_STALE_HOURS:
+            return [], f'stale_hours must be a number between 0 and {MAX_STALE_HOURS}'
+        threshold = datetime.utcnow() - timedelta(hours=hours)
+        criteria.append(or_(Project.last_checked.is_(None), Project.last_checked < threshold))
+
+    if 'has_unread' in args:
+        has_unread = _parse_bool(args['has_unread'])
+        if has_unread is None:
+            return [], 'has_unread must be true or false'
+        unread = exists().where(and_(Update.project_id == Project.id, Update.notified == False))
+        criteria.append(unread if has_unread else ~unread)
+
+    if args.get('update_type'):
+        if args['update_type'] not in UPDATE_TYPES:
+            return [], f'update_type must be one of: {", ".join(UPDATE_TYPES)}'
+        criteria.append(exists().where(and_(
+            Update.project_id == Project.id, Update.update_type == args['update_type']
+        )))
+
+    if args.get('q'):
+        criterion = _fulltext_criterion(args['q'])
+        if criterion is not None:
+            criteria.append(criterion)
+
+    return criteria, None
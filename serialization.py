@@ -0,0 +1,150 @@
+# MIT License
+
+"""
+Serialization layer for API responses
+Column-projected row queries, sparse fieldsets and a fast JSON provider
+"""
+
+import logging
+import math
+from datetime import date, datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import func, select
+
+from models import db, Project, Version, Update
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+def _project_count(model):
+    """Correlated count of child rows for the project in the current row"""
+    return select(func.count(model.id)).where(model.project_id == Project.id).correlate(Project).scalar_subquery()
+
+
+# Field name -> SQL expression; order matches Project.to_dict()
+PROJECT_FIELDS = {
+    'id': lambda: Project.id,
+    'name': lambda: Project.name,
+    'description': lambda: Project.description,
+    'github_repo': lambda: Project.github_repo,
+    'pypi_package': lambda: Project.pypi_package,
+    'category': lambda: Project.category,
+    'current_version': lambda: Project.current_version,
+    'latest_version': lambda: Project.latest_version,
+    'latest_release_date': lambda: Project.latest_release_date,
+    'active': lambda: Project.active,
+    'notify_on_update': lambda: Project.notify_on_update,
+    'priority': lambda: Project.priority,
+    'created_at': lambda: Project.created_at,
+    'updated_at': lambda: Project.updated_at,
+    'last_checked': lambda: Project.last_checked,
+    'version_count': lambda: _project_count(Version),
+    'update_count': lambda: _project_count(Update),
+}
+
+# Field name -> SQL expression; order matches Update.to_dict()
+UPDATE_FIELDS = {
+    'id': lambda: Update.id,
+    'project_id': lambda: Update.project_id,
+    'old_version': lambda: Update.old_version,
+    'new_version': lambda: Update.new_version,
+    'description': lambda: Update.description,
+    'update_type': lambda: Update.update_type,
+    'detected_at': lambda: Update.detected_at,
+    'release_date': lambda: Update.release_date,
+    'notified': lambda: Update.notified,
+    'notified_at': lambda: Update.notified_at,
+}
+
+
+def parse_fields(raw: Optional[str], available: Dict) -> Tuple[List[str], Optional[str]]:
+    """
+    Parse a ?fields= value against the available field names
+
+    Returns (fields, error); all fields are selected when raw is empty.
+    """
+    if not raw:
+        return list(available), None
+
+    fields = [field.strip() for field in raw.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in available]
+    if unknown:
+        return [], f'Unknown fields: {", ".join(unknown)}'
+    # Keep the canonical order and drop duplicates
+    return [field for field in available if field in fields], None
+
+
+def _serialize_value(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def paginate_rows(available: Dict, fields: Sequence[str], criteria: Sequence, order_by: Sequence,
+                  count_column, page: int, per_page: int) -> Optional[Dict]:
+    """
+    Select only the requested columns for one page and return plain dicts
+
+    Returns None when the page is out of range (mirrors paginate(error_out=True)).
+    """
+    if page < 1:
+        return None
+
+    columns = [available[field]().label(field) for field in fields]
+    query = db.session.query(*columns)
+    count_query = db.session.query(func.count(count_column))
+    if criteria:
+        query = query.filter(*criteria)
+        count_query = count_query.filter(*criteria)
+
+    rows = query.order_by(*order_by).offset((page - 1) * per_page).limit(per_page).all()
+    if not rows and page > 1:
+        return None
+
+    total = count_query.scalar()
+    items = [
+        {field: _serialize_value(value) for field, value in zip(fields, row)}
+        for row in rows
+    ]
+    return {
+        'items': items,
+        'total': total,
+        'pages': int(math.ceil(total / per_page)) if per_page else 0
+    }
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider using orjson when available, with compact output by default"""
+
+    compact = True
+    sort_keys = False
+
+    def dumps(self, obj, **kwargs) -> str:
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+            if kwargs.get('indent'):
+                option |= orjson.OPT_INDENT_2
+            if kwargs.get('sort_keys', self.sort_keys):
+                option |= orjson.OPT_SORT_KEYS
+            try:
+                return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+            except TypeError:
+                # e.g. integers beyond 64 bits; the stdlib encoder handles those
+                pass
+        return super().dumps(obj, **kwargs)
+
+
+def init_json(app) -> None:
+    """Install the fast JSON provider honouring the app's JSON settings"""
+    app.json = FastJSONProvider(app)
+    app.json.compact = not app.config.get('JSONIFY_PRETTYPRINT_REGULAR', False)
+    app.json.sort_keys = app.config.get('JSON_SORT_KEYS', False)
+    if orjson is None:
+        logger.info('orjson is not installed, using the standard json encoder')
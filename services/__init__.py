@@ -1,3 +1,3 @@
 # MIT License
 
-__all__ = ['GitHubService', 'PyPIService', 'VersionChecker', 'NotificationService']
+__all__ = ['GitHubService', 'PyPIService', 'PyPIMirror', 'VersionChecker', 'NotificationService', 'EventBroker', 'OutboxDispatcher']
@@ -0,0 +1,279 @@
+# MIT License
+
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ERROR_MAX_LENGTH = 500
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return round(ordered[index], 2)
+
+
+def _round(value) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+class CheckRunRecorder:
+    """Buffers one check_runs row per project check and writes them in batches"""
+
+    def __init__(self, sweep_id: Optional[str] = None, trigger: str = 'single',
+                 batch_size: int = 200, enabled: bool = True):
+        self.sweep_id = sweep_id
+        self.trigger = trigger
+        self.batch_size = batch_size
+        self.enabled = enabled
+        self._rows = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config, sweep_id: Optional[str] = None, trigger: str = 'single') -> 'CheckRunRecorder':
+        """Build a recorder from application config"""
+        return cls(
+            sweep_id=sweep_id,
+            trigger=trigger,
+            batch_size=config.get('CHECK_RUNS_BATCH_SIZE', 200),
+            enabled=config.get('CHECK_RUNS_ENABLED', True)
+        )
+
+    def add(self, project_id: int, status: str, changed: bool = False, trace=None,
+            db_ms: Optional[float] = None, total_ms: Optional[float] = None,
+            error: Optional[str] = None, started_at: Optional[datetime] = None) -> None:
+        """Buffer a row; flushes when the batch is full"""
+        if not self.enabled:
+            return
+        row = {
+            'sweep_id': self.sweep_id,
+            'project_id': project_id,
+            'trigger': self.trigger,
+            'status': status,
+            'changed': changed,
+            'source': getattr(trace, 'source', None),
+            'http_status': getattr(trace, 'http_status', None),
+            'upstream_calls': getattr(trace, 'calls', 0),
+            'upstream_ms': _round(getattr(trace, 'upstream_ms', None)),
+            'bytes': getattr(trace, 'bytes', None),
+            'db_ms': _round(db_ms),
+            'total_ms': _round(total_ms),
+            'error': error[:ERROR_MAX_LENGTH] if error else None,
+            'started_at': started_at or datetime.utcnow()
+        }
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= self.batch_size
+        if full:
+            self.flush()
+
+    def flush(self) -> int:
+        """Insert buffered rows; returns the number written"""
+        from models import db, CheckRun
+
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return 0
+        try:
+            db.session.execute(db.insert(CheckRun), rows)
+            db.session.commit()
+            return len(rows)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f'Error writing {len(rows)} check runs: {e}')
+            return 0
+
+
+def purge_check_runs(retention_days: int = 14) -> int:
+    """Delete check runs older than the retention window"""
+    from models import db, CheckRun
+
+    try:
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        deleted = CheckRun.query.filter(CheckRun.started_at < cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Error in purge_check_runs: {e}')
+        return 0
+
+
+def _phase_totals(query) -> Dict:
+    """Summed time per phase for the rows matched by query"""
+    from models import db, CheckRun
+
+    row = query.with_entities(
+        db.func.count(CheckRun.id),
+        db.func.sum(CheckRun.upstream_ms),
+        db.func.sum(CheckRun.db_ms),
+        db.func.sum(CheckRun.total_ms),
+        db.func.sum(CheckRun.upstream_calls),
+        db.func.sum(CheckRun.bytes),
+        db.func.min(CheckRun.started_at),
+        db.func.max(CheckRun.started_at)
+    ).one()
+    count, upstream_ms, db_ms, total_ms, calls, size, first, last = row
+    upstream_ms, db_ms, total_ms = upstream_ms or 0.0, db_ms or 0.0, total_ms or 0.0
+    return {
+        'checks': count,
+        'upstream_calls': calls or 0,
+        'bytes': size or 0,
+        'started_at': first.isoformat() if first else None,
+        'finished_at': last.isoformat() if last else None,
+        'time_ms': {
+            'upstream': round(upstream_ms, 2),
+            'db': round(db_ms, 2),
+            'other': round(max(total_ms - upstream_ms - db_ms, 0.0), 2),
+            'total': round(total_ms, 2)
+        }
+    }
+
+
+def _status_counts(query) -> Dict[str, int]:
+    from models import db, CheckRun
+
+    rows = query.with_entities(CheckRun.status, db.func.count(CheckRun.id)).group_by(CheckRun.status).all()
+    return {status: count for status, count in rows}
+
+
+def _error_hotspots(query, limit: int) -> List[Dict]:
+    """Failed checks grouped by source, HTTP status and message
+
+    Upstream clients log and swallow HTTP errors, so checks answered with a
+    4xx/5xx count as failures even when their status is 'no_release'.
+    """
+    from models import db, CheckRun
+
+    failed = db.or_(CheckRun.status.in_(('error', 'timeout')), CheckRun.http_status >= 400)
+    rows = query.filter(failed).with_entities(
+        CheckRun.source, CheckRun.http_status, CheckRun.status, CheckRun.error,
+        db.func.count(CheckRun.id).label('count')
+    ).group_by(
+        CheckRun.source, CheckRun.http_status, CheckRun.status, CheckRun.error
+    ).order_by(db.desc('count')).limit(limit).all()
+    return [
+        {'source': source, 'http_status': http_status, 'status': status, 'error': error, 'count': count}
+        for source, http_status, status, error, count in rows
+    ]
+
+
+def _slowest(query, limit: int) -> List[Dict]:
+    from models import CheckRun, Project
+
+    rows = query.join(Project, Project.id == CheckRun.project_id).with_entities(
+        CheckRun, Project.name
+    ).order_by(CheckRun.total_ms.desc()).limit(limit).all()
+    return [dict(run.to_dict(), project_name=name) for run, name in rows]
+
+
+def list_sweeps(limit: int = 20) -> List[Dict]:
+    """Most recent sweeps with check counts and durations"""
+    from models import db, CheckRun
+
+    failed = db.func.sum(db.case((CheckRun.status.in_(('error', 'timeout')), 1), else_=0))
+    changed = db.func.sum(db.case((CheckRun.changed.is_(True), 1), else_=0))
+    rows = db.session.query(
+        CheckRun.sweep_id,
+        db.func.min(CheckRun.trigger),
+        db.func.count(CheckRun.id),
+        changed,
+        failed,
+        db.func.sum(CheckRun.total_ms),
+        db.func.min(CheckRun.started_at),
+        db.func.max(CheckRun.started_at)
+    ).filter(CheckRun.sweep_id.isnot(None)).group_by(CheckRun.sweep_id).order_by(
+        db.func.min(CheckRun.started_at).desc()
+    ).limit(limit).all()
+    return [
+        {
+            'sweep_id': sweep_id,
+            'trigger': trigger,
+            'checks': count,
+            'updated': updated or 0,
+            'errors': errors or 0,
+            'total_ms': round(total_ms or 0.0, 2),
+            'started_at': first.isoformat() if first else None,
+            'finished_at': last.isoformat() if last else None
+        }
+        for sweep_id, trigger, count, updated, errors, total_ms, first, last in rows
+    ]
+
+
+def sweep_report(sweep_id: str, limit: int = 10) -> Optional[Dict]:
+    """Phase split, status counts, slowest projects and error hotspots of one sweep"""
+    from models import CheckRun
+
+    query = CheckRun.query.filter(CheckRun.sweep_id == sweep_id)
+    totals = _phase_totals(query)
+    if not totals['checks']:
+        return None
+    trigger = query.with_entities(CheckRun.trigger).limit(1).scalar()
+    return dict(
+        totals,
+        sweep_id=sweep_id,
+        trigger=trigger,
+        statuses=_status_counts(query),
+        slowest=_slowest(query, limit),
+        error_hotspots=_error_hotspots(query, limit)
+    )
+
+
+def window_summary(hours: int = 24, limit: int = 10) -> Dict:
+    """Aggregate of all checks in the last N hours"""
+    from models import CheckRun
+
+    since = datetime.utcnow() - timedelta(hours=hours)
+    query = CheckRun.query.filter(CheckRun.started_at >= since)
+    totals = _phase_totals(query)
+    return dict(
+        totals,
+        hours=hours,
+        statuses=_status_counts(query),
+        by_source=_source_counts(query),
+        slowest=_slowest(query, limit),
+        error_hotspots=_error_hotspots(query, limit)
+    )
+
+
+def _source_counts(query) -> Dict:
+    from models import db, CheckRun
+
+    rows = query.with_entities(
+        CheckRun.source, db.func.count(CheckRun.id), db.func.avg(CheckRun.upstream_ms)
+    ).group_by(CheckRun.source).all()
+    return {
+        source or 'none': {'checks': count, 'avg_upstream_ms': _round(avg)}
+        for source, count, avg in rows
+    }
+
+
+def project_report(project_id: int, limit: int = 20) -> Dict:
+    """Latency and error rate of one project's checks plus its most recent runs"""
+    from models import CheckRun
+
+    query = CheckRun.query.filter(CheckRun.project_id == project_id)
+    runs = query.order_by(CheckRun.started_at.desc()).limit(limit).all()
+    durations = [total for (total,) in query.with_entities(CheckRun.total_ms).all() if total is not None]
+    statuses = _status_counts(query)
+    checks = sum(statuses.values())
+    failed = statuses.get('error', 0) + statuses.get('timeout', 0)
+    return {
+        'project_id': project_id,
+        'checks': checks,
+        'statuses': statuses,
+        'error_rate': round(failed / checks, 4) if checks else 0.0,
+        'total_ms': {
+            'avg': round(sum(durations) / len(durations), 2) if durations else None,
+            'p50': _percentile(durations, 0.50),
+            'p95': _percentile(durations, 0.95),
+            'max': _round(max(durations)) if durations else None
+        },
+        'recent': [run.to_dict() for run in runs]
+    }
@@ -0,0 +1,84 @@
+# MIT License
+
+import threading
+import time
+from typing import Optional
+
+_local = threading.local()
+
+
+class CheckTrace:
+    """Upstream facts collected while one project is being checked"""
+
+    __slots__ = ('source', 'http_status', 'upstream_ms', 'bytes', 'calls', 'fetch_ms', 'exception')
+
+    def __init__(self):
+        self.source = None
+        self.http_status = None
+        self.upstream_ms = 0.0
+        self.bytes = 0
+        self.calls = 0
+        self.fetch_ms = 0.0
+        self.exception = None
+
+    def shared(self) -> 'CheckTrace':
+        """Copy for another project served by the same fetch; upstream cost is counted once"""
+        copy = CheckTrace()
+        copy.source = self.source
+        copy.http_status = self.http_status
+        copy.exception = self.exception
+        return copy
+
+
+def begin() -> CheckTrace:
+    """Start collecting a trace on the current thread"""
+    trace = CheckTrace()
+    _local.trace = trace
+    return trace
+
+
+def end() -> None:
+    """Stop collecting on the current thread"""
+    _local.trace = None
+
+
+def current() -> Optional[CheckTrace]:
+    return getattr(_local, 'trace', None)
+
+
+def record_upstream(status: Optional[int], seconds: float, size: int) -> None:
+    """Add one upstream call to the current trace, if any"""
+    trace = getattr(_local, 'trace', None)
+    if trace is None:
+        return
+    trace.calls += 1
+    trace.upstream_ms += seconds * 1000
+    trace.bytes += size
+    trace.http_status = status
+
+
+def set_source(source: str) -> None:
+    """Note which upstream produced the release"""
+    trace = getattr(_local, 'trace', None)
+    if trace is not None:
+        trace.source = source
+
+
+def traced(func, *args, **kwargs):
+    """
+    Call func with a trace active; returns (result, trace)
+
+    Exceptions are stored on trace.exception instead of propagating so the
+    caller can still record what the upstream calls cost.
+    """
+    trace = begin()
+    started = time.perf_counter()
+    result = None
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        trace.exception = e
+    finally:
+        trace.fetch_ms = (time.perf_counter() - started) * 1000
+        end()
+    return result, trace
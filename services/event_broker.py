@@ -0,0 +1,99 @@
+# MIT License
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+class EventBroker:
+    """In-process pub/sub fan-out for server-sent events"""
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._last_event_id = 0
+        self._watcher = None
+
+    def subscribe(self, limit: Optional[int] = None) -> Optional[queue.Queue]:
+        """Register a new subscriber and return its event queue, or None when limit subscribers are connected"""
+        subscription = queue.Queue(maxsize=self.max_queue_size)
+        with self._lock:
+            if limit is not None and len(self._subscribers) >= limit:
+                return None
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: queue.Queue) -> None:
+        """Remove a subscriber"""
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, event_id: int, event_type: str, data: Dict) -> None:
+        """Deliver an event to every subscriber without blocking the publisher"""
+        event = {'id': event_id, 'event': event_type, 'data': data}
+        with self._lock:
+            self._last_event_id = max(self._last_event_id, event_id)
+            subscribers = list(self._subscribers)
+
+        for subscription in subscribers:
+            try:
+                subscription.put_nowait(event)
+            except queue.Full:
+                # Slow consumer: it will catch up from the database on its next wake-up
+                logger.warning('Event subscriber queue is full, dropping event')
+
+    def subscriber_count(self) -> int:
+        """Get number of connected subscribers"""
+        with self._lock:
+            return len(self._subscribers)
+
+    def watch(self, load: Callable[[int], List[Dict]], interval: float, since: int) -> None:
+        """
+        Poll for events published by other processes while anyone is subscribed
+
+        One thread per process calls load(last_event_id) every interval seconds
+        and publishes what it returns, so streams never query the database on
+        their own. The thread exits once the last subscriber is gone.
+        """
+        with self._lock:
+            self._last_event_id = max(self._last_event_id, since)
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._watcher = threading.Thread(
+                target=self._watch, args=(load, interval), name='event-broker-watch', daemon=True
+            )
+            self._watcher.start()
+
+    def _watch(self, load: Callable[[int], List[Dict]], interval: float) -> None:
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if not self._subscribers:
+                    self._watcher = None
+                    return
+                cursor = self._last_event_id
+            try:
+                events = load(cursor)
+            except Exception as e:
+                logger.error(f'Error polling for events: {e}')
+                continue
+            for data in events:
+                if data['id'] > self._last_event_id:
+                    self.publish(data['id'], 'update', data)
+
+    @staticmethod
+    def format_event(event_id: Optional[int], event_type: str, data: str) -> str:
+        """Format an event in text/event-stream wire format"""
+        lines = []
+        if event_id is not None:
+            lines.append(f'id: {event_id}')
+        lines.append(f'event: {event_type}')
+        lines.extend(f'data: {line}' for line in data.splitlines() or [''])
+        return '\n'.join(lines) + '\n\n'
+
+# Global event broker instance
+event_broker = EventBroker()
@@ -1,9 +1,12 @@
 # MIT License
 
+import time
 import requests
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import logging
+from metrics import record_upstream_request
+from services import check_trace
 
 logger = logging.getLogger(__name__)
 
@@ -25,11 +28,28 @@ class GitHubService:
             headers['Authorization'] = f'token {self.token}'
         return headers
     
+    def _get(self, endpoint: str, url: str) -> requests.Response:
+        """GET a GitHub API URL, recording latency and status per endpoint"""
+        started = time.perf_counter()
+        response = None
+        try:
+            response = requests.get(url, headers=self.headers, timeout=10)
+            return response
+        finally:
+            elapsed = time.perf_counter() - started
+            status = str(response.status_code) if response is not None else 'error'
+            record_upstream_request(self.base_url, endpoint, status, elapsed)
+            check_trace.record_upstream(
+                response.status_code if response is not None else None,
+                elapsed,
+                len(response.content) if response is not None else 0
+            )
+    
     def get_releases(self, owner: str, repo: str) -> List[Dict]:
         """Get all releases for a GitHub repository"""
         try:
             url = f'{self.base_url}/repos/{owner}/{repo}/releases'
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get('releases', url)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -40,7 +60,7 @@ class GitHubService:
         """Get the latest release for a repository"""
         try:
             url = f'{self.base_url}/repos/{owner}/{repo}/releases/latest'
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get('releases/latest', url)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -51,7 +71,7 @@ class GitHubService:
         """Get all tags for a repository"""
         try:
             url = f'{self.base_url}/repos/{owner}/{repo}/tags'
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self._get('tags', url)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -0,0 +1,245 @@
+# MIT License
+
+import json
+import logging
+import os
+import socket
+import threading
+import uuid
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import requests
+from metrics import record_upstream_request
+
+logger = logging.getLogger(__name__)
+
+# Shared by every dispatcher in the process; rows are additionally claimed in
+# the database so runs in other processes never pick up the same entries
+_dispatch_lock = threading.Lock()
+
+class OutboxDispatcher:
+    """Drains the notification outbox to webhook targets in digest batches"""
+
+    def __init__(self, batch_size: int = 100, digest_window: int = 60, max_attempts: int = 5,
+                 retry_base_delay: int = 30, per_target_concurrency: int = 2, max_workers: int = 8,
+                 timeout: int = 10, retention_days: int = 7, claim_lease: int = 300):
+        self.batch_size = batch_size
+        self.digest_window = digest_window
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
+        self.per_target_concurrency = per_target_concurrency
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retention_days = retention_days
+        self.claim_lease = claim_lease
+
+    @classmethod
+    def from_config(cls, config) -> 'OutboxDispatcher':
+        """Build a dispatcher from application config"""
+        return cls(
+            batch_size=config.get('NOTIFICATION_BATCH_SIZE', 100),
+            digest_window=config.get('NOTIFICATION_DIGEST_WINDOW', 60),
+            max_attempts=config.get('NOTIFICATION_MAX_ATTEMPTS', 5),
+            retry_base_delay=config.get('NOTIFICATION_RETRY_BASE_DELAY', 30),
+            per_target_concurrency=config.get('NOTIFICATION_TARGET_CONCURRENCY', 2),
+            max_workers=config.get('NOTIFICATION_DELIVERY_WORKERS', 8),
+            timeout=config.get('NOTIFICATION_TIMEOUT', 10),
+            retention_days=config.get('NOTIFICATION_OUTBOX_RETENTION_DAYS', 7),
+            claim_lease=config.get('NOTIFICATION_CLAIM_LEASE', 300)
+        )
+
+    @staticmethod
+    def _due(now: datetime):
+        """Pending entries that are due, and claims whose lease ran out"""
+        from models import db, NotificationOutbox
+
+        return db.or_(
+            db.and_(NotificationOutbox.status == 'pending', NotificationOutbox.next_attempt_at <= now),
+            db.and_(NotificationOutbox.status == 'sending', NotificationOutbox.claimed_until < now)
+        )
+
+    def _collect_batches(self, now: datetime) -> List[Dict]:
+        """Group due outbox rows into one digest message per target and chunk"""
+        from models import NotificationOutbox
+
+        rows = NotificationOutbox.query.filter(self._due(now)).order_by(
+            NotificationOutbox.id
+        ).limit(self.batch_size * self.max_workers).all()
+
+        by_target = {}
+        for row in rows:
+            by_target.setdefault(row.target, []).append(row)
+
+        window_start = now - timedelta(seconds=self.digest_window)
+        batches = []
+        for target, target_rows in by_target.items():
+            # Hold a target's digest until its oldest entry has waited a full
+            # window, unless a full batch is already waiting
+            oldest = min(row.created_at or now for row in target_rows)
+            if oldest > window_start and len(target_rows) < self.batch_size:
+                continue
+
+            for start in range(0, len(target_rows), self.batch_size):
+                chunk = target_rows[start:start + self.batch_size]
+                batches.append({
+                    'target': target,
+                    'entries': [(row.id, json.loads(row.payload)) for row in chunk]
+                })
+        return batches
+
+    def _claim(self, batches: List[Dict], now: datetime, claimed_by: str) -> List[Dict]:
+        """
+        Take ownership of the collected rows for the lease
+
+        Rows another run claimed in the meantime are dropped from their batch,
+        so every entry is sent by exactly one run.
+        """
+        from models import db, NotificationOutbox
+
+        ids = [entry_id for batch in batches for entry_id, _ in batch['entries']]
+        db.session.execute(
+            db.update(NotificationOutbox).where(NotificationOutbox.id.in_(ids), self._due(now)).values(
+                status='sending', claimed_by=claimed_by,
+                claimed_until=now + timedelta(seconds=self.claim_lease)
+            ).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        owned = {
+            entry_id for (entry_id,) in db.session.query(NotificationOutbox.id).filter(
+                NotificationOutbox.id.in_(ids), NotificationOutbox.claimed_by == claimed_by
+            )
+        }
+
+        claimed = []
+        for batch in batches:
+            entries = [(entry_id, update) for entry_id, update in batch['entries'] if entry_id in owned]
+            if not entries:
+                continue
+            claimed.append({
+                'target': batch['target'],
+                'ids': [entry_id for entry_id, _ in entries],
+                'message': {
+                    'type': 'version_updates',
+                    'delivery_ids': [entry_id for entry_id, _ in entries],
+                    'count': len(entries),
+                    'updates': [update for _, update in entries]
+                }
+            })
+        return claimed
+
+    def _send(self, semaphore: threading.Semaphore, batch: Dict) -> Optional[str]:
+        """POST one digest; returns an error message or None on success"""
+        with semaphore:
+            started = time.perf_counter()
+            status = 'error'
+            try:
+                response = requests.post(
+                    batch['target'],
+                    json=batch['message'],
+                    headers={'User-Agent': 'VersionTracker/1.0'},
+                    timeout=self.timeout
+                )
+                status = str(response.status_code)
+                response.raise_for_status()
+                return None
+            except requests.exceptions.RequestException as e:
+                return str(e)
+            finally:
+                record_upstream_request(batch['target'], 'webhook', status, time.perf_counter() - started)
+
+    def dispatch(self) -> Dict:
+        """Deliver due notifications once (requires an application context)"""
+        from models import db, NotificationOutbox
+
+        if not _dispatch_lock.acquire(blocking=False):
+            return {'skipped': True}
+
+        claimed_by = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        try:
+            now = datetime.utcnow()
+            batches = self._collect_batches(now)
+            if batches:
+                # Committing the claim also releases the read transaction
+                # while HTTP requests are in flight
+                batches = self._claim(batches, now, claimed_by)
+            db.session.commit()
+            if not batches:
+                return {'sent': 0, 'failed': 0, 'messages': 0}
+
+            semaphores = {
+                batch['target']: threading.Semaphore(self.per_target_concurrency) for batch in batches
+            }
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                errors = list(executor.map(
+                    lambda batch: self._send(semaphores[batch['target']], batch), batches
+                ))
+
+            stats = {'sent': 0, 'failed': 0, 'messages': len(batches)}
+            finished = datetime.utcnow()
+            for batch, error in zip(batches, errors):
+                # A run that outlived its lease leaves the rows to their new owner
+                rows = NotificationOutbox.query.filter(
+                    NotificationOutbox.id.in_(batch['ids']), NotificationOutbox.claimed_by == claimed_by
+                ).all()
+                for row in rows:
+                    row.attempts += 1
+                    row.claimed_by = None
+                    row.claimed_until = None
+                    if error is None:
+                        row.status = 'sent'
+                        row.sent_at = finished
+                        row.last_error = None
+                        stats['sent'] += 1
+                        continue
+
+                    row.last_error = error
+                    stats['failed'] += 1
+                    if row.attempts >= self.max_attempts:
+                        row.status = 'failed'
+                    else:
+                        row.status = 'pending'
+                        delay = self.retry_base_delay * 2 ** (row.attempts - 1)
+                        row.next_attempt_at = finished + timedelta(seconds=delay)
+
+                if error:
+                    logger.warning(f'Webhook delivery to {batch["target"]} failed: {error}')
+
+            db.session.commit()
+            logger.info(f'Delivered {stats["sent"]} notification(s) in {stats["messages"]} message(s), '
+                        f'{stats["failed"]} failed')
+            return stats
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f'Error in dispatch: {e}')
+            return {'error': str(e)}
+        finally:
+            _dispatch_lock.release()
+
+    def purge(self) -> int:
+        """Delete delivered entries older than the retention window"""
+        from models import db, NotificationOutbox
+
+        try:
+            cutoff = datetime.utcnow() - timedelta(days=self.retention_days)
+            deleted = NotificationOutbox.query.filter(
+                NotificationOutbox.status == 'sent',
+                NotificationOutbox.sent_at < cutoff
+            ).delete(synchronize_session=False)
+            db.session.commit()
+            return deleted
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f'Error in purge: {e}')
+            return 0
+
+    @staticmethod
+    def backlog() -> Dict[str, int]:
+        """Count outbox entries by status"""
+        from models import db, NotificationOutbox
+
+        rows = db.session.query(
+            NotificationOutbox.status, db.func.count(NotificationOutbox.id)
+        ).group_by(NotificationOutbox.status).all()
+        return {status: count for status, count in rows}
@@ -1,57 +1,130 @@
 # MIT License
 
+import json
 import logging
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
+from sqlalchemy.exc import IntegrityError
 
 logger = logging.getLogger(__name__)
 
 class NotificationService:
     """Service for handling notifications about version updates"""
     
-    def notify_update(self, project_name: str, old_version: str, new_version: str) -> Dict:
-        """Create a notification about a version update"""
+    def notify_update(self, project, update, targets: Optional[List[str]] = None) -> List:
+        """
+        Queue webhook deliveries for an update in the caller's transaction
+        
+        Outbox rows are committed together with the Update row and delivered
+        later by the OutboxDispatcher, so the caller never waits on webhooks.
+        """
         # Import here to avoid circular imports
-        from models import db, Update, Project
+        from flask import current_app
+        from models import db, NotificationOutbox
         
         try:
-            project = Project.query.filter_by(name=project_name).first()
-            if not project:
-                logger.warning(f'Project not found: {project_name}')
-                return {}
+            if targets is None:
+                targets = current_app.config.get('NOTIFICATION_WEBHOOKS', [])
+            if not project.notify_on_update or not targets:
+                logger.info(f'Notification created: {project.name} updated from {update.old_version} to {update.new_version}')
+                return []
             
-            logger.info(f'Notification created: {project_name} updated from {old_version} to {new_version}')
-            return {
-                'project': project_name,
-                'old_version': old_version,
-                'new_version': new_version,
-                'timestamp': datetime.utcnow()
+            payload = json.dumps({
+                'project_id': project.id,
+                'project': project.name,
+                'old_version': update.old_version,
+                'new_version': update.new_version,
+                'update_type': update.update_type,
+                'detected_at': (update.detected_at or datetime.utcnow()).isoformat()
+            })
+            keys = {
+                target: f'{target}|{project.id}|{update.old_version}|{update.new_version}'
+                for target in targets
             }
+            existing = self._queued_keys(list(keys.values()))
+            
+            entries = []
+            for target, key in keys.items():
+                if key in existing:
+                    continue
+                entry = NotificationOutbox(
+                    project_id=project.id,
+                    target=target,
+                    payload=payload,
+                    dedupe_key=key
+                )
+                # A concurrent check may queue the same key after the lookup
+                # above; the savepoint keeps the caller's Update on conflict
+                try:
+                    with db.session.begin_nested():
+                        entry.update = update
+                        db.session.add(entry)
+                except IntegrityError:
+                    logger.info(f'Notification for {target} was already queued by another check')
+                    continue
+                entries.append(entry)
+            
+            logger.info(f'Notification queued for {len(entries)} target(s): {project.name} '
+                        f'updated from {update.old_version} to {update.new_version}')
+            return entries
         except Exception as e:
             logger.error(f'Error in notify_update: {e}')
-            return {}
+            return []
+    
+    @staticmethod
+    def _queued_keys(keys: List[str]) -> set:
+        """Dedupe keys that already have an outbox row"""
+        from models import db, NotificationOutbox
+        
+        return {
+            key for (key,) in db.session.query(NotificationOutbox.dedupe_key).filter(
+                NotificationOutbox.dedupe_key.in_(keys)
+            )
+        }
+    
+    @staticmethod
+    def to_notification(update, project_name: str) -> Dict:
+        """Convert an update row to a notification payload"""
+        return {
+            'id': update.id,
+            'project_id': update.project_id,
+            'project': project_name,
+            'old_version': update.old_version,
+            'new_version': update.new_version,
+            'update_type': update.update_type,
+            'detected_at': update.detected_at.isoformat() if update.detected_at else None
+        }
+    
+    def publish_update(self, update, project_name: str) -> None:
+        """Push a committed update to connected event stream clients"""
+        from services.event_broker import event_broker
+        
+        event_broker.publish(update.id, 'update', self.to_notification(update, project_name))
+    
+    def get_notifications_since(self, last_id: int, limit: int = 100) -> List[Dict]:
+        """Get notifications for updates created after the given update id"""
+        from models import db, Update, Project
+        
+        try:
+            rows = db.session.query(Update, Project.name).join(
+                Project, Project.id == Update.project_id
+            ).filter(Update.id > last_id).order_by(Update.id).limit(limit).all()
+            return [self.to_notification(update, name) for update, name in rows]
+        except Exception as e:
+            logger.error(f'Error in get_notifications_since: {e}')
+            return []
     
     def get_unread_notifications(self) -> List[Dict]:
         """Get all unread notifications from database"""
-        from models import Update, Project
+        from models import db, Update, Project
         
         try:
-            # Get updates that haven't been marked as read yet
-            updates = Update.query.filter_by(notified=False).all()
-            
-            notifications = []
-            for update in updates:
-                project = Project.query.get(update.project_id)
-                if project:
-                    notifications.append({
-                        'project': project.name,
-                        'old_version': update.old_version,
-                        'new_version': update.new_version,
-                        'update_type': update.update_type,
-                        'detected_at': update.detected_at.isoformat() if update.detected_at else None
-                    })
+            # Get updates that haven't been marked as read yet, with project names in one query
+            rows = db.session.query(Update, Project.name).join(
+                Project, Project.id == Update.project_id
+            ).filter(Update.notified == False).all()
             
-            return notifications
+            return [self.to_notification(update, name) for update, name in rows]
         except Exception as e:
             logger.error(f'Error in get_unread_notifications: {e}')
             return []
@@ -59,6 +132,7 @@ class NotificationService:
     def mark_as_read(self, project_name: str) -> None:
         """Mark notifications as read for a project"""
         from models import db, Update, Project
+        from cache import response_cache
         
         try:
             project = Project.query.filter_by(name=project_name).first()
@@ -69,6 +143,7 @@ class NotificationService:
                     'notified_at': datetime.utcnow()
                 })
                 db.session.commit()
+                response_cache.invalidate('updates')
                 logger.info(f'Marked notifications as read for {project_name}')
         except Exception as e:
             logger.error(f'Error in mark_as_read: {e}')
@@ -76,6 +151,7 @@ class NotificationService:
     def clear_notifications(self) -> None:
         """Clear all notifications"""
         from models import db, Update
+        from cache import response_cache
         
         try:
             Update.query.filter_by(notified=False).update({
@@ -83,6 +159,7 @@ class NotificationService:
                 'notified_at': datetime.utcnow()
             })
             db.session.commit()
+            response_cache.invalidate('updates')
             logger.info('Cleared all notifications')
         except Exception as e:
             logger.error(f'Error in clear_notifications: {e}')
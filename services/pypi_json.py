@@ -0,0 +1,255 @@
+# MIT License
+
+"""
+Streaming reader for PyPI JSON API documents
+
+`/pypi/<package>/json` for packages with thousands of releases is several
+megabytes, mostly the README in info.description and one object per
+uploaded file. parse_package_document() walks the document chunk by chunk
+and keeps only the fields the tracker uses; everything else is skipped by
+scanning, and file objects are decoded one at a time, so memory stays at
+roughly one chunk plus one file entry no matter how large the package is.
+"""
+
+import codecs
+import json
+import re
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+# info fields kept from the document
+INFO_FIELDS = ('name', 'version', 'summary', 'project_url', 'package_url', 'requires_dist')
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRING_BODY = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_STRUCTURE = re.compile(r'[^"{}\[\]]*')
+_SCALAR_END = re.compile(r'[,}\] \t\n\r]')
+
+_decoder = json.JSONDecoder()
+
+
+class JSONStreamError(ValueError):
+    """Malformed or truncated document"""
+
+
+class _Stream:
+    """Text buffer over an iterable of byte or str chunks"""
+
+    def __init__(self, chunks: Iterable[Union[bytes, str]]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buffer = ''
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Append the next non-empty chunk, dropping consumed text; False at end of input"""
+        while not self.exhausted:
+            try:
+                chunk = next(self._chunks)
+            except StopIteration:
+                self.exhausted = True
+                chunk = self._decoder.decode(b'', final=True)
+            else:
+                if isinstance(chunk, bytes):
+                    chunk = self._decoder.decode(chunk)
+            if chunk:
+                self.buffer = self.buffer[self.pos:] + chunk
+                self.pos = 0
+                return True
+        return False
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                raise JSONStreamError('Unexpected end of document')
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise JSONStreamError(f'Expected {char!r} at offset {self.pos}, found {self.buffer[self.pos]!r}')
+        self.pos += 1
+
+    def decode_value(self):
+        """Decode the next value; it must fit in memory"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise JSONStreamError(f'Invalid value at offset {self.pos}')
+            # A number may continue in the next chunk
+            if end == len(self.buffer) and not isinstance(value, (str, dict, list)) and self.fill():
+                continue
+            self.pos = end
+            return value
+
+    def _skip_string(self) -> None:
+        self.pos += 1
+        while True:
+            # Stops at the closing quote, or at the end of the buffer (possibly
+            # before a split escape); the scanned part is dropped on fill
+            self.pos = _STRING_BODY.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) and self.buffer[self.pos] == '"':
+                self.pos += 1
+                return
+            if not self.fill():
+                raise JSONStreamError('Unterminated string')
+
+    def skip_value(self) -> None:
+        """Consume the next value without building it"""
+        char = self.peek()
+        if char == '"':
+            self._skip_string()
+            return
+        if char not in '{[':
+            while True:
+                match = _SCALAR_END.search(self.buffer, self.pos)
+                if match:
+                    self.pos = match.start()
+                    return
+                if not self.fill():
+                    self.pos = len(self.buffer)
+                    return
+
+        depth = 0
+        while True:
+            self.pos = _STRUCTURE.match(self.buffer, self.pos).end()
+            if self.pos >= len(self.buffer):
+                if not self.fill():
+                    raise JSONStreamError('Unexpected end of document')
+                continue
+            char = self.buffer[self.pos]
+            if char == '"':
+                self._skip_string()
+                continue
+            self.pos += 1
+            depth += 1 if char in '{[' else -1
+            if depth == 0:
+                return
+
+    def object_keys(self) -> Iterator[str]:
+        """Yield the keys of the object at the cursor; the caller consumes each value"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            if self.peek() != '"':
+                raise JSONStreamError(f'Expected key at offset {self.pos}')
+            key = self.decode_value()
+            self.expect(':')
+            yield key
+            char = self.peek()
+            self.pos += 1
+            if char == '}':
+                return
+            if char != ',':
+                raise JSONStreamError(f'Expected , or }} at offset {self.pos - 1}')
+
+    def array_items(self) -> Iterator[None]:
+        """Yield once per element of the array at the cursor; the caller consumes each element"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield None
+            char = self.peek()
+            self.pos += 1
+            if char == ']':
+                return
+            if char != ',':
+                raise JSONStreamError(f'Expected , or ] at offset {self.pos - 1}')
+
+
+def _first_upload(stream: _Stream):
+    """[first upload time, file count] of a release's file list, ignoring yanked files"""
+    uploaded = None
+    count = 0
+    for _ in stream.array_items():
+        entry = stream.decode_value()
+        if not isinstance(entry, dict) or entry.get('yanked'):
+            continue
+        count += 1
+        upload_time = entry.get('upload_time_iso_8601')
+        if upload_time and (uploaded is None or upload_time < uploaded):
+            uploaded = upload_time
+    return [uploaded, count]
+
+
+def parse_package_document(chunks: Iterable[Union[bytes, str]]) -> Dict:
+    """
+    Read a PyPI JSON API document incrementally
+
+    Returns a compact record: name, version, summary, project_url,
+    requires_dist, upload_time of the current version and releases as
+    {version: [first upload time, file count]} for versions with files.
+    """
+    stream = _Stream(chunks)
+    info = {}
+    releases = {}
+
+    for key in stream.object_keys():
+        if key == 'info' and stream.peek() == '{':
+            for field in stream.object_keys():
+                if field in INFO_FIELDS:
+                    info[field] = stream.decode_value()
+                else:
+                    stream.skip_value()
+        elif key == 'releases' and stream.peek() == '{':
+            for version in stream.object_keys():
+                if stream.peek() != '[':
+                    stream.skip_value()
+                    continue
+                uploaded, count = _first_upload(stream)
+                if count:
+                    releases[version] = [uploaded, count]
+        else:
+            stream.skip_value()
+
+    version = info.get('version')
+    return {
+        'name': info.get('name'),
+        'version': version,
+        'summary': info.get('summary') or '',
+        'project_url': info.get('project_url') or info.get('package_url'),
+        'requires_dist': info.get('requires_dist') or [],
+        'upload_time': (releases.get(version) or [None])[0],
+        'releases': releases
+    }
+
+
+def iter_file(path: str, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    """Chunks of a file on disk"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+def document_from_record(record: Dict) -> Dict:
+    """
+    JSON API shaped 'info' and 'urls' for a compact record
+
+    'releases' stays compact ({version: [first upload time, file count]})
+    instead of being expanded into per-file lists.
+    """
+    return {
+        'info': {
+            'name': record.get('name'),
+            'version': record.get('version'),
+            'summary': record.get('summary', ''),
+            'project_url': record.get('project_url'),
+            'requires_dist': record.get('requires_dist') or None
+        },
+        # Files of the current version; only the upload time is kept
+        'urls': [{'upload_time_iso_8601': record['upload_time']}] if record.get('upload_time') else [],
+        'releases': record.get('releases', {})
+    }
@@ -0,0 +1,363 @@
+# MIT License
+
+"""
+Offline PyPI metadata mirror
+
+Ingests a directory of PyPI JSON API dumps (`<name>.json`, or bandersnatch's
+`json/<name>` and `pypi/<name>/json`) and/or a Simple-index mirror
+(`<name>/index.html` per PEP 503 or `<name>/index.json` per PEP 691) into a
+single index file keyed by normalized package name:
+
+    header   MAGIC, entry count
+    entries  (key offset, value offset, key length, value length), sorted by key
+    data     keys and JSON-encoded records
+
+Readers memory-map the file and binary-search the entry table, so a lookup
+touches a handful of pages regardless of mirror size. Ingestion is
+incremental: a manifest next to the index records each source file's size and
+mtime, only changed files are parsed, and unchanged records are copied over as
+raw bytes. The new index replaces the old one atomically.
+"""
+
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from html import unescape
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from packaging.utils import (
+    InvalidSdistFilename, InvalidWheelFilename, canonicalize_name, parse_sdist_filename, parse_wheel_filename
+)
+from packaging.version import InvalidVersion, Version
+
+from services.pypi_json import iter_file, parse_package_document
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'VTPYMIR1'
+HEADER = struct.Struct('<8sQ')
+ENTRY = struct.Struct('<QQII')
+
+# Records from richer sources win when a package appears in both
+SOURCE_PRIORITY = {'json': 2, 'simple': 1}
+
+_ANCHOR = re.compile(r'<a\s+([^>]*)>([^<]*)</a>', re.IGNORECASE)
+_YANKED = re.compile(r'data-yanked', re.IGNORECASE)
+
+
+def _version_from_filename(filename: str) -> Optional[Version]:
+    """Version of a wheel or sdist file name, or None if it cannot be parsed"""
+    try:
+        if filename.endswith('.whl'):
+            return parse_wheel_filename(filename)[1]
+        return parse_sdist_filename(filename)[1]
+    except (InvalidWheelFilename, InvalidSdistFilename, InvalidVersion):
+        return None
+
+
+def _latest(versions) -> Optional[Version]:
+    """Newest final release, or the newest pre-release if there is no final one"""
+    versions = list(versions)
+    finals = [version for version in versions if not version.is_prerelease]
+    candidates = finals or versions
+    return max(candidates) if candidates else None
+
+
+def record_from_simple(name: str, files: List[Dict]) -> Dict:
+    """Record for a Simple-index page given its file entries (filename, upload_time, yanked)"""
+    releases = {}
+    for entry in files:
+        if entry.get('yanked'):
+            continue
+        version = _version_from_filename(entry['filename'])
+        if version is None:
+            continue
+        key = str(version)
+        uploaded = entry.get('upload_time')
+        if key in releases:
+            first, count = releases[key]
+            releases[key] = [min(filter(None, (first, uploaded)), default=None), count + 1]
+        else:
+            releases[key] = [uploaded, 1]
+
+    latest = _latest(Version(key) for key in releases)
+    version = str(latest) if latest is not None else None
+    return {
+        'source': 'simple',
+        'name': name,
+        'version': version,
+        'summary': '',
+        'project_url': f'https://pypi.org/project/{name}/',
+        'requires_dist': [],
+        'upload_time': releases[version][0] if version else None,
+        'releases': releases
+    }
+
+
+def parse_simple_html(text: str) -> List[Dict]:
+    """File entries of a PEP 503 project page"""
+    files = []
+    for attributes, label in _ANCHOR.findall(text):
+        filename = unescape(label).strip()
+        if filename:
+            files.append({'filename': filename, 'upload_time': None, 'yanked': bool(_YANKED.search(attributes))})
+    return files
+
+
+def parse_simple_json(document: Dict) -> List[Dict]:
+    """File entries of a PEP 691 project page"""
+    return [
+        {
+            'filename': entry.get('filename', ''),
+            'upload_time': entry.get('upload-time'),
+            'yanked': bool(entry.get('yanked'))
+        }
+        for entry in document.get('files') or []
+    ]
+
+
+def classify_source(relative_path: str) -> Optional[str]:
+    """'json', 'simple' or None for a path relative to the mirror root"""
+    parts = relative_path.replace(os.sep, '/').split('/')
+    filename = parts[-1]
+    if filename in ('index.html', 'index.json') and len(parts) >= 2:
+        return 'simple'
+    if filename.endswith('.json') or (len(parts) >= 2 and parts[-2] == 'json') or filename == 'json':
+        return 'json'
+    return None
+
+
+def parse_source(path: str, relative_path: str) -> Tuple[Optional[str], Optional[Dict]]:
+    """(normalized name, record) for one mirror file"""
+    kind = classify_source(relative_path)
+    if kind == 'simple':
+        name = os.path.basename(os.path.dirname(path))
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.json'):
+            document = json.loads(data)
+            files = parse_simple_json(document)
+            name = document.get('name') or name
+        else:
+            files = parse_simple_html(data.decode('utf-8', errors='replace'))
+        return canonicalize_name(name), record_from_simple(name, files)
+    if kind == 'json':
+        record = dict(parse_package_document(iter_file(path)), source='json')
+        return (canonicalize_name(record['name']) if record['name'] else None), record
+    return None, None
+
+
+class MirrorIndex:
+    """Read-only view of an index file through mmap"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f'{path} is not a PyPI mirror index')
+
+    def _entry(self, position: int) -> Tuple[int, int, int, int]:
+        return ENTRY.unpack_from(self._map, HEADER.size + position * ENTRY.size)
+
+    def _key(self, position: int) -> bytes:
+        key_offset, _, key_length, _ = self._entry(position)
+        return self._map[key_offset:key_offset + key_length]
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        """Encoded record for a normalized name"""
+        target = key.encode('utf-8')
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            key_offset, value_offset, key_length, value_length = self._entry(low)
+            if self._map[key_offset:key_offset + key_length] == target:
+                return self._map[value_offset:value_offset + value_length]
+        return None
+
+    def items(self) -> Iterator[Tuple[str, bytes]]:
+        """All (key, encoded record) pairs in key order"""
+        for position in range(self.count):
+            key_offset, value_offset, key_length, value_length = self._entry(position)
+            yield (self._map[key_offset:key_offset + key_length].decode('utf-8'),
+                   self._map[value_offset:value_offset + value_length])
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def write_index(path: str, items: Dict[str, bytes]) -> None:
+    """Write key -> encoded record pairs to path atomically"""
+    keys = sorted(items)
+    encoded = [key.encode('utf-8') for key in keys]
+    offset = HEADER.size + ENTRY.size * len(keys)
+
+    entries = []
+    for key, key_bytes in zip(keys, encoded):
+        value = items[key]
+        entries.append(ENTRY.pack(offset, offset + len(key_bytes), len(key_bytes), len(value)))
+        offset += len(key_bytes) + len(value)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f'{path}.tmp-{os.getpid()}'
+    with open(temporary, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, len(keys)))
+        f.write(b''.join(entries))
+        for key, key_bytes in zip(keys, encoded):
+            f.write(key_bytes)
+            f.write(items[key])
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def _encode(record: Dict) -> bytes:
+    return json.dumps(record, separators=(',', ':')).encode('utf-8')
+
+
+def ingest(source_dir: str, index_path: str, full: bool = False) -> Dict[str, int]:
+    """
+    Build or refresh the index at index_path from the mirror in source_dir
+
+    Only files added, changed or removed since the last run are parsed unless
+    full is set. Returns counts of scanned/parsed/removed files and packages.
+    """
+    started = time.perf_counter()
+    manifest_path = f'{index_path}.manifest.json'
+    manifest = {}
+    items = {}
+    if not full and os.path.exists(index_path) and os.path.exists(manifest_path):
+        try:
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+            index = MirrorIndex(index_path)
+            items = dict(index.items())
+            index.close()
+        except (OSError, ValueError) as e:
+            logger.warning(f'Rebuilding PyPI mirror index from scratch: {e}')
+            manifest, items = {}, {}
+
+    seen = {}
+    changed = []
+    for root, _, filenames in os.walk(source_dir):
+        for filename in filenames:
+            path = os.path.join(root, filename)
+            relative_path = os.path.relpath(path, source_dir)
+            if classify_source(relative_path) is None:
+                continue
+            stat = os.stat(path)
+            previous = manifest.get(relative_path)
+            if previous and previous[0] == stat.st_size and previous[1] == stat.st_mtime_ns:
+                seen[relative_path] = previous
+            else:
+                changed.append((path, relative_path, stat))
+
+    # Names whose record has to be rebuilt from their remaining sources
+    touched = {manifest[path][2] for path in manifest if path not in seen and manifest[path][2]}
+    parsed = {}
+    for path, relative_path, stat in changed:
+        try:
+            name, record = parse_source(path, relative_path)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f'Skipping unreadable mirror file {relative_path}: {e}')
+            name, record = None, None
+        seen[relative_path] = [stat.st_size, stat.st_mtime_ns, name]
+        if name:
+            touched.add(name)
+            parsed[relative_path] = record
+
+    sources_by_name = {}
+    for relative_path, (_, _, name) in seen.items():
+        if name in touched:
+            sources_by_name.setdefault(name, []).append(relative_path)
+
+    for name in touched:
+        best = None
+        for relative_path in sources_by_name.get(name, []):
+            record = parsed.get(relative_path)
+            if record is None:
+                try:
+                    _, record = parse_source(os.path.join(source_dir, relative_path), relative_path)
+                except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                    record = None
+            if record and (best is None or SOURCE_PRIORITY[record['source']] > SOURCE_PRIORITY[best['source']]):
+                best = record
+        if best is None:
+            items.pop(name, None)
+        else:
+            items[name] = _encode(best)
+
+    removed = len(manifest) - sum(1 for path in manifest if path in seen)
+    if changed or removed or not os.path.exists(index_path):
+        write_index(index_path, items)
+        temporary = f'{manifest_path}.tmp-{os.getpid()}'
+        with open(temporary, 'w') as f:
+            json.dump(seen, f, separators=(',', ':'))
+        os.replace(temporary, manifest_path)
+
+    result = {
+        'files': len(seen),
+        'parsed': len(changed),
+        'removed': removed,
+        'packages': len(items),
+        'seconds': round(time.perf_counter() - started, 3)
+    }
+    logger.info(f'PyPI mirror index {index_path}: {result}')
+    return result
+
+
+class PyPIMirror:
+    """Looks up package records in an ingested index, reopening it after re-ingestion"""
+
+    def __init__(self, index_path: str, reload_interval: float = 1.0):
+        self.index_path = index_path
+        self.reload_interval = reload_interval
+        self._index = None
+        self._identity = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def _current(self) -> Optional[MirrorIndex]:
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < self.reload_interval:
+            return self._index
+        with self._lock:
+            self._checked_at = now
+            try:
+                stat = os.stat(self.index_path)
+            except OSError:
+                return self._index
+            identity = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if identity != self._identity:
+                try:
+                    # Lookups still holding the old map keep it alive until they finish
+                    self._index = MirrorIndex(self.index_path)
+                    self._identity = identity
+                except (OSError, ValueError) as e:
+                    logger.error(f'Error opening PyPI mirror index {self.index_path}: {e}')
+            return self._index
+
+    def lookup(self, package_name: str) -> Optional[Dict]:
+        """Record for a package, or None if the mirror does not have it"""
+        index = self._current()
+        if index is None:
+            return None
+        raw = index.get_raw(canonicalize_name(package_name))
+        return json.loads(raw) if raw is not None else None
+
+    def __len__(self) -> int:
+        index = self._current()
+        return index.count if index is not None else 0
@@ -1,28 +1,86 @@
 # MIT License
 
+import time
 import requests
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Optional
 import logging
+from metrics import record_upstream_request
+from services import check_trace
+from services.pypi_json import JSONStreamError, document_from_record, parse_package_document
 
 logger = logging.getLogger(__name__)
 
+def _parse_upload_time(value: Optional[str]) -> Optional[datetime]:
+    """Naive UTC datetime of an upload_time_iso_8601 value"""
+    if not value:
+        return None
+    try:
+        uploaded = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if uploaded.tzinfo is not None:
+        uploaded = uploaded.astimezone(timezone.utc).replace(tzinfo=None)
+    return uploaded
+
 class PyPIService:
     """Service for PyPI API interactions"""
     
-    def __init__(self, base_url: str = 'https://pypi.org/pypi'):
+    def __init__(self, base_url: str = 'https://pypi.org/pypi', mirror=None, mirror_fallback: bool = False):
         self.base_url = base_url
+        # Optional PyPIMirror; packages it lacks go to base_url only with mirror_fallback
+        self.mirror = mirror
+        self.mirror_fallback = mirror_fallback
+        self.chunk_size = 64 * 1024
+    
+    def _get_streamed(self, endpoint: str, url: str, parse):
+        """GET a PyPI URL and feed the body to parse chunk by chunk, recording latency, status and size"""
+        started = time.perf_counter()
+        response = None
+        received = [0]
+        
+        def chunks():
+            for chunk in response.iter_content(chunk_size=self.chunk_size):
+                received[0] += len(chunk)
+                yield chunk
+        
+        try:
+            response = requests.get(url, timeout=10, stream=True)
+            response.raise_for_status()
+            return parse(chunks())
+        finally:
+            if response is not None:
+                response.close()
+            elapsed = time.perf_counter() - started
+            status = str(response.status_code) if response is not None else 'error'
+            record_upstream_request(self.base_url, endpoint, status, elapsed)
+            check_trace.record_upstream(response.status_code if response is not None else None, elapsed, received[0])
     
     def get_package_info(self, package_name: str) -> Optional[Dict]:
-        """Get package information from PyPI"""
+        """Get package information from the mirror or PyPI"""
+        if self.mirror is not None:
+            try:
+                record = self.mirror.lookup(package_name)
+            except Exception as e:
+                logger.error(f'Error reading PyPI mirror for {package_name}: {e}')
+                record = None
+            if record is not None:
+                check_trace.set_source('pypi_mirror')
+                return document_from_record(record)
+            if not self.mirror_fallback:
+                logger.warning(f'{package_name} not found in PyPI mirror')
+                return None
+        
         try:
+            # Only the fields the tracker uses are kept while the body streams in
             url = f'{self.base_url}/{package_name}/json'
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return document_from_record(self._get_streamed('project', url, parse_package_document))
         except requests.exceptions.RequestException as e:
             logger.warning(f'Error fetching PyPI info for {package_name}: {e}')
             return None
+        except JSONStreamError as e:
+            logger.warning(f'Invalid PyPI JSON for {package_name}: {e}')
+            return None
     
     def get_latest_version(self, package_name: str) -> Optional[str]:
         """Get the latest version of a package"""
@@ -39,17 +97,14 @@ class PyPIService:
         try:
             info = self.get_package_info(package_name)
             if info:
-                releases = info.get('releases', {})
+                # Compact {version: [first upload time, file count]}; only versions with files
                 version_list = []
-                for version, files in releases.items():
-                    if files:  # Only include versions with files
-                        version_list.append({
-                            'version_number': version,
-                            'release_date': datetime.fromisoformat(
-                                files[0].get('upload_time_iso_8601', '').split('T')[0]
-                            ) if files[0].get('upload_time_iso_8601') else None,
-                            'files_count': len(files)
-                        })
+                for version, (uploaded, count) in info.get('releases', {}).items():
+                    version_list.append({
+                        'version_number': version,
+                        'release_date': datetime.fromisoformat(uploaded.split('T')[0]) if uploaded else None,
+                        'files_count': count
+                    })
                 return sorted(version_list, key=lambda x: x.get('release_date') or datetime.min, reverse=True)
         except Exception as e:
             logger.error(f'Error getting release history for {package_name}: {e}')
@@ -61,12 +116,15 @@ class PyPIService:
             info = self.get_package_info(package_name)
             if info:
                 pkg_info = info.get('info', {})
+                # First upload of the current version's files
+                urls = info.get('urls') or []
                 return {
                     'version_number': pkg_info.get('version'),
-                    'release_date': None,  # PyPI doesn't provide accurate release dates in JSON API
+                    'release_date': _parse_upload_time(urls[0].get('upload_time_iso_8601')) if urls else None,
                     'download_url': pkg_info.get('project_url'),
                     'is_prerelease': False,
-                    'description': pkg_info.get('summary', '')
+                    'description': pkg_info.get('summary', ''),
+                    'requires_dist': pkg_info.get('requires_dist') or []
                 }
         except Exception as e:
             logger.error(f'Error extracting PyPI info for {package_name}: {e}')
@@ -0,0 +1,222 @@
+# MIT License
+
+import json
+import logging
+import re
+import tomllib
+from typing import Dict, List, Optional
+from packaging.requirements import Requirement, InvalidRequirement
+from packaging.utils import canonicalize_name
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('requirements', 'pyproject', 'poetry.lock', 'uv.lock', 'pdm.lock', 'pipfile.lock')
+
+# Plain "name==version" lines make up most lockstyle files and skip full PEP 508 parsing
+_SIMPLE_PIN = re.compile(r'^([A-Za-z0-9][A-Za-z0-9._-]*)\s*==\s*([A-Za-z0-9.!+_-]+)$')
+
+
+class DependencyFileError(ValueError):
+    """Raised when a dependency file cannot be parsed"""
+
+
+def _table(data: Dict, key: str, where: str) -> Dict:
+    """A sub-table that may be missing but must be a table when present"""
+    value = data.get(key, {})
+    if not isinstance(value, dict):
+        raise DependencyFileError(f'{where}{key} must be a table, got {type(value).__name__}')
+    return value
+
+
+def _string_list(value, where: str) -> List[str]:
+    """A list of requirement strings"""
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise DependencyFileError(f'{where} must be a list of requirement strings')
+    return value
+
+
+def _pin(name: str, version: Optional[str], specifier: str = '', line: Optional[int] = None) -> Dict:
+    return {
+        'name': name,
+        'canonical_name': canonicalize_name(name),
+        'version': version,
+        'specifier': specifier,
+        'line': line
+    }
+
+
+def _pin_from_requirement(text: str, line: Optional[int] = None) -> Optional[Dict]:
+    """Build a pin from a PEP 508 requirement string; only == / === pins carry a version"""
+    simple = _SIMPLE_PIN.match(text)
+    if simple:
+        name, version = simple.groups()
+        return _pin(name, version, f'=={version}', line)
+
+    try:
+        requirement = Requirement(text)
+    except InvalidRequirement as e:
+        logger.debug(f'Skipping invalid requirement {text!r}: {e}')
+        return None
+
+    version = None
+    specifiers = list(requirement.specifier)
+    if len(specifiers) == 1 and specifiers[0].operator in ('==', '===') and '*' not in specifiers[0].version:
+        version = specifiers[0].version
+    return _pin(requirement.name, version, str(requirement.specifier), line)
+
+
+def parse_requirements_txt(content: str) -> List[Dict]:
+    """Parse a pip requirements file"""
+    pins = []
+    logical_line = ''
+    start_line = None
+
+    for number, raw_line in enumerate(content.splitlines(), start=1):
+        line = raw_line.split(' #', 1)[0].strip()
+        if line.startswith('#'):
+            line = ''
+        if start_line is None:
+            start_line = number
+
+        if line.endswith('\\'):
+            logical_line += line[:-1] + ' '
+            continue
+        logical_line += line
+
+        text = logical_line.strip()
+        logical_line = ''
+        line_number, start_line = start_line, None
+
+        # Options (-r, -e, --index-url, ...), URLs and local paths are not pins
+        if not text or text.startswith('-') or ('://' in text and '@' not in text):
+            continue
+        # Strip per-requirement options such as --hash
+        text = re.split(r'\s+--', text, maxsplit=1)[0]
+
+        pin = _pin_from_requirement(text, line_number)
+        if pin:
+            pins.append(pin)
+    return pins
+
+
+def _poetry_constraint(name: str, constraint) -> Optional[Dict]:
+    if isinstance(constraint, dict):
+        constraint = constraint.get('version')
+    if not isinstance(constraint, str):
+        return None
+    constraint = constraint.strip()
+    if re.match(r'^==?\s*[\w.!+-]+$', constraint) or re.match(r'^\d[\w.!+-]*$', constraint):
+        return _pin(name, constraint.lstrip('=').strip(), f'=={constraint.lstrip("=").strip()}')
+    return _pin(name, None, constraint)
+
+
+def parse_pyproject(content: str) -> List[Dict]:
+    """Parse PEP 621, dependency-groups and Poetry dependencies from pyproject.toml"""
+    try:
+        data = tomllib.loads(content)
+    except tomllib.TOMLDecodeError as e:
+        raise DependencyFileError(f'Invalid TOML: {e}')
+
+    project = _table(data, 'project', '')
+    requirements = list(_string_list(project.get('dependencies', []), 'project.dependencies'))
+    for name, group in _table(project, 'optional-dependencies', 'project.').items():
+        requirements.extend(_string_list(group, f'project.optional-dependencies.{name}'))
+    for name, group in _table(data, 'dependency-groups', '').items():
+        if not isinstance(group, list):
+            raise DependencyFileError(f'dependency-groups.{name} must be a list')
+        # Non-string entries are {include-group = "..."} references
+        requirements.extend(item for item in group if isinstance(item, str))
+
+    pins = [pin for pin in (_pin_from_requirement(text) for text in requirements) if pin]
+
+    poetry = _table(_table(data, 'tool', ''), 'poetry', 'tool.')
+    sections = [_table(poetry, 'dependencies', 'tool.poetry.'), _table(poetry, 'dev-dependencies', 'tool.poetry.')]
+    for name, group in _table(poetry, 'group', 'tool.poetry.').items():
+        if not isinstance(group, dict):
+            raise DependencyFileError(f'tool.poetry.group.{name} must be a table')
+        sections.append(_table(group, 'dependencies', f'tool.poetry.group.{name}.'))
+    for section in sections:
+        for name, constraint in section.items():
+            if name.lower() == 'python':
+                continue
+            pin = _poetry_constraint(name, constraint)
+            if pin:
+                pins.append(pin)
+    return pins
+
+
+def parse_toml_lock(content: str) -> List[Dict]:
+    """Parse lockfiles listing [[package]] tables (poetry.lock, uv.lock, pdm.lock)"""
+    try:
+        data = tomllib.loads(content)
+    except tomllib.TOMLDecodeError as e:
+        raise DependencyFileError(f'Invalid TOML: {e}')
+
+    packages = data.get('package', [])
+    if not isinstance(packages, list) or not all(isinstance(package, dict) for package in packages):
+        raise DependencyFileError('package must be an array of tables')
+    return [
+        _pin(package['name'], package.get('version'), f'=={package["version"]}' if package.get('version') else '')
+        for package in packages
+        if isinstance(package.get('name'), str) and isinstance(package.get('version'), (str, type(None)))
+    ]
+
+
+def parse_pipfile_lock(content: str) -> List[Dict]:
+    """Parse a Pipfile.lock"""
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise DependencyFileError(f'Invalid JSON: {e}')
+
+    if not isinstance(data, dict):
+        raise DependencyFileError(f'Pipfile.lock must be a JSON object, got {type(data).__name__}')
+
+    pins = []
+    for section in ('default', 'develop'):
+        for name, entry in _table(data, section, '').items():
+            specifier = entry.get('version', '') if isinstance(entry, dict) else ''
+            if not isinstance(specifier, str):
+                specifier = ''
+            version = specifier[2:] if specifier.startswith('==') else None
+            pins.append(_pin(name, version, specifier))
+    return pins
+
+
+_PARSERS = {
+    'requirements': parse_requirements_txt,
+    'pyproject': parse_pyproject,
+    'poetry.lock': parse_toml_lock,
+    'uv.lock': parse_toml_lock,
+    'pdm.lock': parse_toml_lock,
+    'pipfile.lock': parse_pipfile_lock,
+}
+
+
+def detect_format(filename: Optional[str], content: str) -> str:
+    """Guess the dependency file format from its name, then its content"""
+    name = (filename or '').rsplit('/', 1)[-1].lower()
+    if name == 'pyproject.toml':
+        return 'pyproject'
+    if name in ('poetry.lock', 'uv.lock', 'pdm.lock', 'pipfile.lock'):
+        return name
+    if name.endswith('.txt') or name.endswith('.in'):
+        return 'requirements'
+
+    stripped = content.lstrip()
+    if stripped.startswith('{'):
+        return 'pipfile.lock'
+    if '[[package]]' in content:
+        return 'poetry.lock'
+    if re.search(r'^\[(project|tool\.poetry)', content, flags=re.MULTILINE):
+        return 'pyproject'
+    return 'requirements'
+
+
+def parse_dependency_file(content: str, filename: Optional[str] = None, file_format: Optional[str] = None) -> List[Dict]:
+    """Parse any supported dependency file into a list of pins"""
+    file_format = (file_format or detect_format(filename, content)).lower()
+    parser = _PARSERS.get(file_format)
+    if parser is None:
+        raise DependencyFileError(f'Unsupported format: {file_format}. Supported: {", ".join(FORMATS)}')
+    return parser(content)
@@ -0,0 +1,139 @@
+# MIT License
+
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class SweepProgress:
+    """Checkpointed progress of one scheduled sweep"""
+
+    def __init__(self, checkpoint, completed=None, interval: int = 50):
+        self.checkpoint = checkpoint
+        self.completed = set(completed or ())
+        self.interval = max(1, interval)
+        # Checked since the last checkpoint; only these rows are written by save()
+        self._unsaved = []
+
+    @classmethod
+    def resume_or_start(cls, interval: int = 50, max_age_hours: int = 24) -> 'SweepProgress':
+        """
+        Continue the unfinished sweep, or start a new one
+
+        A sweep whose checkpoint was not written for max_age_hours is
+        abandoned and a fresh one is started instead.
+        """
+        from models import db, SweepCheckpoint, SweepCheckpointProject
+
+        checkpoint = SweepCheckpoint.query.filter_by(status='running').order_by(
+            SweepCheckpoint.started_at.desc()
+        ).first()
+        if checkpoint is not None and checkpoint.updated_at < datetime.utcnow() - timedelta(hours=max_age_hours):
+            logger.warning(f'Abandoning stale sweep {checkpoint.sweep_id} at {checkpoint.cursor}/{checkpoint.total}')
+            checkpoint.status = 'abandoned'
+            checkpoint.finished_at = datetime.utcnow()
+            _forget_projects(checkpoint)
+            checkpoint = None
+
+        if checkpoint is not None:
+            checkpoint.resumes += 1
+            completed = [project_id for (project_id,) in db.session.query(SweepCheckpointProject.project_id).filter(
+                SweepCheckpointProject.checkpoint_id == checkpoint.id
+            )]
+            logger.info(f'Resuming sweep {checkpoint.sweep_id} after {len(completed)} projects')
+        else:
+            checkpoint = SweepCheckpoint(sweep_id=str(uuid.uuid4()), status='running')
+            db.session.add(checkpoint)
+            completed = ()
+        db.session.commit()
+        return cls(checkpoint, completed, interval)
+
+    @property
+    def sweep_id(self) -> str:
+        return self.checkpoint.sweep_id
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.checkpoint.resumes)
+
+    def set_remaining(self, remaining: int) -> None:
+        """Record how many projects the sweep still has to check"""
+        self.checkpoint.total = len(self.completed) + remaining
+        self.save()
+
+    def mark_done(self, project_ids: Iterable[int]) -> bool:
+        """Add checked projects; writes the checkpoint every interval projects, returns True when written"""
+        for project_id in project_ids:
+            if project_id not in self.completed:
+                self.completed.add(project_id)
+                self._unsaved.append(project_id)
+        if len(self._unsaved) < self.interval:
+            return False
+        self.save()
+        return True
+
+    def save(self) -> None:
+        """Write the cursor and the projects checked since the last save in their own transaction"""
+        from models import db, SweepCheckpointProject
+
+        checkpoint = self.checkpoint
+        try:
+            if self._unsaved and checkpoint.status == 'running':
+                db.session.execute(db.insert(SweepCheckpointProject), [
+                    {'checkpoint_id': checkpoint.id, 'project_id': project_id} for project_id in self._unsaved
+                ])
+            checkpoint.cursor = len(self.completed)
+            checkpoint.updated_at = datetime.utcnow()
+            db.session.add(checkpoint)
+            db.session.commit()
+            self._unsaved = []
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f'Error saving checkpoint of sweep {self.sweep_id}: {e}')
+
+    def finish(self) -> None:
+        """Mark the sweep completed; the next run starts a new one"""
+        self.checkpoint.status = 'completed'
+        self.checkpoint.finished_at = datetime.utcnow()
+        # Only running sweeps need their project list
+        _forget_projects(self.checkpoint)
+        self.save()
+
+
+def _forget_projects(checkpoint) -> None:
+    """Delete the checked-project rows of a sweep that will not be resumed"""
+    from models import db, SweepCheckpointProject
+
+    db.session.query(SweepCheckpointProject).filter(
+        SweepCheckpointProject.checkpoint_id == checkpoint.id
+    ).delete(synchronize_session=False)
+
+
+def unfinished_sweep() -> Optional[Dict]:
+    """Checkpoint of the sweep a restarted process should continue, if any"""
+    from models import SweepCheckpoint
+
+    checkpoint = SweepCheckpoint.query.filter_by(status='running').order_by(
+        SweepCheckpoint.started_at.desc()
+    ).first()
+    return checkpoint.to_dict() if checkpoint is not None else None
+
+
+def purge_sweep_checkpoints(retention_days: int = 14) -> int:
+    """Delete finished checkpoints older than the retention window"""
+    from models import db, SweepCheckpoint
+
+    try:
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        deleted = SweepCheckpoint.query.filter(
+            SweepCheckpoint.status != 'running', SweepCheckpoint.updated_at < cutoff
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Error in purge_sweep_checkpoints: {e}')
+        return 0
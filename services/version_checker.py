@@ -1,12 +1,86 @@
 # MIT License
 
 from datetime import datetime
-from typing import Optional, Dict
+from functools import lru_cache
+from typing import Iterable, List, Optional, Dict, Sequence, Tuple
 import logging
+import re
 from packaging import version as pkg_version
 
 logger = logging.getLogger(__name__)
 
+# Bounded caches: release histories and tag lists repeat the same strings
+PARSE_CACHE_SIZE = 8192
+
+_PRE_RELEASE_ORDER = {'a': 0, 'b': 1, 'rc': 2}
+
+# Plain final releases ("1.2.3") are by far the most common and skip full parsing
+_PLAIN_RELEASE = re.compile(r'^\d+(?:\.\d+)*$')
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(version_str: str) -> Optional[pkg_version.Version]:
+    """Parse a version string, returning None when it is not PEP 440"""
+    try:
+        return pkg_version.parse(version_str)
+    except pkg_version.InvalidVersion:
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _version_key(version_str: str) -> Tuple:
+    """
+    Encode a version as a compact tuple of ints/strings
+    
+    Tuples compare exactly like packaging.version.Version objects; strings that
+    are not valid versions sort before all valid ones, alphabetically.
+    """
+    if _PLAIN_RELEASE.match(version_str):
+        release = tuple(int(part) for part in version_str.split('.'))
+        while len(release) > 1 and release[-1] == 0:
+            release = release[:-1]
+        return (1, 0, release, (3,), (-1,), (1,), ())
+    
+    parsed = _parse(version_str)
+    if parsed is None:
+        return (0, version_str)
+    
+    release = parsed.release
+    while len(release) > 1 and release[-1] == 0:
+        release = release[:-1]
+    
+    if parsed.pre is None and parsed.post is None and parsed.dev is not None:
+        pre = (-1,)  # 1.0.dev0 sorts before 1.0a0
+    elif parsed.pre is None:
+        pre = (3,)  # final releases sort after any pre-release
+    else:
+        pre = (_PRE_RELEASE_ORDER[parsed.pre[0]], parsed.pre[1])
+    
+    post = (-1,) if parsed.post is None else (parsed.post,)
+    dev = (1,) if parsed.dev is None else (0, parsed.dev)
+    
+    local = ()
+    if parsed.local:
+        local = tuple(
+            (1, int(part), '') if part.isdigit() else (0, 0, part)
+            for part in re.split(r'[._-]', parsed.local.lower())
+        )
+    
+    return (1, parsed.epoch, release, pre, post, dev, local)
+
+
+def _classify(old: pkg_version.Version, new: pkg_version.Version) -> Optional[str]:
+    """Update type between two parsed versions"""
+    if new <= old:
+        return None  # Not an update
+    
+    if new.major > old.major:
+        return 'major'
+    elif new.minor > old.minor:
+        return 'minor'
+    return 'patch'
+
+
 class VersionChecker:
     """Service for version comparison and update detection"""
     
@@ -18,32 +92,54 @@ class VersionChecker:
         Returns: 'major', 'minor', 'patch', or None if versions cannot be compared
         """
         try:
-            old = pkg_version.parse(old_version)
-            new = pkg_version.parse(new_version)
-            
-            if new <= old:
-                return None  # Not an update
-            
-            # For PEP440 versions
-            if hasattr(old, 'major') and hasattr(new, 'major'):
-                if new.major > old.major:
-                    return 'major'
-                elif new.minor > old.minor:
-                    return 'minor'
-                else:
-                    return 'patch'
+            old = _parse(old_version)
+            new = _parse(new_version)
+            if old is None or new is None:
+                raise pkg_version.InvalidVersion(f'{old_version!r} or {new_version!r}')
             
-            # Fallback for simple comparison
-            return 'patch'
+            return _classify(old, new)
         except Exception as e:
             logger.warning(f'Error comparing versions {old_version} and {new_version}: {e}')
             return None
     
+    @staticmethod
+    def classify_many(pairs: Iterable[Tuple[str, str]]) -> List[Optional[str]]:
+        """
+        Compare many (old, new) pairs in one call
+        
+        Returns one update type (or None) per pair, in input order.
+        """
+        results = []
+        for old_version, new_version in pairs:
+            old = _parse(old_version) if old_version else None
+            new = _parse(new_version) if new_version else None
+            results.append(_classify(old, new) if old is not None and new is not None else None)
+        return results
+    
+    @staticmethod
+    def version_key(version_str: str) -> Tuple:
+        """Get a comparable tuple for a version string"""
+        return _version_key(version_str)
+    
+    @staticmethod
+    def sort_versions(versions: Sequence[str], reverse: bool = False) -> List[str]:
+        """Sort version strings by PEP 440 order (invalid versions first)"""
+        return sorted(versions, key=_version_key, reverse=reverse)
+    
+    @staticmethod
+    def is_valid(version_str: str) -> bool:
+        """Check if a version string is a valid PEP 440 version"""
+        return _parse(version_str) is not None
+    
     @staticmethod
     def is_newer(version1: str, version2: str) -> bool:
         """Check if version1 is newer than version2"""
         try:
-            return pkg_version.parse(version1) > pkg_version.parse(version2)
+            parsed1 = _parse(version1)
+            parsed2 = _parse(version2)
+            if parsed1 is None or parsed2 is None:
+                raise pkg_version.InvalidVersion(f'{version1!r} or {version2!r}')
+            return parsed1 > parsed2
         except Exception as e:
             logger.warning(f'Error comparing versions: {e}')
             return False
@@ -51,10 +147,13 @@ class VersionChecker:
     @staticmethod
     def normalize_version(version_str: str) -> str:
         """Normalize version string"""
-        try:
-            # Remove 'v' prefix if present
-            if version_str.startswith('v'):
-                version_str = version_str[1:]
-            return str(pkg_version.parse(version_str))
-        except Exception:
-            return version_str
+        # Remove 'v' prefix if present
+        stripped = version_str[1:] if version_str.startswith('v') else version_str
+        parsed = _parse(stripped)
+        return str(parsed) if parsed is not None else stripped
+    
+    @staticmethod
+    def cache_info() -> Dict:
+        """Get parse cache statistics"""
+        info = _parse.cache_info()
+        return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
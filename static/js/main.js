@@ -171,6 +171,32 @@ function showNotificationsModal(notifications) {
     modal.show();
 }
 
+/**
+ * Subscribe to pushed notifications, falling back to polling
+ */
+function subscribeNotifications() {
+    let pollTimer = null;
+    const startPolling = () => {
+        if (!pollTimer) {
+            pollTimer = setInterval(loadNotifications, 10000);
+        }
+    };
+    
+    if (!window.EventSource) {
+        startPolling();
+        return;
+    }
+    
+    const source = new EventSource(`${API_BASE}/notifications/stream`);
+    source.addEventListener('update', () => loadNotifications());
+    source.onerror = () => {
+        // The browser reconnects on its own unless the stream is closed for good
+        if (source.readyState === EventSource.CLOSED) {
+            startPolling();
+        }
+    };
+}
+
 /**
  * Check API health
  */
@@ -191,8 +217,8 @@ document.addEventListener('DOMContentLoaded', function() {
     // Load notifications immediately
     loadNotifications();
     
-    // Refresh notifications every 10 seconds
-    setInterval(loadNotifications, 10000);
+    // Refresh notifications when the server pushes new updates
+    subscribeNotifications();
     
     // Check health
     checkHealth();
@@ -0,0 +1,57 @@
+# MIT License
+
+import json
+import os
+import subprocess
+import sys
+
+BENCHMARKS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks')
+
+
+def _run_script(name, *args, cwd):
+    """Run a benchmark script in its own process and return its results JSON"""
+    output = os.path.join(cwd, f'{name}.json')
+    env = {key: value for key, value in os.environ.items() if key not in ('FLASK_ENV', 'DATABASE_URL')}
+    completed = subprocess.run(
+        [sys.executable, os.path.join(BENCHMARKS, f'{name}.py'), *args, '--output', output],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert completed.returncode == 0, completed.stderr[-2000:]
+    with open(output) as f:
+        return json.load(f)
+
+
+class TestBenchmarkSmoke:
+    """Tiny runs of the benchmark scripts so they keep working as the code changes"""
+
+    def test_bench_sweep(self, tmp_path):
+        """Test a sweep over a handful of projects against the stubs"""
+        result = _run_script('bench_sweep', '--projects', '5', '--latency-ms', '0', cwd=str(tmp_path))
+
+        assert {'revision', 'params', 'results'} <= set(result)
+        results = result['results']
+        for key in ('sweep_seconds', 'project_p50_ms', 'project_p99_ms', 'projects_checked',
+                    'versions_recorded', 'upstream', 'upstream_calls_per_project', 'peak_rss_mb'):
+            assert key in results
+        assert results['projects_checked'] == 5
+        assert results['versions_recorded'] == 5
+        # Latency includes the upstream fetch, not only applying the result
+        assert results['project_p50_ms'] > 0
+
+    def test_generate_data_and_load_driver(self, tmp_path):
+        """Test seeding a small database and replaying a short workload against it"""
+        database_url = f'sqlite:///{tmp_path / "bench.db"}'
+        subprocess.run(
+            [sys.executable, os.path.join(BENCHMARKS, 'generate_data.py'), '--projects', '5', '--reset',
+             '--database-url', database_url],
+            cwd=str(tmp_path), capture_output=True, check=True, timeout=120
+        )
+
+        result = _run_script('load_driver', '--database-url', database_url, '--requests', '60',
+                             '--concurrency', '1', '--max-page', '1', cwd=str(tmp_path))
+        results = result['results']
+        assert results['requests'] == 60
+        assert results['errors'] == 0
+        assert {'GET /api/projects', 'GET /api/dashboard'} <= set(results['endpoints'])
+        for stats in results['endpoints'].values():
+            assert {'p50_ms', 'p99_ms', 'queries_mean'} <= set(stats)
@@ -0,0 +1,136 @@
+# MIT License
+
+import pytest
+import json
+from cache import MemoryCacheBackend, FileCacheBackend, response_cache
+
+def _entry(body, tags=None):
+    return {'body': body, 'status': 200, 'headers': [], 'tags': tags or {}}
+
+class TestMemoryCacheBackend:
+    """Tests for the in-memory cache backend"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        backend = MemoryCacheBackend(max_entries=2)
+        backend.set('a', _entry(b'1'), ttl=60)
+        backend.set('b', _entry(b'2'), ttl=60)
+        backend.get('a')
+        backend.set('c', _entry(b'3'), ttl=60)
+
+        assert backend.get('a') is not None
+        assert backend.get('b') is None
+        assert backend.get('c') is not None
+
+    def test_memory_cap(self):
+        """Test that entries are evicted to stay under the byte limit"""
+        backend = MemoryCacheBackend(max_bytes=100)
+        backend.set('a', _entry(b'x' * 60), ttl=60)
+        backend.set('b', _entry(b'y' * 60), ttl=60)
+
+        assert backend.get('a') is None
+        assert backend.info()['bytes'] <= 100
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are not returned"""
+        backend = MemoryCacheBackend()
+        backend.set('a', _entry(b'1'), ttl=-1)
+        assert backend.get('a') is None
+
+class TestFileCacheBackend:
+    """Tests for the shared file cache backend"""
+
+    def test_tags_shared_between_instances(self, tmp_path):
+        """Test that a tag bump in one worker is seen by another"""
+        worker1 = FileCacheBackend(directory=str(tmp_path))
+        worker2 = FileCacheBackend(directory=str(tmp_path))
+
+        versions = worker1.tag_versions(['projects'])
+        worker1.set('key', _entry(b'data', versions), ttl=60)
+        assert worker2.get('key')['tags'] == worker2.tag_versions(['projects'])
+
+        worker2.bump_tags(['projects'])
+        assert worker1.get('key')['tags'] != worker1.tag_versions(['projects'])
+
+class TestResponseCache:
+    """Tests for cached API routes"""
+
+    def test_workers_share_invalidation(self, tmp_path, monkeypatch):
+        """Test a write handled by one worker invalidates what another worker cached"""
+        from app import create_app
+        from config import config
+        from models import db
+
+        monkeypatch.setattr(config['testing'], 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "shared.db"}')
+        monkeypatch.setattr(config['testing'], 'RESPONSE_CACHE_BACKEND', 'file')
+        monkeypatch.setattr(config['testing'], 'RESPONSE_CACHE_DIR', str(tmp_path / 'cache'))
+        monkeypatch.setattr(config['testing'], 'WORKER_PROCESSES', 2)
+
+        # Each worker process has its own backend object over the shared directory
+        worker1, worker2 = create_app('testing'), create_app('testing')
+        backends = {}
+        for worker in (worker1, worker2):
+            response_cache.init_app(worker)
+            backends[worker] = response_cache.backend
+
+        def request(worker, method, url, **kwargs):
+            response_cache.backend = backends[worker]
+            with worker.test_client() as client:
+                return getattr(client, method)(url, **kwargs)
+
+        try:
+            project_id = json.loads(request(worker1, 'post', '/api/projects', json={'name': 'Shared'}).data)['id']
+            first = request(worker1, 'get', f'/api/projects/{project_id}')
+            assert request(worker1, 'get', f'/api/projects/{project_id}', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+            request(worker2, 'put', f'/api/projects/{project_id}', json={'description': 'Changed elsewhere'})
+            response = request(worker1, 'get', f'/api/projects/{project_id}', headers={'If-None-Match': first.headers['ETag']})
+            assert response.status_code == 200
+            assert json.loads(response.data)['description'] == 'Changed elsewhere'
+        finally:
+            with worker1.app_context():
+                db.session.remove()
+                db.engine.dispose()
+            with worker2.app_context():
+                db.session.remove()
+                db.engine.dispose()
+
+    def test_memory_backend_refused_for_several_workers(self, monkeypatch):
+        """Test the per-process memory backend cannot be used with several workers"""
+        from app import create_app
+        from config import config
+
+        monkeypatch.setattr(config['testing'], 'WORKER_PROCESSES', 2)
+        with pytest.raises(ValueError):
+            create_app('testing')
+
+    def test_hit_and_invalidation(self, client):
+        """Test that GETs are served from cache until a write invalidates them"""
+        response = client.post('/api/projects', json={'name': 'Test Project'})
+        project_id = json.loads(response.data)['id']
+
+        client.get(f'/api/projects/{project_id}')
+        hits = response_cache.hits
+        response = client.get(f'/api/projects/{project_id}')
+        assert response.status_code == 200
+        assert response_cache.hits == hits + 1
+
+        client.put(f'/api/projects/{project_id}', json={'description': 'Updated'})
+        response = client.get(f'/api/projects/{project_id}')
+        assert json.loads(response.data)['description'] == 'Updated'
+
+    def test_cached_response_honours_etag(self, client):
+        """Test that a cache hit still answers If-None-Match with 304"""
+        etag = client.get('/api/projects').headers['ETag']
+        response = client.get('/api/projects', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+    def test_cache_stats(self, client):
+        """Test cache statistics endpoint"""
+        client.get('/api/projects')
+        client.get('/api/projects')
+
+        data = json.loads(client.get('/api/cache/stats').data)
+        assert data['backend'] == 'memory'
+        assert data['hits'] >= 1
+        assert 0 < data['hit_rate'] <= 1
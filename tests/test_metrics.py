@@ -0,0 +1,117 @@
+# MIT License
+
+import pytest
+import json
+import os
+import requests
+from metrics import MetricsRegistry, UPSTREAM_REQUESTS
+from services.pypi_service import PyPIService
+
+class TestMetricsRegistry:
+    """Tests for the in-process metrics registry"""
+
+    def test_render_exposition_format(self):
+        """Test counters and histograms render in the Prometheus text format"""
+        registry = MetricsRegistry()
+        counter = registry.counter('jobs_total', 'Jobs run', ('status',))
+        histogram = registry.histogram('job_seconds', 'Job duration', buckets=(0.1, 1.0))
+
+        counter.inc(status='ok')
+        counter.inc(2, status='ok')
+        histogram.observe(0.05)
+        histogram.observe(0.5)
+
+        text = registry.render()
+        assert '# TYPE jobs_total counter' in text
+        assert 'jobs_total{status="ok"} 3' in text
+        assert 'job_seconds_bucket{le="0.1"} 1' in text
+        assert 'job_seconds_bucket{le="1"} 2' in text
+        assert 'job_seconds_bucket{le="+Inf"} 2' in text
+        assert 'job_seconds_count 2' in text
+
+    def test_multiprocess_merge(self, tmp_path):
+        """Test samples written by other workers are summed, gauges of dead workers dropped"""
+        registry = MetricsRegistry()
+        registry.configure(multiproc_dir=str(tmp_path))
+        counter = registry.counter('requests_total', 'Requests', ('route',))
+        gauge = registry.gauge('queue_depth', 'Queue depth')
+        counter.inc(route='/a')
+        gauge.set(3)
+
+        # A worker that has exited and one that is still running (this test's parent)
+        dead = {'requests_total': [[['/a'], 5]], 'queue_depth': [[[], 7]]}
+        alive = {'requests_total': [[['/b'], 1]], 'queue_depth': [[[], 2]]}
+        (tmp_path / 'metrics_999999999.json').write_text(json.dumps(dead))
+        (tmp_path / f'metrics_{os.getppid()}.json').write_text(json.dumps(alive))
+
+        text = registry.render()
+        assert 'requests_total{route="/a"} 6' in text
+        assert 'requests_total{route="/b"} 1' in text
+        assert 'queue_depth 5' in text
+
+class TestMetricsRoute:
+    """Tests for /metrics and request instrumentation"""
+
+    def test_metrics_endpoint(self, client):
+        """Test HTTP, database and outbox metrics are exposed"""
+        client.get('/api/projects')
+
+        response = client.get('/metrics')
+        text = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        assert 'version_tracker_http_requests_total{route="/api/projects",method="GET",status="200"}' in text
+        assert 'version_tracker_db_queries_total{route="/api/projects"}' in text
+        assert 'version_tracker_notification_outbox_entries{status="pending"} 0' in text
+
+    def test_upstream_requests_recorded(self, monkeypatch):
+        """Test upstream calls are counted by host, endpoint and status"""
+        def fail(url, **kwargs):
+            raise requests.exceptions.ConnectionError('unreachable')
+
+        monkeypatch.setattr(requests, 'get', fail)
+        before = UPSTREAM_REQUESTS.values().get(('pypi.test', 'project', 'error'), 0)
+
+        assert PyPIService(base_url='http://pypi.test/pypi').get_package_info('flask') is None
+        assert UPSTREAM_REQUESTS.values()[('pypi.test', 'project', 'error')] == before + 1
+
+class TestProfiling:
+    """Tests for opt-in request profiling"""
+
+    @pytest.fixture
+    def profiled_app(self, monkeypatch, tmp_path):
+        from app import create_app
+        from config import TestingConfig
+        from models import db
+
+        monkeypatch.setattr(TestingConfig, 'PROFILING_ENABLED', True, raising=False)
+        monkeypatch.setattr(TestingConfig, 'PROFILING_SLOW_REQUEST_MS', 0, raising=False)
+        monkeypatch.setattr(TestingConfig, 'PROFILING_DIR', str(tmp_path), raising=False)
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.drop_all()
+
+    def test_server_timing_and_slow_log(self, profiled_app, caplog):
+        """Test SQL time is reported in Server-Timing and slow requests are logged with queries"""
+        client = profiled_app.test_client()
+        client.post('/api/projects', json={'name': 'flask'})
+
+        response = client.get('/api/projects')
+        timing = response.headers['Server-Timing']
+        assert 'db;dur=' in timing and 'queries"' in timing
+        assert 'Slow request GET /api/projects' in caplog.text
+        assert 'SELECT' in caplog.text
+
+    def test_profile_on_header(self, profiled_app, tmp_path):
+        """Test the profiling header saves a cProfile capture"""
+        response = profiled_app.test_client().get('/api/statistics', headers={'X-Profile': '1'})
+
+        assert 'profile;desc=' in response.headers['Server-Timing']
+        assert len(list(tmp_path.glob('*.prof'))) == 1
+
+    def test_disabled_by_default(self, client):
+        """Test no profiling headers are added unless enabled"""
+        assert 'Server-Timing' not in client.get('/api/statistics').headers
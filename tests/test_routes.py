@@ -1,8 +1,17 @@
 # MIT License
 
 import pytest
+import gzip
+import io
 import json
-from models import db, Project, Version
+import time
+import background_tasks
+from datetime import datetime, timedelta
+from models import db, Project, Version, Update, CheckRun, UpstreamSource, ReleaseCadence, SweepCheckpoint, SweepCheckpointProject
+from services.sweep_checkpoints import unfinished_sweep
+from analytics import refresh_release_analytics
+from check_priority import PriorityScorer, record_interest
+from upstream_sources import purge_orphan_sources, resolve_missing_sources
 
 class TestProjectRoutes:
     """Tests for project API routes"""
@@ -71,6 +80,167 @@ class TestProjectRoutes:
         response = client.delete(f'/api/projects/{project_id}')
         assert response.status_code == 200
 
+class TestProjectFilters:
+    """Tests for server-side project filters and full-text search"""
+    
+    def _names(self, client, query):
+        data = json.loads(client.get(f'/api/projects?{query}').data)
+        return sorted(p['name'] for p in data['projects'])
+    
+    def test_filters(self, client, app):
+        """Test category, active, stale, unread and update type filters"""
+        with app.app_context():
+            fresh = Project(name='fresh', category='framework', last_checked=datetime.utcnow())
+            stale = Project(name='stale', category='library', last_checked=datetime.utcnow() - timedelta(days=3))
+            never = Project(name='never', category='library', active=False)
+            db.session.add_all([fresh, stale, never])
+            db.session.commit()
+            db.session.add(Update(project_id=stale.id, new_version='2.0.0', update_type='major'))
+            db.session.add(Update(project_id=fresh.id, new_version='1.1.0', update_type='minor', notified=True))
+            db.session.commit()
+        
+        assert self._names(client, 'category=library') == ['never', 'stale']
+        assert self._names(client, 'active=false') == ['never']
+        assert self._names(client, 'stale_hours=24') == ['never', 'stale']
+        assert self._names(client, 'has_unread=true') == ['stale']
+        assert self._names(client, 'has_unread=false') == ['fresh', 'never']
+        assert self._names(client, 'update_type=minor') == ['fresh']
+        assert client.get('/api/projects?update_type=huge').status_code == 400
+        for value in ('abc', 'inf', 'nan', '1e308', '-1'):
+            assert client.get(f'/api/projects?stale_hours={value}').status_code == 400
+    
+    def test_stale_hours_is_not_cached(self, client, app):
+        """Test time-relative stale_hours results bypass the response cache and get no ETag"""
+        from cache import response_cache
+        
+        with app.app_context():
+            db.session.add(Project(name='checked', last_checked=datetime.utcnow() - timedelta(hours=2)))
+            db.session.commit()
+        
+        hits = response_cache.hits
+        for _ in range(2):
+            response = client.get('/api/projects?stale_hours=1')
+            assert [p['name'] for p in json.loads(response.data)['projects']] == ['checked']
+            assert 'ETag' not in response.headers
+        assert response_cache.hits == hits
+        assert 'ETag' in client.get('/api/projects').headers
+    
+    def test_fulltext_search_tracks_writes(self, client):
+        """Test full-text search stays in sync with project writes"""
+        response = client.post('/api/projects', json={'name': 'Flask', 'description': 'Micro web framework'})
+        project_id = json.loads(response.data)['id']
+        client.post('/api/projects', json={'name': 'Requests', 'description': 'HTTP for humans'})
+        
+        assert self._names(client, 'q=web') == ['Flask']
+        assert self._names(client, 'q=hum') == ['Requests']
+        assert self._names(client, 'q="web') == ['Flask']
+        
+        client.put(f'/api/projects/{project_id}', json={'description': 'WSGI toolkit'})
+        assert self._names(client, 'q=web') == []
+        assert self._names(client, 'q=wsgi') == ['Flask']
+        
+        client.delete(f'/api/projects/{project_id}')
+        assert self._names(client, 'q=flask') == []
+    
+    def test_search_on_database_without_index(self, tmp_path, monkeypatch):
+        """Test a database created before full-text search gets its index at startup"""
+        from sqlalchemy import text
+        from app import create_app
+        from config import config
+        
+        monkeypatch.setattr(config['testing'], 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "old.db"}')
+        old = create_app('testing')
+        with old.app_context():
+            db.session.add(Project(name='Flask', description='Micro web framework'))
+            db.session.commit()
+            for name in ('projects_fts_insert', 'projects_fts_update', 'projects_fts_delete'):
+                db.session.execute(text(f'DROP TRIGGER {name}'))
+            db.session.execute(text('DROP TABLE projects_fts'))
+            db.session.commit()
+            db.session.remove()
+            db.engine.dispose()
+        
+        # Until the index can be built searches fall back to LIKE
+        import search
+        with monkeypatch.context() as patch:
+            patch.setattr(search, 'rebuild_search_index', lambda: 1 / 0)
+            failed = create_app('testing')
+        assert self._names(failed.test_client(), 'q=web') == ['Flask']
+        with failed.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        
+        restarted = create_app('testing')
+        try:
+            with restarted.app_context():
+                tables = db.session.execute(text(
+                    "SELECT name FROM sqlite_master WHERE name LIKE 'projects_fts%' AND type IN ('table', 'trigger')"
+                )).scalars().all()
+                assert {'projects_fts', 'projects_fts_insert', 'projects_fts_update', 'projects_fts_delete'} <= set(tables)
+            client = restarted.test_client()
+            assert self._names(client, 'q=web') == ['Flask']
+            client.post('/api/projects', json={'name': 'Requests', 'description': 'HTTP for humans'})
+            assert self._names(client, 'q=hum') == ['Requests']
+        finally:
+            with restarted.app_context():
+                db.session.remove()
+                db.engine.dispose()
+
+class TestBulkImportExport:
+    """Tests for NDJSON project import and export"""
+    
+    def test_import_reports_line_errors(self, client, app):
+        """Test that valid lines are upserted and invalid ones reported"""
+        with app.app_context():
+            db.session.add(Project(name='existing', description='old'))
+            db.session.commit()
+        
+        body = '\n'.join([
+            json.dumps({'name': 'flask', 'pypi_package': 'flask'}),
+            '{not json',
+            json.dumps({'description': 'no name'}),
+            json.dumps({'name': 'existing', 'description': 'new'}),
+            '',
+            json.dumps({'name': 'django', 'active': 'yes'})
+        ])
+        response = client.post('/api/projects:import', data=body, content_type='application/x-ndjson')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['created'] == 1
+        assert data['updated'] == 1
+        assert [error['line'] for error in data['errors']] == [2, 3, 6]
+        
+        with app.app_context():
+            assert Project.query.filter_by(name='existing').first().description == 'new'
+    
+    def test_import_unique_conflict(self, client, app):
+        """Test that a unique constraint violation only rejects its own line"""
+        body = '\n'.join([
+            json.dumps({'name': 'a', 'pypi_package': 'pkg'}),
+            json.dumps({'name': 'b', 'pypi_package': 'pkg'}),
+            json.dumps({'name': 'c'})
+        ])
+        data = json.loads(client.post('/api/projects:import', data=body).data)
+        assert data['created'] == 2
+        assert data['errors'][0]['line'] == 2
+    
+    def test_export_with_versions(self, client, app):
+        """Test streaming NDJSON export"""
+        with app.app_context():
+            project = Project(name='Test Project')
+            db.session.add(project)
+            db.session.commit()
+            db.session.add(Version(project_id=project.id, version_number='1.0.0'))
+            db.session.add(Project(name='Other'))
+            db.session.commit()
+        
+        response = client.get('/api/projects:export?include_versions=true')
+        assert response.mimetype == 'application/x-ndjson'
+        records = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        assert [r['name'] for r in records] == ['Test Project', 'Other']
+        assert records[0]['versions'][0]['version_number'] == '1.0.0'
+        assert records[1]['versions'] == []
+
 class TestVersionRoutes:
     """Tests for version API routes"""
     
@@ -91,6 +261,728 @@ class TestVersionRoutes:
         data = json.loads(response.data)
         assert len(data['versions']) == 1
 
+class TestCheckUpdateRoutes:
+    """Tests for single and bulk update checks"""
+    
+    @staticmethod
+    def _fake_fetch(releases, delay=None):
+        def fetch(github_repo, pypi_package):
+            if delay and pypi_package in delay:
+                time.sleep(delay[pypi_package])
+            version = releases.get(pypi_package)
+            return {'version_number': version} if version else None
+        return fetch
+    
+    def _create(self, app, **projects):
+        ids = {}
+        with app.app_context():
+            for name, current in projects.items():
+                project = Project(name=name, pypi_package=name, current_version=current, category='lib')
+                db.session.add(project)
+                db.session.commit()
+                ids[name] = project.id
+        return ids
+    
+    def test_check_update_creates_update(self, client, app, monkeypatch):
+        """Test single project check records a new version and update"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._fake_fetch({'flask': '2.0.0'}))
+        ids = self._create(app, flask='1.0.0')
+        
+        response = client.post(f'/api/projects/{ids["flask"]}/check-update')
+        data = json.loads(response.data)
+        assert data['message'] == 'Update found'
+        assert data['version']['version_number'] == '2.0.0'
+        
+        with app.app_context():
+            assert Update.query.filter_by(project_id=ids['flask']).first().update_type == 'major'
+    
+    def test_bulk_check_by_ids(self, client, app, monkeypatch):
+        """Test bulk check returns one result per requested project"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._fake_fetch({'flask': '1.1.0', 'rich': '1.0.0'}))
+        ids = self._create(app, flask='1.0.0', rich='1.0.0', attrs='1.0.0')
+        
+        response = client.post('/api/check-updates', json={'project_ids': list(ids.values()) + [999]})
+        data = json.loads(response.data)
+        statuses = {r['project_id']: r['status'] for r in data['results']}
+        assert statuses[ids['flask']] == 'updated'
+        assert statuses[ids['attrs']] == 'no_release'
+        assert statuses[999] == 'not_found'
+        assert data['summary']['updated'] == 1
+    
+    def test_bulk_check_deadline(self, client, app, monkeypatch):
+        """Test projects still waiting on upstream are reported as timed out"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._fake_fetch(
+            {'flask': '1.1.0', 'slow': '2.0.0'}, delay={'slow': 0.5}
+        ))
+        ids = self._create(app, flask='1.0.0', slow='1.0.0')
+        
+        response = client.post('/api/check-updates?stream=true', json={'category': 'lib', 'deadline': 0.1})
+        results = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+        statuses = {r['project_id']: r['status'] for r in results}
+        assert statuses == {ids['flask']: 'updated', ids['slow']: 'timeout'}
+    
+    def test_bulk_check_requires_selection(self, client):
+        """Test bulk check without ids or category"""
+        response = client.post('/api/check-updates', json={})
+        assert response.status_code == 400
+
+class TestCheckRuns:
+    """Tests for the persisted per-project check trace"""
+    
+    @staticmethod
+    def _fetch(github_repo, pypi_package):
+        if pypi_package == 'broken':
+            raise RuntimeError('upstream exploded')
+        return {'flask': {'version_number': '2.0.0'}, 'rich': {'version_number': '1.0.0'}}.get(pypi_package)
+    
+    def _create(self, app, **projects):
+        with app.app_context():
+            for name, current in projects.items():
+                db.session.add(Project(name=name, pypi_package=name, current_version=current, category='lib'))
+            db.session.commit()
+            return {p.name: p.id for p in Project.query.all()}
+    
+    def test_sweep_records_one_row_per_project(self, app, monkeypatch):
+        """Test a sweep writes a row per check with status and timings"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._fetch)
+        ids = self._create(app, flask='1.0.0', rich='1.0.0', attrs='1.0.0', broken='1.0.0')
+        
+        with app.app_context():
+            background_tasks.check_all_updates()
+            runs = {run.project_id: run for run in CheckRun.query.all()}
+            assert len(runs) == 4
+            assert len({run.sweep_id for run in runs.values()}) == 1
+            assert runs[ids['flask']].status == 'updated' and runs[ids['flask']].changed
+            assert runs[ids['rich']].status == 'up_to_date'
+            assert runs[ids['attrs']].status == 'no_release'
+            assert runs[ids['broken']].status == 'error'
+            assert runs[ids['broken']].error == 'upstream exploded'
+            assert runs[ids['flask']].db_ms is not None
+            assert all(run.trigger == 'scheduled' for run in runs.values())
+    
+    def test_sweep_report(self, client, app, monkeypatch):
+        """Test sweep listing, time split and error hotspots"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._fetch)
+        self._create(app, flask='1.0.0', broken='1.0.0')
+        with app.app_context():
+            background_tasks.check_all_updates()
+        
+        sweeps = json.loads(client.get('/api/check-runs/sweeps').data)['sweeps']
+        assert len(sweeps) == 1
+        assert sweeps[0]['checks'] == 2 and sweeps[0]['errors'] == 1 and sweeps[0]['updated'] == 1
+        
+        report = json.loads(client.get(f'/api/check-runs/sweeps/{sweeps[0]["sweep_id"]}').data)
+        assert report['statuses'] == {'updated': 1, 'error': 1}
+        assert set(report['time_ms']) == {'upstream', 'db', 'other', 'total'}
+        assert report['slowest'][0]['project_name'] in ('flask', 'broken')
+        assert report['error_hotspots'][0]['error'] == 'upstream exploded'
+        assert client.get('/api/check-runs/sweeps/missing').status_code == 404
+    
+    def test_bulk_and_single_checks_recorded(self, client, app, monkeypatch):
+        """Test bulk checks share a sweep id and single checks have none"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._fetch)
+        ids = self._create(app, flask='1.0.0', rich='1.0.0')
+        
+        data = json.loads(client.post('/api/check-updates', json={'category': 'lib'}).data)
+        client.post(f'/api/projects/{ids["rich"]}/check-update')
+        
+        with app.app_context():
+            assert CheckRun.query.filter_by(sweep_id=data['sweep_id'], trigger='bulk').count() == 2
+            assert CheckRun.query.filter_by(sweep_id=None, trigger='single').count() == 1
+        
+        report = json.loads(client.get(f'/api/projects/{ids["rich"]}/check-runs').data)
+        assert report['checks'] == 2
+        assert report['error_rate'] == 0.0
+        assert len(report['recent']) == 2
+        
+        summary = json.loads(client.get('/api/check-runs/summary?hours=1').data)
+        assert summary['checks'] == 3
+        assert summary['by_source']['none']['checks'] == 3
+    
+    def test_purge_and_disable(self, app, monkeypatch):
+        """Test retention purge and CHECK_RUNS_ENABLED"""
+        from services.check_runs import purge_check_runs
+        
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._fetch)
+        ids = self._create(app, flask='1.0.0')
+        with app.app_context():
+            db.session.add(CheckRun(project_id=ids['flask'], trigger='single', status='up_to_date',
+                                    started_at=datetime.utcnow() - timedelta(days=30)))
+            db.session.commit()
+            assert purge_check_runs(14) == 1
+            
+            app.config['CHECK_RUNS_ENABLED'] = False
+            background_tasks.check_all_updates()
+            assert CheckRun.query.count() == 0
+
+class TestUpstreamSources:
+    """Tests for shared upstream sources"""
+    
+    def _counting_fetch(self, calls):
+        def fetch(github_repo, pypi_package):
+            calls.append((github_repo, pypi_package))
+            return {'version_number': '2.0.0'} if pypi_package == 'flask' else None
+        return fetch
+    
+    def test_spellings_share_one_source(self, app):
+        """Test URL and package name spellings resolve to one source"""
+        with app.app_context():
+            db.session.add_all([
+                Project(name='a', github_repo='https://github.com/Pallets/Flask.git', pypi_package='Flask'),
+                Project(name='b', github_repo='git@github.com:pallets/flask', pypi_package='flask'),
+                Project(name='c', github_repo='https://www.github.com/pallets/flask/', pypi_package='other')
+            ])
+            db.session.commit()
+            projects = {p.name: p for p in Project.query.all()}
+            assert projects['a'].github_source_id == projects['b'].github_source_id == projects['c'].github_source_id
+            assert projects['a'].github_source.key == 'pallets/flask'
+            assert projects['a'].pypi_source_id == projects['b'].pypi_source_id != projects['c'].pypi_source_id
+            
+            projects['c'].pypi_package = 'FLASK'
+            db.session.commit()
+            assert projects['c'].pypi_source_id == projects['a'].pypi_source_id
+            assert purge_orphan_sources() == 1
+            assert UpstreamSource.query.count() == 2
+    
+    def test_sweep_fetches_each_source_once(self, app, monkeypatch):
+        """Test projects sharing sources are checked with one fetch"""
+        calls = []
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._counting_fetch(calls))
+        with app.app_context():
+            for name, package in (('one', 'Flask'), ('two', 'flask'), ('three', 'FLASK'), ('rich', 'rich')):
+                db.session.add(Project(name=name, pypi_package=package, current_version='1.0.0'))
+            db.session.commit()
+            
+            background_tasks.check_all_updates()
+            assert sorted(calls) == [(None, 'flask'), (None, 'rich')]
+            assert {p.name: p.current_version for p in Project.query.all()} == {
+                'one': '2.0.0', 'two': '2.0.0', 'three': '2.0.0', 'rich': '1.0.0'
+            }
+            runs = CheckRun.query.all()
+            assert len(runs) == 4
+            assert sum(run.status == 'updated' for run in runs) == 3
+    
+    def test_bulk_check_fetches_each_source_once(self, client, app, monkeypatch):
+        """Test concurrent checks share one request per source"""
+        calls = []
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._counting_fetch(calls))
+        with app.app_context():
+            for name, package in (('one', 'Flask'), ('two', 'flask')):
+                db.session.add(Project(name=name, pypi_package=package, current_version='1.0.0', category='lib'))
+            db.session.commit()
+        
+        response = client.post('/api/check-updates', json={'category': 'lib'})
+        data = json.loads(response.data)
+        assert [r['status'] for r in data['results']] == ['updated', 'updated']
+        assert calls == [(None, 'flask')]
+    
+    def test_resolve_rows_inserted_without_orm(self, app):
+        """Test bulk inserted projects are linked before a sweep"""
+        with app.app_context():
+            db.session.execute(db.insert(Project), [
+                {'name': 'x', 'pypi_package': 'Rich', 'active': True},
+                {'name': 'y', 'github_repo': 'https://github.com/Textualize/rich', 'active': True}
+            ])
+            db.session.commit()
+            assert resolve_missing_sources() == 2
+            projects = {p.name: p for p in Project.query.all()}
+            assert projects['x'].pypi_source.key == 'rich'
+            assert projects['y'].github_source.key == 'textualize/rich'
+            assert resolve_missing_sources() == 0
+
+class TestReleaseAnalytics:
+    """Tests for release-cadence rollups and analytics routes"""
+    
+    def _seed(self, app):
+        now = datetime.utcnow()
+        with app.app_context():
+            busy = Project(name='busy', pypi_package='busy', category='lib')
+            quiet = Project(name='quiet', pypi_package='quiet', category='lib')
+            db.session.add_all([busy, quiet])
+            db.session.flush()
+            for days_ago in (40, 30, 20, 0):
+                db.session.add(Version(project_id=busy.id, version_number=f'1.{days_ago}',
+                                       release_date=now - timedelta(days=days_ago)))
+            db.session.add(Version(project_id=busy.id, version_number='2.0rc1', is_prerelease=True, release_date=now))
+            db.session.add(Version(project_id=quiet.id, version_number='0.1', release_date=now - timedelta(days=400)))
+            for update_type in ('minor', 'minor', 'patch', 'major'):
+                db.session.add(Update(project_id=busy.id, new_version='x', update_type=update_type))
+            db.session.commit()
+            return busy.id, quiet.id
+    
+    def test_refresh_computes_cadence(self, app):
+        """Test intervals, monthly rate and update type counts of a project"""
+        busy_id, quiet_id = self._seed(app)
+        with app.app_context():
+            assert refresh_release_analytics() == 2
+            cadence = db.session.get(ReleaseCadence, busy_id)
+            assert cadence.releases == 4
+            assert cadence.median_interval_days == 10.0
+            assert cadence.p90_interval_days == 18.0
+            assert cadence.releases_per_month == round(3 / (40 / 30.44), 3)
+            assert (cadence.major_updates, cadence.minor_updates, cadence.patch_updates) == (1, 2, 1)
+            assert db.session.get(ReleaseCadence, quiet_id).median_interval_days is None
+            assert refresh_release_analytics() == 0
+    
+    def test_refresh_is_incremental(self, app):
+        """Test only projects with new versions are recomputed"""
+        busy_id, quiet_id = self._seed(app)
+        with app.app_context():
+            refresh_release_analytics()
+            before = db.session.get(ReleaseCadence, busy_id).refreshed_at
+            db.session.add(Version(project_id=quiet_id, version_number='0.2', release_date=datetime.utcnow()))
+            db.session.commit()
+            
+            assert refresh_release_analytics() == 1
+            db.session.expire_all()
+            assert db.session.get(ReleaseCadence, busy_id).refreshed_at == before
+            assert db.session.get(ReleaseCadence, quiet_id).releases == 2
+    
+    def test_analytics_routes(self, client, app):
+        """Test summary, stale and project routes read the rollups"""
+        busy_id, quiet_id = self._seed(app)
+        with app.app_context():
+            refresh_release_analytics()
+        
+        summary = json.loads(client.get('/api/analytics/summary?months=6').data)
+        assert summary['projects'] == 2
+        assert summary['releases'] == 5
+        assert summary['stale_projects'] == 1
+        assert summary['update_types']['shares']['minor'] == 0.5
+        assert sum(entry['releases'] for entry in summary['monthly']) == 4
+        
+        stale = json.loads(client.get('/api/analytics/stale?months=6').data)
+        assert [p['name'] for p in stale['projects']] == ['quiet']
+        
+        project = json.loads(client.get(f'/api/analytics/projects/{busy_id}').data)
+        assert project['median_interval_days'] == 10.0
+        assert client.get('/api/analytics/projects/999').status_code == 404
+    
+    def test_sweep_refreshes_analytics(self, app, monkeypatch):
+        """Test a sweep updates the rollup of a project with a new release"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: {'version_number': '2.0.0'})
+        with app.app_context():
+            db.session.add(Project(name='flask', pypi_package='flask', current_version='1.0.0'))
+            db.session.commit()
+            background_tasks.check_all_updates()
+            cadence = ReleaseCadence.query.one()
+            assert cadence.releases == 1
+            assert cadence.major_updates == 1
+
+class TestSweepCheckpoints:
+    """Tests for checkpointed, resumable sweeps"""
+    
+    class Crash(BaseException):
+        """Stands in for the process dying mid-sweep"""
+    
+    def _create(self, app):
+        now = datetime.utcnow()
+        with app.app_context():
+            db.session.add_all([
+                Project(name='recent', pypi_package='recent', last_checked=now - timedelta(hours=1)),
+                Project(name='never', pypi_package='never'),
+                Project(name='old', pypi_package='old', last_checked=now - timedelta(days=2)),
+                Project(name='older', pypi_package='older', last_checked=now - timedelta(days=3))
+            ])
+            db.session.commit()
+    
+    def test_sweep_orders_by_last_checked(self, app, monkeypatch):
+        """Test never checked projects go first, then the oldest checks"""
+        calls = []
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: calls.append(pypi_package))
+        self._create(app)
+        with app.app_context():
+            background_tasks.check_all_updates()
+            assert calls == ['never', 'older', 'old', 'recent']
+            checkpoint = SweepCheckpoint.query.one()
+            assert (checkpoint.status, checkpoint.cursor, checkpoint.total) == ('completed', 4, 4)
+    
+    def test_interrupted_sweep_resumes(self, app, monkeypatch):
+        """Test a restarted sweep checks only the projects it had not reached"""
+        calls = []
+        
+        def crashing(github_repo, pypi_package):
+            if len(calls) == 2:
+                raise self.Crash()
+            calls.append(pypi_package)
+        
+        app.config['SWEEP_CHECKPOINT_INTERVAL'] = 1
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', crashing)
+        self._create(app)
+        with app.app_context():
+            with pytest.raises(self.Crash):
+                background_tasks.check_all_updates()
+            checkpoint = SweepCheckpoint.query.one()
+            assert (checkpoint.status, checkpoint.cursor) == ('running', 2)
+            assert SweepCheckpointProject.query.count() == 2
+            sweep_id = checkpoint.sweep_id
+            assert unfinished_sweep()['sweep_id'] == sweep_id
+            
+            resumed = []
+            monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: resumed.append(pypi_package))
+            background_tasks.check_all_updates()
+            assert resumed == ['old', 'recent']
+            db.session.expire_all()
+            checkpoint = SweepCheckpoint.query.one()
+            assert (checkpoint.status, checkpoint.resumes, checkpoint.cursor) == ('completed', 1, 4)
+            assert SweepCheckpointProject.query.count() == 0
+            assert {run.sweep_id for run in CheckRun.query.all()} == {sweep_id}
+            assert unfinished_sweep() is None
+    
+    def test_stale_checkpoint_is_abandoned(self, app, monkeypatch):
+        """Test a checkpoint older than the max age starts a new sweep"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: None)
+        self._create(app)
+        with app.app_context():
+            stale = SweepCheckpoint(sweep_id='stale', cursor=2, updated_at=datetime.utcnow() - timedelta(days=2))
+            db.session.add(stale)
+            db.session.commit()
+            db.session.add_all([SweepCheckpointProject(checkpoint_id=stale.id, project_id=project_id)
+                                for project_id in (1, 2)])
+            db.session.commit()
+            background_tasks.check_all_updates()
+            statuses = {c.sweep_id: c.status for c in SweepCheckpoint.query.all()}
+            assert statuses.pop('stale') == 'abandoned'
+            assert list(statuses.values()) == ['completed']
+            assert CheckRun.query.count() == 4
+            assert SweepCheckpointProject.query.count() == 0
+    
+    def test_persistent_job_keeps_next_run_time(self, tmp_path):
+        """Test a restarted scheduler keeps the stored schedule instead of re-adding the job"""
+        from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+        from apscheduler.schedulers.background import BackgroundScheduler
+        
+        url = f'sqlite:///{tmp_path / "jobs.db"}'
+        first = BackgroundScheduler(jobstores={'default': SQLAlchemyJobStore(url=url)}, timezone='UTC')
+        first.start(paused=True)
+        job = background_tasks._ensure_interval_job(first, 'check_updates', 'background_tasks:scheduled_check_job', 3600)
+        next_run = job.next_run_time
+        first.shutdown(wait=False)
+        
+        second = BackgroundScheduler(jobstores={'default': SQLAlchemyJobStore(url=url)}, timezone='UTC')
+        second.start(paused=True)
+        try:
+            time.sleep(0.01)
+            kept = background_tasks._ensure_interval_job(second, 'check_updates', 'background_tasks:scheduled_check_job', 3600)
+            assert kept.next_run_time == next_run
+            changed = background_tasks._ensure_interval_job(second, 'check_updates', 'background_tasks:scheduled_check_job', 600)
+            assert changed.trigger.interval.total_seconds() == 600
+        finally:
+            second.shutdown(wait=False)
+
+class TestCheckPriority:
+    """Tests for priority-ordered sweeps with an upstream budget"""
+    
+    def _create(self, app, **projects):
+        checked = datetime.utcnow() - timedelta(hours=2)
+        with app.app_context():
+            for name, fields in projects.items():
+                db.session.add(Project(name=name, pypi_package=name, last_checked=checked, **fields))
+            db.session.commit()
+            return {p.name: p.id for p in Project.query.all()}
+    
+    def test_sweep_checks_important_projects_first(self, app, monkeypatch):
+        """Test priority, notify setting and interest order the sweep"""
+        calls = []
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: calls.append(pypi_package))
+        ids = self._create(
+            app,
+            quiet={'notify_on_update': False},
+            watched={'notify_on_update': False},
+            critical={'notify_on_update': False, 'priority': 2},
+            notify={}
+        )
+        with app.app_context():
+            for _ in range(3):
+                record_interest(ids['watched'])
+            background_tasks.check_all_updates()
+        assert calls == ['critical', 'watched', 'notify', 'quiet']
+    
+    def test_budget_defers_rest_and_aging_prevents_starvation(self, app, monkeypatch):
+        """Test a tight budget checks the top projects and the deferred ones go first next time"""
+        calls = []
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: calls.append(pypi_package))
+        app.config['SWEEP_UPSTREAM_BUDGET'] = 2
+        self._create(app, low={'priority': -1}, normal={}, high={'priority': 1}, critical={'priority': 2})
+        with app.app_context():
+            background_tasks.check_all_updates()
+            assert calls == ['critical', 'high']
+            # Deferred projects have waited twelve check intervals by now
+            app.config['UPDATE_CHECK_INTERVAL'] = 600
+            background_tasks.check_all_updates()
+            assert calls[2:] == ['normal', 'low']
+            assert SweepCheckpoint.query.filter_by(status='completed').count() == 2
+    
+    def test_aging_outranks_priority(self, app):
+        """Test a long unchecked low priority project beats a just checked critical one"""
+        now = datetime.utcnow()
+        scorer = PriorityScorer(check_interval=3600, now=now)
+        with app.app_context():
+            low = Project(name='low', priority=-1, notify_on_update=False, last_checked=now - timedelta(days=1))
+            critical = Project(name='critical', priority=2, last_checked=now)
+            assert scorer.score(low) > scorer.score(critical)
+    
+    def test_page_view_records_interest(self, client, app):
+        """Test viewing project.html raises interest without touching updated_at"""
+        ids = self._create(app, flask={})
+        with app.app_context():
+            updated_at = db.session.get(Project, ids['flask']).updated_at
+        
+        assert client.get(f'/project/{ids["flask"]}').status_code == 200
+        client.get(f'/project/{ids["flask"]}')
+        with app.app_context():
+            project = db.session.get(Project, ids['flask'])
+            assert 1.9 < project.interest <= 2.0
+            assert project.updated_at == updated_at
+    
+    def test_priority_validation(self, client):
+        """Test priority accepts level names and integers in range"""
+        response = client.post('/api/projects', json={'name': 'a', 'priority': 'critical'})
+        assert json.loads(response.data)['priority'] == 2
+        assert client.post('/api/projects', json={'name': 'b', 'priority': 7}).status_code == 400
+        project_id = json.loads(response.data)['id']
+        response = client.put(f'/api/projects/{project_id}', json={'priority': -1})
+        assert json.loads(response.data)['priority'] == -1
+        assert client.put(f'/api/projects/{project_id}', json={'priority': 'urgent'}).status_code == 400
+
+class TestGitHubWebhooks:
+    """Tests for signed GitHub release webhooks"""
+    
+    SECRET = 'webhook-secret'
+    
+    @staticmethod
+    def _release_event(tag, action='published', repo='Pallets/Flask', prerelease=False):
+        return {
+            'action': action,
+            'release': {
+                'tag_name': tag,
+                'html_url': f'https://github.com/{repo}/releases/tag/{tag}',
+                'published_at': '2026-10-01T12:00:00Z',
+                'prerelease': prerelease,
+                'draft': False,
+                'body': 'Release notes'
+            },
+            'repository': {'full_name': repo, 'html_url': f'https://github.com/{repo}'}
+        }
+    
+    def _send(self, client, payload, event='release', secret=None):
+        import hashlib
+        import hmac
+        
+        body = json.dumps(payload).encode('utf-8')
+        signature = hmac.new((secret or self.SECRET).encode('utf-8'), body, hashlib.sha256).hexdigest()
+        return client.post('/api/webhooks/github', data=body, content_type='application/json', headers={
+            'X-GitHub-Event': event,
+            'X-Hub-Signature-256': f'sha256={signature}'
+        })
+    
+    def _create(self, app):
+        app.config['GITHUB_WEBHOOK_SECRET'] = self.SECRET
+        with app.app_context():
+            db.session.add_all([
+                Project(name='flask', github_repo='https://github.com/pallets/flask', current_version='3.0.0'),
+                Project(name='flask-fork', github_repo='https://github.com/pallets/flask.git', current_version='3.0.0'),
+                Project(name='rich', github_repo='https://github.com/Textualize/rich', current_version='13.0.0')
+            ])
+            db.session.commit()
+            return {p.name: p.id for p in Project.query.all()}
+    
+    def test_release_event_applies_update(self, client, app):
+        """Test a signed release event records the version and update for every tracking project"""
+        ids = self._create(app)
+        response = self._send(client, self._release_event('3.1.0'))
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['repository'] == 'pallets/flask'
+        assert {r['name']: r['status'] for r in data['results']} == {'flask': 'updated', 'flask-fork': 'updated'}
+        
+        with app.app_context():
+            project = db.session.get(Project, ids['flask'])
+            assert project.current_version == '3.1.0'
+            assert project.last_checked is not None
+            assert Update.query.filter_by(project_id=ids['flask']).one().update_type == 'minor'
+            assert db.session.get(Project, ids['rich']).current_version == '13.0.0'
+            runs = CheckRun.query.all()
+            assert {(run.trigger, run.source, run.upstream_calls) for run in runs} == {('webhook', 'webhook', 0)}
+        
+        # Redelivery of the same event changes nothing
+        data = json.loads(self._send(client, self._release_event('3.1.0')).data)
+        assert {r['status'] for r in data['results']} == {'up_to_date'}
+    
+    def test_signature_is_required(self, client, app):
+        """Test unsigned or wrongly signed deliveries are rejected"""
+        self._create(app)
+        assert self._send(client, self._release_event('3.1.0'), secret='wrong').status_code == 401
+        response = client.post('/api/webhooks/github', json=self._release_event('3.1.0'), headers={'X-GitHub-Event': 'release'})
+        assert response.status_code == 401
+        
+        app.config['GITHUB_WEBHOOK_SECRET'] = None
+        assert self._send(client, self._release_event('3.1.0')).status_code == 404
+    
+    def test_ignored_events(self, client, app):
+        """Test prereleases, older backports, other actions and untracked repos are not applied"""
+        ids = self._create(app)
+        assert self._send(client, self._release_event('3.2.0rc1', prerelease=True)).status_code == 202
+        assert self._send(client, self._release_event('3.2.0', action='created')).status_code == 202
+        assert self._send(client, self._release_event('1.0.0', repo='other/repo')).status_code == 202
+        assert self._send(client, {'zen': 'Keep it simple', 'repository': {'full_name': 'pallets/flask'}}, event='ping').status_code == 200
+        
+        data = json.loads(self._send(client, self._release_event('2.3.9')).data)
+        assert {r['status'] for r in data['results']} == {'older_release'}
+        with app.app_context():
+            assert db.session.get(Project, ids['flask']).current_version == '3.0.0'
+    
+    def test_webhook_projects_use_fallback_interval(self, client, app, monkeypatch):
+        """Test the sweep skips push-enabled projects checked within the fallback interval"""
+        calls = []
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: calls.append(github_repo))
+        self._create(app)
+        self._send(client, self._release_event('3.1.0'))
+        
+        with app.app_context():
+            background_tasks.check_all_updates()
+            assert calls == ['textualize/rich']
+            
+            app.config['WEBHOOK_FALLBACK_INTERVAL'] = 0
+            background_tasks.check_all_updates()
+            assert sorted(calls[1:]) == ['pallets/flask', 'textualize/rich']
+
+class TestDependencyImpact:
+    """Tests for the dependency graph and impact endpoint"""
+    
+    REQUIRES = {
+        'werkzeug': [],
+        'flask': ['Werkzeug>=3.0', 'click>=8.1', 'python-dotenv; extra == "dotenv"'],
+        'webapp': ['flask (>=3.0)'],
+        'cli-tool': ['click'],
+        'docs': ['webapp[extras]; extra == "docs"']
+    }
+    
+    def _fetch(self, requires):
+        def fetch(github_repo, pypi_package):
+            return {'version_number': '1.0.0', 'requires_dist': requires.get(pypi_package)}
+        return fetch
+    
+    def _check_all(self, client, app, monkeypatch, requires):
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', self._fetch(requires))
+        with app.app_context():
+            if not Project.query.count():
+                for name in list(requires) + ['click', 'python-dotenv']:
+                    db.session.add(Project(name=name.title(), pypi_package=name))
+                db.session.commit()
+            ids = {p.pypi_package: p.id for p in Project.query.all()}
+        client.post('/api/check-updates', json={'project_ids': list(ids.values())})
+        return ids
+    
+    def _impact(self, client, project_id, **params):
+        query = '&'.join(f'{key}={value}' for key, value in params.items())
+        return json.loads(client.get(f'/api/projects/{project_id}/impact?{query}').data)
+    
+    def test_transitive_impact(self, client, app, monkeypatch):
+        """Test impact lists transitive dependents nearest first"""
+        ids = self._check_all(client, app, monkeypatch, self.REQUIRES)
+        
+        data = self._impact(client, ids['werkzeug'])
+        assert [(item['name'], item['depth']) for item in data['affected']] == [('Flask', 1), ('Webapp', 2)]
+        assert data['affected'][1]['via']['name'] == 'Flask'
+        
+        click_impact = {item['name'] for item in self._impact(client, ids['click'])['affected']}
+        assert click_impact == {'Flask', 'Cli-Tool', 'Webapp'}
+        assert self._impact(client, ids['click'], max_depth=1)['count'] == 2
+        
+        # Extras only count when asked for
+        assert self._impact(client, ids['python-dotenv'])['count'] == 0
+        optional = self._impact(client, ids['werkzeug'], include_optional='true')
+        assert {item['name'] for item in optional['affected']} == {'Flask', 'Webapp', 'Docs'}
+    
+    def test_dependencies_endpoint(self, client, app, monkeypatch):
+        """Test requirements resolve to tracked projects and list direct dependents"""
+        ids = self._check_all(client, app, monkeypatch, self.REQUIRES)
+        data = json.loads(client.get(f'/api/projects/{ids["flask"]}/dependencies').data)
+        requires = {edge['dependency_name']: edge for edge in data['requires']}
+        assert requires['werkzeug']['project_id'] == ids['werkzeug']
+        assert requires['werkzeug']['specifier'] == '>=3.0'
+        assert requires['python-dotenv']['optional'] is True
+        assert [item['name'] for item in data['dependents']] == ['Webapp']
+    
+    def test_graph_updated_incrementally(self, client, app, monkeypatch):
+        """Test changed requirements patch the cached graph"""
+        ids = self._check_all(client, app, monkeypatch, self.REQUIRES)
+        assert self._impact(client, ids['werkzeug'])['count'] == 2
+        
+        changed = dict(self.REQUIRES, webapp=['click'])
+        self._check_all(client, app, monkeypatch, changed)
+        assert [item['name'] for item in self._impact(client, ids['werkzeug'])['affected']] == ['Flask']
+        
+        client.delete(f'/api/projects/{ids["flask"]}')
+        assert self._impact(client, ids['werkzeug'])['count'] == 0
+    
+    def test_github_releases_keep_edges(self, client, app, monkeypatch):
+        """Test a release without requires_dist leaves stored edges alone"""
+        ids = self._check_all(client, app, monkeypatch, self.REQUIRES)
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: {'version_number': '2.0.0'})
+        client.post(f'/api/projects/{ids["flask"]}/check-update')
+        assert self._impact(client, ids['werkzeug'])['count'] == 2
+
+class TestOutdatedRoute:
+    """Tests for bulk outdated evaluation"""
+    
+    def test_outdated_requirements(self, client):
+        """Test pins are classified against tracked latest versions"""
+        client.post('/api/projects:import', data='\n'.join([
+            json.dumps({'name': 'Flask', 'pypi_package': 'flask'}),
+            json.dumps({'name': 'PyYAML', 'pypi_package': 'PyYAML'}),
+            json.dumps({'name': 'requests'})
+        ]))
+        projects = json.loads(client.get('/api/projects').data)['projects']
+        with client.application.app_context():
+            for project in projects:
+                Project.query.get(project['id']).latest_version = {
+                    'Flask': '3.1.0', 'PyYAML': '6.0.1', 'requests': '2.31.0'
+                }[project['name']]
+            db.session.commit()
+        from cache import response_cache
+        response_cache.invalidate('projects')
+        
+        content = 'flask==2.3.3\npyyaml==6.0.1\nRequests==3.0.0\nrich==13.0.0\nclick>=8\n'
+        response = client.post('/api/outdated', data={
+            'file': (io.BytesIO(content.encode()), 'requirements.txt')
+        }, content_type='multipart/form-data')
+        data = json.loads(response.data)
+        
+        statuses = {r['name']: (r['status'], r['update_type']) for r in data['results']}
+        assert statuses == {
+            'flask': ('outdated', 'major'),
+            'pyyaml': ('current', None),
+            'Requests': ('ahead', None),
+            'rich': ('untracked', None),
+            'click': ('untracked', None),
+        }
+        assert data['summary']['outdated'] == 1
+        
+        response = client.post('/api/outdated?only_outdated=true', data=content)
+        assert [r['name'] for r in json.loads(response.data)['results']] == ['flask']
+    
+    def test_outdated_reports_invalid_pins(self, client, app):
+        """Test an unparseable pinned version is reported as invalid, not current"""
+        with app.app_context():
+            db.session.add(Project(name='Flask', pypi_package='flask', latest_version='3.1.0'))
+            db.session.commit()
+        
+        response = client.post('/api/outdated?filename=requirements.txt', data='flask==latest\n')
+        result = json.loads(response.data)['results'][0]
+        assert (result['pinned'], result['status'], result['update_type']) == ('latest', 'invalid', None)
+    
+    def test_outdated_requires_file(self, client):
+        """Test empty upload is rejected"""
+        assert client.post('/api/outdated').status_code == 400
+    
+    def test_outdated_rejects_wrong_shape(self, client):
+        """Test that a pyproject.toml of the wrong shape is a 400, not a 500"""
+        response = client.post('/api/outdated?format=pyproject', data='project = 1')
+        assert response.status_code == 400
+        assert 'project' in json.loads(response.data)['error']
+
 class TestStatisticsRoutes:
     """Tests for statistics routes"""
     
@@ -140,6 +1032,206 @@ class TestStatisticsRoutes:
             deleted_project = Project.query.get(project_id)
             assert deleted_project is None
 
+class TestSerialization:
+    """Tests for projected list serialization and compression"""
+    
+    def test_project_list_matches_to_dict(self, client, app):
+        """Test that projected rows serialize exactly like Project.to_dict"""
+        with app.app_context():
+            project = Project(name='Test Project', current_version='1.0.0')
+            db.session.add(project)
+            db.session.commit()
+            db.session.add(Version(project_id=project.id, version_number='1.0.0'))
+            db.session.commit()
+            expected = project.to_dict()
+        
+        data = json.loads(client.get('/api/projects').data)
+        assert data['projects'] == [expected]
+        assert data['pages'] == 1
+    
+    def test_sparse_fieldset(self, client):
+        """Test selecting a subset of fields"""
+        client.post('/api/projects', json={'name': 'Test Project', 'category': 'library'})
+        
+        data = json.loads(client.get('/api/projects?fields=name,category').data)
+        assert data['projects'] == [{'name': 'Test Project', 'category': 'library'}]
+        
+        response = client.get('/api/updates/history?fields=id,bogus')
+        assert response.status_code == 400
+    
+    def test_compact_json(self, client):
+        """Test that responses are not pretty-printed outside development"""
+        response = client.get('/api/projects')
+        assert b'\n  ' not in response.data
+        assert b'": ' not in response.data
+    
+    def test_gzip_large_payload(self, client, app):
+        """Test gzip is negotiated for large responses only"""
+        with app.app_context():
+            for i in range(20):
+                db.session.add(Project(name=f'Project {i}', description='x' * 100))
+            db.session.commit()
+        
+        response = client.get('/api/projects', headers={'Accept-Encoding': 'gzip'})
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert len(json.loads(gzip.decompress(response.data))['projects']) == 20
+        
+        response = client.get('/api/statistics', headers={'Accept-Encoding': 'gzip'})
+        assert 'Content-Encoding' not in response.headers
+
+class TestConditionalRequests:
+    """Tests for ETag validators on read endpoints"""
+    
+    def test_projects_etag_not_modified(self, client):
+        """Test that a matching If-None-Match returns 304"""
+        client.post('/api/projects', json={'name': 'Test Project'})
+        
+        response = client.get('/api/projects')
+        etag = response.headers['ETag']
+        assert etag.startswith('W/')
+        assert response.headers['Cache-Control'] == 'public, no-cache'
+        
+        response = client.get('/api/projects', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert response.data == b''
+    
+    def test_project_etag_changes_after_write(self, client):
+        """Test that updating a project invalidates its ETag"""
+        response = client.post('/api/projects', json={'name': 'Test Project'})
+        project_id = json.loads(response.data)['id']
+        
+        etag = client.get(f'/api/projects/{project_id}').headers['ETag']
+        client.put(f'/api/projects/{project_id}', json={'description': 'Updated'})
+        
+        response = client.get(f'/api/projects/{project_id}', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert response.headers['ETag'] != etag
+    
+    def test_project_if_modified_since(self, client, app):
+        """Test Last-Modified on a project and If-Modified-Since without an ETag"""
+        with app.app_context():
+            project = Project(name='Test Project')
+            db.session.add(project)
+            db.session.commit()
+            project_id = project.id
+            db.session.execute(db.update(Project).where(Project.id == project_id).values(
+                updated_at=datetime(2024, 1, 2, 3, 4, 5)
+            ))
+            db.session.commit()
+        
+        response = client.get(f'/api/projects/{project_id}')
+        assert response.headers['Last-Modified'] == 'Tue, 02 Jan 2024 03:04:05 GMT'
+        response = client.get(f'/api/projects/{project_id}', headers={'If-Modified-Since': response.headers['Last-Modified']})
+        assert response.status_code == 304
+        
+        client.put(f'/api/projects/{project_id}', json={'description': 'Updated'})
+        response = client.get(f'/api/projects/{project_id}', headers={'If-Modified-Since': 'Tue, 02 Jan 2024 03:04:05 GMT'})
+        assert response.status_code == 200
+        
+        # Collections validate by ETag only, as timestamps miss deletions
+        response = client.get('/api/projects', headers={'If-Modified-Since': 'Tue, 02 Jan 2024 03:04:05 GMT'})
+        assert response.status_code == 200
+        assert 'Last-Modified' not in response.headers
+    
+    def test_history_etag_changes_after_mark_read(self, client, app):
+        """Test that marking notifications read changes the history ETag"""
+        with app.app_context():
+            project = Project(name='Test Project')
+            db.session.add(project)
+            db.session.commit()
+            db.session.add(Update(project_id=project.id, old_version='1.0.0', new_version='1.1.0'))
+            db.session.commit()
+        
+        etag = client.get('/api/updates/history').headers['ETag']
+        client.post('/api/notifications/mark-read/Test Project')
+        
+        response = client.get('/api/updates/history', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+
+class TestNotificationStream:
+    """Tests for the server-sent notification stream"""
+    
+    def test_stream_resumes_after_last_event_id(self, client, app):
+        """Test that the stream replays only updates after Last-Event-ID"""
+        with app.app_context():
+            project = Project(name='Test Project')
+            db.session.add(project)
+            db.session.commit()
+            first = Update(project_id=project.id, old_version='1.0.0', new_version='1.1.0')
+            second = Update(project_id=project.id, old_version='1.1.0', new_version='1.2.0')
+            db.session.add_all([first, second])
+            db.session.commit()
+            first_id, second_id = first.id, second.id
+        
+        app.config['SSE_MAX_STREAM_DURATION'] = 0
+        response = client.get('/api/notifications/stream', headers={'Last-Event-ID': str(first_id)})
+        assert response.status_code == 200
+        assert response.mimetype == 'text/event-stream'
+        
+        body = response.get_data(as_text=True)
+        assert f'id: {second_id}' in body
+        assert f'id: {first_id}\n' not in body
+        assert '"new_version": "1.2.0"' in body
+    
+    def test_stream_over_cap_is_refused(self, client, app):
+        """Test that streams beyond SSE_MAX_STREAMS get 503 with Retry-After"""
+        from services.event_broker import event_broker
+        
+        app.config['SSE_MAX_STREAMS'] = 1
+        app.config['SSE_MAX_STREAM_DURATION'] = 0
+        held = event_broker.subscribe()
+        try:
+            response = client.get('/api/notifications/stream')
+            assert response.status_code == 503
+            assert response.headers['Retry-After'] == str(app.config['SSE_HEARTBEAT_INTERVAL'])
+        finally:
+            event_broker.unsubscribe(held)
+        
+        response = client.get('/api/notifications/stream')
+        assert response.status_code == 200
+        response.get_data()
+        assert event_broker.subscriber_count() == 0
+    
+    def test_unread_notifications_include_project_name(self, client, app):
+        """Test unread notifications endpoint"""
+        with app.app_context():
+            project = Project(name='Test Project')
+            db.session.add(project)
+            db.session.commit()
+            db.session.add(Update(project_id=project.id, old_version='1.0.0', new_version='2.0.0'))
+            db.session.commit()
+        
+        data = json.loads(client.get('/api/notifications/unread').data)
+        assert data['count'] == 1
+        assert data['notifications'][0]['project'] == 'Test Project'
+
+class TestDashboardRoute:
+    """Tests for the aggregated dashboard endpoint"""
+    
+    def test_dashboard_payload(self, client, app, monkeypatch):
+        """Test dashboard aggregates statistics and recent updates"""
+        monkeypatch.setattr(background_tasks, 'fetch_update_info', lambda github_repo, pypi_package: {'version_number': '2.0.0'})
+        response = client.post('/api/projects', json={'name': 'Test Project', 'current_version': '1.0.0'})
+        client.post(f'/api/projects/{json.loads(response.data)["id"]}/check-update')
+        
+        data = json.loads(client.get('/api/dashboard').data)
+        assert data['statistics']['total_projects'] == 1
+        assert data['statistics']['total_updates'] == 1
+        assert data['unread_count'] == 1
+        assert data['recent_updates'][0]['project'] == 'Test Project'
+        assert 'next_run_time' in data['scheduler']
+    
+    def test_dashboard_etag_tracks_writes(self, client):
+        """Test dashboard is served from memory until a write invalidates it"""
+        etag = client.get('/api/dashboard').headers['ETag']
+        assert client.get('/api/dashboard', headers={'If-None-Match': etag}).status_code == 304
+        
+        client.post('/api/projects', json={'name': 'Test Project'})
+        response = client.get('/api/dashboard', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        assert json.loads(response.data)['statistics']['total_projects'] == 1
+
 class TestHealthRoute:
     """Tests for health check route"""
     
@@ -149,3 +1241,103 @@ class TestHealthRoute:
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['status'] == 'healthy'
+
+class TestStartup:
+    """Tests for startup phases and the migrate command"""
+    
+    # Tables as created by the first release, before any schema upgrade
+    PRE_SERIES_SCHEMA = """
+        CREATE TABLE projects (
+            id INTEGER PRIMARY KEY, name VARCHAR(255) NOT NULL UNIQUE, description TEXT,
+            github_repo VARCHAR(255) UNIQUE, pypi_package VARCHAR(255) UNIQUE, category VARCHAR(100),
+            current_version VARCHAR(50), latest_version VARCHAR(50), latest_release_date DATETIME,
+            active BOOLEAN, notify_on_update BOOLEAN, created_at DATETIME, updated_at DATETIME,
+            last_checked DATETIME
+        );
+        CREATE TABLE versions (
+            id INTEGER PRIMARY KEY, project_id INTEGER NOT NULL REFERENCES projects (id),
+            version_number VARCHAR(50) NOT NULL, release_date DATETIME, download_url VARCHAR(500),
+            changelog_url VARCHAR(500), is_prerelease BOOLEAN, is_latest BOOLEAN, created_at DATETIME
+        );
+        CREATE TABLE updates (
+            id INTEGER PRIMARY KEY, project_id INTEGER NOT NULL REFERENCES projects (id),
+            old_version VARCHAR(50), new_version VARCHAR(50) NOT NULL, description TEXT,
+            update_type VARCHAR(20), detected_at DATETIME, release_date DATETIME,
+            notified BOOLEAN, notified_at DATETIME
+        );
+        INSERT INTO projects (name, pypi_package, active, notify_on_update, created_at, updated_at)
+        VALUES ('Flask', 'flask', 1, 1, '2024-01-01 00:00:00', '2024-01-01 00:00:00');
+    """
+    
+    def test_create_app_upgrades_old_database(self, tmp_path, monkeypatch):
+        """Test create_app adds the columns and tables a database from the first release lacks"""
+        import sqlite3
+        from sqlalchemy import inspect
+        from app import create_app
+        from config import config
+        
+        path = tmp_path / 'old.db'
+        connection = sqlite3.connect(path)
+        connection.executescript(self.PRE_SERIES_SCHEMA)
+        connection.close()
+        
+        monkeypatch.setattr(config['testing'], 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{path}')
+        upgraded = create_app('testing')
+        try:
+            with upgraded.app_context():
+                columns = {c['name'] for c in inspect(db.engine).get_columns('projects')}
+                assert {'priority', 'github_source_id', 'pypi_source_id'} <= columns
+            response = upgraded.test_client().get('/api/projects?q=flask')
+            assert response.status_code == 200
+            assert [p['name'] for p in json.loads(response.data)['projects']] == ['Flask']
+        finally:
+            with upgraded.app_context():
+                db.session.remove()
+                db.engine.dispose()
+    
+    def test_import_starts_no_scheduler(self):
+        """Test importing background tasks builds no clients or scheduler threads"""
+        import os
+        import subprocess
+        import sys
+        
+        code = 'import background_tasks as bt; print(bt.github_service is None, bt.scheduler is None)'
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True, cwd=root).stdout
+        assert output.split() == ['True', 'True']
+    
+    def test_upstream_services_use_config(self, app):
+        """Test lazily built clients pick up tokens and base URLs from config"""
+        app.config['PYPI_API_BASE_URL'] = 'http://mirror.invalid/pypi'
+        background_tasks.init_services(app)
+        
+        github, pypi = background_tasks.get_upstream_services()
+        assert github.token == 'test-token-for-testing'
+        assert pypi.base_url == 'http://mirror.invalid/pypi'
+    
+    def test_migrate_adds_missing_columns(self, app, runner):
+        """Test migrate upgrades a table created by an older schema"""
+        from sqlalchemy import inspect, text
+        
+        db.session.execute(text('DROP TABLE notification_outbox'))
+        db.session.execute(text('ALTER TABLE projects DROP COLUMN notify_on_update'))
+        db.session.commit()
+        
+        result = runner.invoke(args=['migrate'])
+        assert 'Created table: notification_outbox' in result.output
+        assert 'Created column: projects.notify_on_update' in result.output
+        assert 'notify_on_update' in {c['name'] for c in inspect(db.engine).get_columns('projects')}
+        
+        result = runner.invoke(args=['migrate'])
+        assert 'Created' not in result.output
+    
+    def test_migrate_drops_retired_columns(self, app, runner):
+        """Test migrate removes the old NOT NULL completed_ids column so checkpoints can be written"""
+        from sqlalchemy import inspect, text
+        
+        db.session.execute(text("ALTER TABLE sweep_checkpoints ADD COLUMN completed_ids TEXT NOT NULL DEFAULT '[]'"))
+        db.session.commit()
+        
+        result = runner.invoke(args=['migrate'])
+        assert 'Dropped column: sweep_checkpoints.completed_ids' in result.output
+        assert 'completed_ids' not in {c['name'] for c in inspect(db.engine).get_columns('sweep_checkpoints')}
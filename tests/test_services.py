@@ -1,8 +1,20 @@
 # MIT License
 
 import pytest
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from packaging import version as pkg_version
 from services.version_checker import VersionChecker
 from services.github_service import GitHubService
+from services.event_broker import EventBroker
+from services.notification_delivery import OutboxDispatcher
+from services.pypi_mirror import MirrorIndex, PyPIMirror, ingest, write_index
+from services.pypi_service import PyPIService
+from services.pypi_json import JSONStreamError, parse_package_document
+from services.requirements_parser import parse_dependency_file, DependencyFileError
 
 class TestVersionChecker:
     """Tests for VersionChecker service"""
@@ -37,6 +49,43 @@ class TestVersionChecker:
         assert VersionChecker.normalize_version('v1.0.0') == '1.0.0'
         assert VersionChecker.normalize_version('1.0.0') == '1.0.0'
 
+class TestBatchVersionChecker:
+    """Tests for batch version classification and sorting"""
+    
+    def test_classify_many(self):
+        """Test classifying many pairs in one call"""
+        result = VersionChecker.classify_many([
+            ('1.0.0', '2.0.0'),
+            ('1.0.0', '1.1.0'),
+            ('1.0.0', '1.0.1'),
+            ('1.1.0', '1.0.0'),
+            ('1.0.0', 'not a version'),
+            (None, '1.0.0')
+        ])
+        assert result == ['major', 'minor', 'patch', None, None, None]
+    
+    def test_sort_matches_packaging(self):
+        """Test that tuple keys order versions exactly like packaging"""
+        versions = [
+            '1.0', '1.0.0', '1.0.post1', '1.0.dev1', '1.0a1', '1.0a2.dev3', '1.0b1',
+            '1.0rc1', '1.0rc1.post2', '1.0+local.1', '1.0+local.a', '1.0.1', '1!0.5',
+            '0.9.9', '2.0.0.dev0', '10.0', '1.0.post1.dev2'
+        ]
+        expected = sorted(versions, key=pkg_version.parse)
+        assert [pkg_version.parse(v) for v in VersionChecker.sort_versions(versions)] == \
+            [pkg_version.parse(v) for v in expected]
+    
+    def test_sort_invalid_versions_first(self):
+        """Test that unparseable versions sort before valid ones"""
+        assert VersionChecker.sort_versions(['2.0', 'nightly', '1.0'], reverse=True) == ['2.0', '1.0', 'nightly']
+    
+    def test_parse_cache(self):
+        """Test that repeated comparisons hit the parse cache"""
+        VersionChecker.compare_versions('3.1.4', '3.1.5')
+        hits = VersionChecker.cache_info()['hits']
+        VersionChecker.compare_versions('3.1.4', '3.1.5')
+        assert VersionChecker.cache_info()['hits'] == hits + 2
+
 class TestGitHubService:
     """Tests for GitHubService"""
     
@@ -65,3 +114,490 @@ class TestGitHubService:
         """Test version normalization"""
         result = VersionChecker.normalize_version('v1.0.0')
         assert result == '1.0.0'
+
+class TestEventBroker:
+    """Tests for EventBroker"""
+    
+    def test_publish_fans_out(self):
+        """Test that every subscriber receives a published event"""
+        broker = EventBroker()
+        first = broker.subscribe()
+        second = broker.subscribe()
+        
+        broker.publish(1, 'update', {'project': 'flask'})
+        
+        assert first.get_nowait()['data'] == {'project': 'flask'}
+        assert second.get_nowait()['id'] == 1
+    
+    def test_unsubscribe(self):
+        """Test that unsubscribed queues stop receiving events"""
+        broker = EventBroker()
+        subscription = broker.subscribe()
+        broker.unsubscribe(subscription)
+        
+        broker.publish(1, 'update', {})
+        assert subscription.empty()
+        assert broker.subscriber_count() == 0
+    
+    def test_subscribe_limit(self):
+        """Test that subscribe refuses subscribers beyond the limit"""
+        broker = EventBroker()
+        first = broker.subscribe(limit=1)
+        
+        assert first is not None
+        assert broker.subscribe(limit=1) is None
+        broker.unsubscribe(first)
+        assert broker.subscribe(limit=1) is not None
+    
+    def test_watch_polls_once_for_all_subscribers(self):
+        """Test that one poller publishes new events to every subscriber"""
+        broker = EventBroker()
+        first = broker.subscribe()
+        second = broker.subscribe()
+        calls = []
+        
+        def load(cursor):
+            calls.append(cursor)
+            return [{'id': 3}, {'id': 4}] if cursor == 2 else []
+        
+        broker.watch(load, 0.01, since=2)
+        broker.watch(load, 0.01, since=2)
+        assert first.get(timeout=1)['id'] == 3
+        assert first.get(timeout=1)['id'] == 4
+        assert second.get(timeout=1)['id'] == 3
+        
+        broker.unsubscribe(first)
+        broker.unsubscribe(second)
+        time.sleep(0.05)
+        assert calls.count(2) == 1
+        assert set(calls) <= {2, 4}
+    
+    def test_format_event(self):
+        """Test event-stream wire format"""
+        assert EventBroker.format_event(5, 'update', '{}') == 'id: 5\nevent: update\ndata: {}\n\n'
+
+class TestRequirementsParser:
+    """Tests for dependency file parsing"""
+    
+    def test_requirements_txt(self):
+        """Test pins, ranges, options and continuations in requirements.txt"""
+        content = "\n".join([
+            "# comment",
+            "Flask==3.0.0  # web",
+            "requests>=2.0",
+            "-r other.txt",
+            "--index-url https://example.org/simple",
+            "PyYAML==6.0.1 \\",
+            "    --hash=sha256:abc",
+            "gunicorn==21.2.0; python_version >= '3.8'",
+        ])
+        pins = parse_dependency_file(content, filename='requirements.txt')
+        assert [(p['canonical_name'], p['version'], p['line']) for p in pins] == [
+            ('flask', '3.0.0', 2),
+            ('requests', None, 3),
+            ('pyyaml', '6.0.1', 6),
+            ('gunicorn', '21.2.0', 8),
+        ]
+    
+    def test_pyproject(self):
+        """Test PEP 621 and Poetry dependency tables"""
+        content = """
+[project]
+dependencies = ["flask==3.0.0", "rich>=13"]
+
+[tool.poetry.dependencies]
+python = "^3.11"
+attrs = "23.1.0"
+click = {version = "^8.1"}
+"""
+        pins = {p['name']: p['version'] for p in parse_dependency_file(content, filename='pyproject.toml')}
+        assert pins == {'flask': '3.0.0', 'rich': None, 'attrs': '23.1.0', 'click': None}
+    
+    def test_lockfiles(self):
+        """Test TOML and JSON lockfiles"""
+        poetry_lock = '[[package]]\nname = "Flask"\nversion = "3.0.0"\n'
+        assert parse_dependency_file(poetry_lock)[0]['version'] == '3.0.0'
+        
+        pipfile_lock = '{"default": {"flask": {"version": "==3.0.0"}}, "develop": {}}'
+        assert parse_dependency_file(pipfile_lock, filename='Pipfile.lock')[0]['version'] == '3.0.0'
+    
+    def test_invalid_toml(self):
+        """Test that malformed files raise DependencyFileError"""
+        with pytest.raises(DependencyFileError):
+            parse_dependency_file('[project', filename='pyproject.toml')
+    
+    @pytest.mark.parametrize('content,filename', [
+        ('project = 1', 'pyproject.toml'),
+        ('[project]\ndependencies = "requests"', 'pyproject.toml'),
+        ('[project]\noptional-dependencies = ["requests"]', 'pyproject.toml'),
+        ('[tool]\npoetry = "flask"', 'pyproject.toml'),
+        ('package = "flask"', 'poetry.lock'),
+        ('package = [1, 2]', 'uv.lock'),
+        ('[{"default": {}}]', 'Pipfile.lock'),
+        ('{"default": ["flask"]}', 'Pipfile.lock'),
+    ])
+    def test_unexpected_shapes(self, content, filename):
+        """Test that well-formed files of the wrong shape raise DependencyFileError"""
+        with pytest.raises(DependencyFileError):
+            parse_dependency_file(content, filename=filename)
+
+class TestDependencyParsing:
+    """Tests for requires_dist parsing"""
+    
+    def test_parse_requires_dist(self):
+        """Test names are normalized and extras marked optional"""
+        from dependency_graph import parse_requires_dist
+        
+        edges = parse_requires_dist([
+            'Jinja2>=3.1.2',
+            'typing_extensions; python_version < "3.10"',
+            'asgiref>=3.2; extra == "async"',
+            'asgiref',
+            'not a valid requirement ==='
+        ])
+        assert set(edges) == {'jinja2', 'typing-extensions', 'asgiref'}
+        assert edges['jinja2']['specifier'] == '>=3.1.2'
+        assert edges['typing-extensions']['optional'] is False
+        assert edges['typing-extensions']['marker'] == 'python_version < "3.10"'
+        # A required entry replaces an optional one for the same package
+        assert edges['asgiref']['optional'] is False
+        assert parse_requires_dist(None) == {}
+
+class TestNotificationOutbox:
+    """Tests for the notification outbox and OutboxDispatcher"""
+    
+    @pytest.fixture
+    def webhook(self):
+        """Local webhook receiver; set status to make it fail"""
+        received = []
+        state = {'status': 200}
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                received.append(json.loads(body))
+                self.send_response(state['status'])
+                self.end_headers()
+            
+            def log_message(self, *args):
+                pass
+        
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f'http://127.0.0.1:{server.server_port}/hook', received, state
+        server.shutdown()
+        server.server_close()
+    
+    def _record_update(self, project, new_version, targets):
+        from models import db, Update
+        from services.notifier import NotificationService
+        
+        update = Update(project_id=project.id, old_version=project.current_version,
+                        new_version=new_version, update_type='minor')
+        db.session.add(update)
+        NotificationService().notify_update(project, update, targets)
+        project.current_version = new_version
+        db.session.commit()
+        return update
+    
+    def _project(self):
+        from models import db, Project
+        
+        project = Project(name='flask', current_version='1.0.0')
+        db.session.add(project)
+        db.session.commit()
+        return project
+    
+    def test_outbox_committed_with_update(self, app):
+        """Test outbox rows are written in the same transaction and deduplicated"""
+        from models import NotificationOutbox
+        
+        project = self._project()
+        update = self._record_update(project, '1.1.0', ['http://a.invalid', 'http://b.invalid'])
+        
+        entries = NotificationOutbox.query.all()
+        assert {entry.update_id for entry in entries} == {update.id}
+        assert {entry.status for entry in entries} == {'pending'}
+        
+        # The same version transition is never queued twice for a target
+        project.current_version = '1.0.0'
+        self._record_update(project, '1.1.0', ['http://a.invalid'])
+        assert NotificationOutbox.query.count() == 2
+    
+    def test_dispatch_sends_digest(self, app, webhook):
+        """Test due entries for a target are delivered in one message"""
+        from models import NotificationOutbox
+        
+        url, received, _ = webhook
+        project = self._project()
+        self._record_update(project, '1.1.0', [url])
+        self._record_update(project, '1.2.0', [url])
+        
+        # Entries younger than the digest window are held back
+        assert OutboxDispatcher(digest_window=60).dispatch()['messages'] == 0
+        
+        stats = OutboxDispatcher(digest_window=0).dispatch()
+        assert stats == {'sent': 2, 'failed': 0, 'messages': 1}
+        assert received[0]['count'] == 2
+        assert [item['new_version'] for item in received[0]['updates']] == ['1.1.0', '1.2.0']
+        assert {entry.status for entry in NotificationOutbox.query.all()} == {'sent'}
+    
+    def test_dispatch_retries_with_backoff(self, app, webhook):
+        """Test failed deliveries are rescheduled and eventually marked failed"""
+        from models import db, NotificationOutbox
+        
+        url, received, state = webhook
+        state['status'] = 500
+        project = self._project()
+        self._record_update(project, '1.1.0', [url])
+        dispatcher = OutboxDispatcher(digest_window=0, max_attempts=2, retry_base_delay=60)
+        
+        assert dispatcher.dispatch()['failed'] == 1
+        entry = NotificationOutbox.query.one()
+        assert entry.status == 'pending' and entry.attempts == 1
+        assert entry.next_attempt_at > datetime.utcnow() + timedelta(seconds=30)
+        
+        # Not due yet, so nothing is sent
+        assert dispatcher.dispatch()['messages'] == 0
+        
+        entry.next_attempt_at = datetime.utcnow()
+        db.session.commit()
+        dispatcher.dispatch()
+        entry = NotificationOutbox.query.one()
+        assert entry.status == 'failed'
+        assert '500' in entry.last_error
+        assert len(received) == 2
+
+    def test_duplicate_key_race_keeps_update(self, app, monkeypatch):
+        """Test a dedupe conflict the lookup missed does not roll back the Update"""
+        from models import NotificationOutbox, Update
+        from services.notifier import NotificationService
+        
+        project = self._project()
+        self._record_update(project, '1.1.0', ['http://a.invalid'])
+        # Another check queued the key between the lookup and the insert
+        monkeypatch.setattr(NotificationService, '_queued_keys', staticmethod(lambda keys: set()))
+        project.current_version = '1.0.0'
+        self._record_update(project, '1.1.0', ['http://a.invalid'])
+        
+        assert Update.query.count() == 2
+        assert NotificationOutbox.query.count() == 1
+    
+    def test_dispatch_lock_is_shared(self, app):
+        """Test that a second dispatcher instance skips while a run is active"""
+        from services import notification_delivery
+        
+        with notification_delivery._dispatch_lock:
+            assert OutboxDispatcher().dispatch() == {'skipped': True}
+    
+    def test_claimed_rows_are_skipped_until_lease_expires(self, app, webhook):
+        """Test rows claimed by another run are not sent twice"""
+        from models import db, NotificationOutbox
+        
+        url, received, _ = webhook
+        project = self._project()
+        self._record_update(project, '1.1.0', [url])
+        entry = NotificationOutbox.query.one()
+        entry.status = 'sending'
+        entry.claimed_by = 'other-worker'
+        entry.claimed_until = datetime.utcnow() + timedelta(minutes=5)
+        db.session.commit()
+        
+        dispatcher = OutboxDispatcher(digest_window=0)
+        assert dispatcher.dispatch()['messages'] == 0
+        assert received == []
+        
+        # The other run died; its claim lapses and the entry is delivered
+        entry.claimed_until = datetime.utcnow() - timedelta(seconds=1)
+        db.session.commit()
+        assert dispatcher.dispatch()['sent'] == 1
+        entry = NotificationOutbox.query.one()
+        assert entry.status == 'sent' and entry.claimed_by is None
+
+class TestPyPIMirror:
+    """Tests for offline PyPI mirror ingestion and lookups"""
+    
+    @staticmethod
+    def _json_dump(name, version, releases):
+        return json.dumps({
+            'info': {'name': name, 'version': version, 'summary': f'{name} summary',
+                     'project_url': f'https://pypi.org/project/{name}/', 'requires_dist': ['click>=8']},
+            'releases': {
+                number: [{'filename': f'{name}-{number}.tar.gz', 'upload_time_iso_8601': f'2024-0{i + 1}-01T00:00:00Z'}]
+                for i, number in enumerate(releases)
+            }
+        })
+    
+    def _mirror(self, tmp_path):
+        source = tmp_path / 'mirror'
+        (source / 'json').mkdir(parents=True)
+        (source / 'json' / 'Flask').write_text(self._json_dump('Flask', '3.0.0', ['2.3.0', '3.0.0']))
+        (source / 'simple' / 'zope-interface').mkdir(parents=True)
+        (source / 'simple' / 'zope-interface' / 'index.html').write_text(
+            '<html><body>'
+            '<a href="../../files/zope.interface-6.0.tar.gz">zope.interface-6.0.tar.gz</a>'
+            '<a href="../../files/zope.interface-6.1-cp311-cp311-manylinux_x86_64.whl">'
+            'zope.interface-6.1-cp311-cp311-manylinux_x86_64.whl</a>'
+            '<a href="../../files/zope.interface-7.0b1.tar.gz">zope.interface-7.0b1.tar.gz</a>'
+            '<a href="../../files/zope.interface-6.2.tar.gz" data-yanked="">zope.interface-6.2.tar.gz</a>'
+            '</body></html>'
+        )
+        (source / 'simple' / 'rich').mkdir(parents=True)
+        (source / 'simple' / 'rich' / 'index.json').write_text(json.dumps({
+            'name': 'rich',
+            'files': [{'filename': 'rich-13.7.0-py3-none-any.whl', 'upload-time': '2023-11-15T00:00:00Z'}]
+        }))
+        return source, str(tmp_path / 'pypi.idx')
+    
+    def test_ingest_and_lookup(self, tmp_path):
+        """Test JSON dumps and Simple pages are indexed by normalized name"""
+        source, index_path = self._mirror(tmp_path)
+        result = ingest(str(source), index_path)
+        assert result['packages'] == 3
+        
+        mirror = PyPIMirror(index_path)
+        assert mirror.lookup('flask')['version'] == '3.0.0'
+        assert mirror.lookup('Zope.Interface')['version'] == '6.1'
+        assert mirror.lookup('rich')['upload_time'] == '2023-11-15T00:00:00Z'
+        assert mirror.lookup('django') is None
+    
+    def test_incremental_ingest(self, tmp_path):
+        """Test only changed files are parsed and deleted sources are dropped"""
+        source, index_path = self._mirror(tmp_path)
+        ingest(str(source), index_path)
+        assert ingest(str(source), index_path)['parsed'] == 0
+        
+        (source / 'json' / 'Flask').write_text(self._json_dump('Flask', '3.1.0', ['3.0.0', '3.1.0']))
+        (source / 'simple' / 'rich' / 'index.json').unlink()
+        result = ingest(str(source), index_path)
+        assert result == dict(result, parsed=1, removed=1, packages=2)
+        
+        mirror = PyPIMirror(index_path, reload_interval=0)
+        assert mirror.lookup('flask')['version'] == '3.1.0'
+        assert mirror.lookup('rich') is None
+    
+    def test_json_dump_preferred_over_simple(self, tmp_path):
+        """Test the richer JSON record wins when a package is in both layouts"""
+        source, index_path = self._mirror(tmp_path)
+        (source / 'simple' / 'flask').mkdir(parents=True)
+        (source / 'simple' / 'flask' / 'index.html').write_text('<a href="f">flask-9.0.tar.gz</a>')
+        ingest(str(source), index_path)
+        assert PyPIMirror(index_path).lookup('flask')['summary'] == 'Flask summary'
+    
+    def test_binary_search(self, tmp_path):
+        """Test lookups across a large sorted index"""
+        index_path = str(tmp_path / 'big.idx')
+        write_index(index_path, {f'package-{i:05d}': str(i).encode() for i in range(5000)})
+        index = MirrorIndex(index_path)
+        assert index.count == 5000
+        assert index.get_raw('package-00000') == b'0'
+        assert index.get_raw('package-04999') == b'4999'
+        assert index.get_raw('package-02500') == b'2500'
+        assert index.get_raw('package-5000') is None
+        index.close()
+    
+    def test_service_uses_mirror(self, tmp_path):
+        """Test PyPIService resolves versions without HTTP when a mirror is set"""
+        source, index_path = self._mirror(tmp_path)
+        ingest(str(source), index_path)
+        # An unroutable base URL proves no request is made
+        service = PyPIService(base_url='http://127.0.0.1:9/pypi', mirror=PyPIMirror(index_path))
+        
+        info = service.extract_version_info('flask')
+        assert info['version_number'] == '3.0.0'
+        assert info['description'] == 'Flask summary'
+        assert info['release_date'] == datetime(2024, 2, 1)
+        history = service.get_release_history('flask')
+        assert [release['version_number'] for release in history] == ['3.0.0', '2.3.0']
+        assert service.get_latest_version('unknown-package') is None
+
+class TestPyPIJSONStream:
+    """Tests for streaming PyPI JSON parsing"""
+    
+    DOCUMENT = {
+        'info': {
+            'name': 'Flask',
+            'version': '3.0.0',
+            'summary': 'A "micro" framework',
+            'description': 'Long README with escapes \\ \" and unicode \u00e9 ' * 200,
+            'classifiers': ['Framework :: Flask', 'License :: OSI Approved'],
+            'requires_dist': ['Werkzeug>=3.0', 'asgiref>=3.2; extra == "async"'],
+            'project_url': 'https://pypi.org/project/Flask/',
+            'yanked': False
+        },
+        'last_serial': 123456789,
+        'releases': {
+            '2.3.0': [
+                {'filename': 'flask-2.3.0.tar.gz', 'upload_time_iso_8601': '2023-04-25T20:00:00.000000Z', 'size': 1.5e5},
+                {'filename': 'flask-2.3.0-py3-none-any.whl', 'upload_time_iso_8601': '2023-04-25T19:59:00.000000Z'}
+            ],
+            '2.3.1': [{'filename': 'flask-2.3.1.tar.gz', 'upload_time_iso_8601': '2023-04-26T00:00:00Z', 'yanked': True}],
+            '3.0.0': [{'filename': 'flask-3.0.0.tar.gz', 'upload_time_iso_8601': '2023-09-30T12:00:00Z', 'digests': {}}],
+            '0.1': []
+        },
+        'urls': [{'filename': 'flask-3.0.0.tar.gz', 'nested': [[1, 2], {'a': None}], 'ok': True}],
+        'vulnerabilities': []
+    }
+    
+    def _chunks(self, size):
+        data = json.dumps(self.DOCUMENT, indent=1).encode('utf-8')
+        return [data[i:i + size] for i in range(0, len(data), size)]
+    
+    def test_extracts_needed_fields(self):
+        """Test only the used fields are kept, for any chunk size"""
+        expected = None
+        for size in (1, 7, 64, 1 << 20):
+            record = parse_package_document(self._chunks(size))
+            expected = expected or record
+            assert record == expected
+        
+        assert expected['version'] == '3.0.0'
+        assert expected['summary'] == 'A "micro" framework'
+        assert expected['requires_dist'] == self.DOCUMENT['info']['requires_dist']
+        assert expected['upload_time'] == '2023-09-30T12:00:00Z'
+        # First upload per release; yanked files and empty releases are dropped
+        assert expected['releases'] == {
+            '2.3.0': ['2023-04-25T19:59:00.000000Z', 2],
+            '3.0.0': ['2023-09-30T12:00:00Z', 1]
+        }
+    
+    def test_truncated_document(self):
+        """Test a cut-off body raises instead of returning partial data"""
+        chunks = self._chunks(64)
+        with pytest.raises(JSONStreamError):
+            parse_package_document(chunks[:len(chunks) // 2])
+    
+    def test_service_streams_response(self):
+        """Test PyPIService reads package documents through the streaming parser"""
+        from services import check_trace
+        
+        body = json.dumps(self.DOCUMENT).encode('utf-8')
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200 if self.path == '/pypi/flask/json' else 404)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        server = HTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            service = PyPIService(base_url=f'http://127.0.0.1:{server.server_port}/pypi')
+            service.chunk_size = 256
+            info, trace = check_trace.traced(service.extract_version_info, 'flask')
+            assert info['version_number'] == '3.0.0'
+            assert info['requires_dist'][0] == 'Werkzeug>=3.0'
+            assert info['release_date'] == datetime(2023, 9, 30, 12, 0)
+            assert trace.bytes == len(body)
+            history = service.get_release_history('flask')
+            assert [(r['version_number'], r['files_count']) for r in history] == [('3.0.0', 1), ('2.3.0', 2)]
+            assert history[0]['release_date'] == datetime(2023, 9, 30)
+            assert service.get_package_info('missing') is None
+        finally:
+            server.shutdown()
+            server.server_close()
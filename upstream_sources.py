@@ -0,0 +1,148 @@
+# MIT License
+
+"""
+Normalized upstream sources
+Project.github_repo and pypi_package are free text; every spelling of the
+same repository or package resolves, once at write time, to one
+upstream_sources row (provider, canonical key). Sweeps fetch each unique
+source combination once and fan the result out to all linked projects.
+"""
+
+import logging
+import re
+from typing import Dict, Optional, Tuple
+
+from packaging.utils import canonicalize_name
+from sqlalchemy import event
+
+from models import db, Project, UpstreamSource
+
+logger = logging.getLogger(__name__)
+
+_GITHUB_URL = re.compile(
+    r'^(?:git\+)?(?:(?:https?|ssh|git)://)?(?:[^@/\s]+@)?(?:www\.)?github\.com[:/]+([^/\s]+)/([^/\s#?]+)',
+    re.IGNORECASE
+)
+_GITHUB_KEY = re.compile(r'^([\w.-]+)/([\w.-]+)$')
+
+
+def canonical_github_key(value: Optional[str]) -> Optional[str]:
+    """'owner/repo' (lowercase) for a GitHub repository URL, else None"""
+    if not value:
+        return None
+    match = _GITHUB_URL.match(value.strip())
+    if not match:
+        return None
+    owner, repo = match.group(1), match.group(2)
+    if repo.endswith('.git'):
+        repo = repo[:-4]
+    if not owner or not repo:
+        return None
+    return f'{owner}/{repo}'.lower()
+
+
+def canonical_pypi_key(value: Optional[str]) -> Optional[str]:
+    """PEP 503 normalized package name, else None"""
+    if not value or not value.strip():
+        return None
+    return canonicalize_name(value.strip())
+
+
+def split_github_key(value: str) -> Tuple[Optional[str], Optional[str]]:
+    """(owner, repo) for a canonical key, parsing URLs only when given one"""
+    key = value if _GITHUB_KEY.match(value) and 'github.com' not in value else canonical_github_key(value)
+    if not key:
+        return None, None
+    owner, repo = key.split('/', 1)
+    return owner, repo
+
+
+def _get_source(session, provider: str, key: str, pending: Dict) -> UpstreamSource:
+    source = pending.get((provider, key))
+    if source is None:
+        with session.no_autoflush:
+            source = session.query(UpstreamSource).filter_by(provider=provider, key=key).first()
+        if source is None:
+            source = UpstreamSource(provider=provider, key=key)
+            session.add(source)
+        pending[(provider, key)] = source
+    return source
+
+
+def sync_project_sources(session, project: Project, pending: Optional[Dict] = None) -> None:
+    """Point a project at the sources for its current github_repo and pypi_package"""
+    pending = {} if pending is None else pending
+    github_key = canonical_github_key(project.github_repo)
+    pypi_key = canonical_pypi_key(project.pypi_package)
+    project.github_source = _get_source(session, 'github', github_key, pending) if github_key else None
+    project.pypi_source = _get_source(session, 'pypi', pypi_key, pending) if pypi_key else None
+
+
+@event.listens_for(db.session, 'before_flush')
+def _resolve_sources(session, flush_context, instances):
+    """Resolve sources of new projects and projects whose repo or package changed"""
+    pending = {}
+    for project in list(session.new) + list(session.dirty):
+        if not isinstance(project, Project):
+            continue
+        if project in session.new:
+            sync_project_sources(session, project, pending)
+            continue
+        state = db.inspect(project)
+        if state.attrs.github_repo.history.has_changes() or state.attrs.pypi_package.history.has_changes():
+            sync_project_sources(session, project, pending)
+
+
+def project_source_keys(project: Project) -> Tuple[Optional[str], Optional[str]]:
+    """(github key, pypi key) of a project; falls back to parsing unresolved rows"""
+    if project.github_source_id is not None:
+        github_key = project.github_source.key
+    else:
+        github_key = canonical_github_key(project.github_repo)
+    if project.pypi_source_id is not None:
+        pypi_key = project.pypi_source.key
+    else:
+        pypi_key = canonical_pypi_key(project.pypi_package)
+    return github_key, pypi_key
+
+
+def resolve_missing_sources(batch_size: int = 500) -> int:
+    """Link projects written without the ORM (bulk inserts, older rows); returns the count"""
+    resolved = 0
+    last_id = 0
+    try:
+        while True:
+            projects = Project.query.filter(Project.id > last_id, db.or_(
+                db.and_(Project.github_repo.isnot(None), Project.github_source_id.is_(None)),
+                db.and_(Project.pypi_package.isnot(None), Project.pypi_source_id.is_(None))
+            )).order_by(Project.id).limit(batch_size).all()
+            if not projects:
+                return resolved
+            pending = {}
+            for project in projects:
+                sync_project_sources(db.session, project, pending)
+                resolved += project.github_source is not None or project.pypi_source is not None
+            last_id = projects[-1].id
+            db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Error in resolve_missing_sources: {e}')
+        return resolved
+
+
+def purge_orphan_sources() -> int:
+    """Delete sources no project links to any more"""
+    try:
+        linked = db.union(
+            db.select(Project.github_source_id).where(Project.github_source_id.isnot(None)),
+            db.select(Project.pypi_source_id).where(Project.pypi_source_id.isnot(None))
+        )
+        deleted = UpstreamSource.query.filter(
+            UpstreamSource.id.notin_(db.select(linked.subquery().c[0]))
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f'Error in purge_orphan_sources: {e}')
+        return 0